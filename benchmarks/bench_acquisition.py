@@ -0,0 +1,61 @@
+"""
+Acquisition Benchmark
+
+Measures how many ticks per second the IRacingClient acquisition loop can
+sustain against a mocked SDK that produces a new tick on every freeze.
+
+Usage: python -m benchmarks.bench_acquisition [--seconds S] [--save-baseline]
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.common import MockSDK, save_baseline, compare_baseline
+from src.client.channels import DEFAULT_CHANNELS
+from src.client.iracing_client import IRacingClient
+
+
+SUITE = 'acquisition'
+CASES = [('default_channels', 0), ('with_8_carIdx_arrays', 8), ('with_32_carIdx_arrays', 32)]
+
+
+def run_case(extra_arrays, seconds):
+    """Run the client against a MockSDK and return ticks per second."""
+    sdk = MockSDK(extra_arrays)
+    client = IRacingClient(source=sdk)
+    client.require_channels('bench', dict(DEFAULT_CHANNELS, **{
+        name: name for name in sdk._var_headers_dict if name.startswith('CarIdx')}))
+    time.sleep(0.2)
+    start_ticks, start = client.get_tick_stats()['ticks'], time.perf_counter()
+    time.sleep(seconds)
+    ticks, elapsed = client.get_tick_stats()['ticks'] - start_ticks, time.perf_counter() - start
+    client.stop()
+    return {'ticks_per_second': ticks / elapsed, 'us_per_tick': elapsed / max(ticks, 1) * 1e6}
+
+
+def main():
+    """Run every case and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed throughput regression (fraction)')
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':30} {'ticks/s':>10} {'us/tick':>9}")
+    for name, extra_arrays in CASES:
+        stats = run_case(extra_arrays, args.seconds)
+        results[name] = stats
+        print(f"{name:30} {stats['ticks_per_second']:10.0f} {stats['us_per_tick']:9.1f}")
+
+    regressions = compare_baseline(SUITE, results, 'ticks_per_second', args.tolerance, higher_is_better=True)
+    for name, old, new in regressions:
+        print(f"REGRESSION {name}: {old:.0f} -> {new:.0f} ticks/s")
+    if args.save_baseline:
+        save_baseline(SUITE, results)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Batch Analysis Benchmark
+
+Writes a set of synthetic multi-lap recordings, then times the batch analysis
+with 1, 2, 4, ... worker processes (uncached) and a cached re-run, reporting
+the speedup over a single worker.
+
+Usage: python -m benchmarks.bench_batch [--files N] [--laps L] [--max-workers W]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from src.analysis.batch import analyze_files
+from src.client.recorder import MAGIC, BLOCK_HEADER, ROW_COUNT, BASE_COLUMNS
+
+
+LAP_SECONDS = 90.0
+RATE = 60
+# Lap distance of the braking zones on the synthetic track
+BRAKE_ZONES = (0.12, 0.38, 0.55, 0.81)
+
+
+def synthetic_session(laps, seed):
+    """Columns of a session driving `laps` laps plus out and in laps."""
+    rng = np.random.default_rng(seed)
+    n = int((laps + 2) * LAP_SECONDS * RATE)
+    tick = np.arange(n)
+    lap_length = LAP_SECONDS * RATE * (1 + rng.normal(0, 0.01, laps + 3))
+    position = np.interp(tick, np.concatenate([[0], np.cumsum(lap_length)]), np.arange(laps + 4))
+    dist = position % 1.0
+    brake = np.zeros(n)
+    for zone in BRAKE_ZONES:
+        brake[(dist > zone) & (dist < zone + 0.02)] = 0.8
+    speed = 70.0 - 40.0 * np.convolve(brake, np.ones(120) / 120, mode='same')
+    columns = {
+        'seq': tick + 1,
+        'tick': tick,
+        'timestamp': tick / RATE,
+        'lap': position.astype(np.int32),
+        'lap_dist_pct': dist.astype(np.float32),
+        'speed': speed.astype(np.float32),
+        'brake': brake.astype(np.float32),
+        'fuel_level': (60.0 - tick * 0.0005).astype(np.float32),
+    }
+    for i, tire in enumerate(('LF', 'RF', 'LR', 'RR')):
+        columns[f'tire_temp_{tire}'] = (80.0 + i + tick / n * 10 + rng.normal(0, 0.5, n)).astype(np.float32)
+    return columns
+
+
+def write_session(path, columns, chunk_rows=600):
+    """Write columns as a recording in TelemetryRecorder's format."""
+    schema = BASE_COLUMNS + [(name, column.dtype.str, ()) for name, column in columns.items()
+                             if name not in ('seq', 'tick', 'timestamp')]
+    arrays = [np.asarray(columns[name], dtype) for name, dtype, _ in schema]
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        payload = json.dumps({'columns': [[name, dtype, list(shape)] for name, dtype, shape in schema]}).encode()
+        f.write(BLOCK_HEADER.pack(b'H', len(payload)) + payload)
+        for start in range(0, len(arrays[0]), chunk_rows):
+            parts = [ROW_COUNT.pack(len(arrays[0][start:start + chunk_rows]))]
+            parts.extend(array[start:start + chunk_rows].tobytes() for array in arrays)
+            payload = b''.join(parts)
+            f.write(BLOCK_HEADER.pack(b'C', len(payload)) + payload)
+
+
+def main():
+    """Run the scaling and cache cases and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=32)
+    parser.add_argument('--laps', type=int, default=20)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = []
+        for i in range(args.files):
+            files.append(os.path.join(directory, f'session_{i:03d}.irtrec'))
+            write_session(files[-1], synthetic_session(args.laps, i))
+        size = sum(os.path.getsize(path) for path in files) / 1e6
+        print(f"{args.files} recordings, {size:.0f} MB, {args.laps + 2} laps each")
+
+        print(f"{'case':14} {'seconds':>8} {'speedup':>8} {'laps':>6}")
+        workers, single = 1, None
+        while workers <= args.max_workers:
+            start = time.perf_counter()
+            results = analyze_files(files, workers=workers)
+            elapsed = time.perf_counter() - start
+            single = single or elapsed
+            laps = sum(1 for rows in results.values() for row in rows if 'error' not in row)
+            print(f"{f'{workers} workers':14} {elapsed:8.2f} {single / elapsed:8.2f} {laps:6d}")
+            workers *= 2
+
+        cache_dir = os.path.join(directory, 'cache')
+        analyze_files(files, cache_dir, args.max_workers)
+        start = time.perf_counter()
+        analyze_files(files, cache_dir, args.max_workers)
+        print(f"{'cached re-run':14} {time.perf_counter() - start:8.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
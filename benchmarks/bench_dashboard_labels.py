@@ -0,0 +1,106 @@
+"""
+Dashboard Label Benchmark
+
+Compares the original dashboard update, which formats and sets every label on
+each frame, with the display-model update that only re-formats and sets the
+labels whose text changed at display precision. Reports dashboard updates per
+second and QLabel.setText calls per update.
+
+Usage: python -m benchmarks.bench_dashboard_labels [--updates N] [--save-baseline]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtWidgets
+
+from benchmarks.common import FakeClient, save_baseline, compare_baseline
+from src.ui.dashboard import DashboardWindow
+
+
+SUITE = 'dashboard_labels'
+# Ticks advanced between dashboard updates: every tick, and the 10 Hz dashboard rate
+TICK_STEPS = [1, 6]
+
+
+def legacy_update(window, client):
+    """The dashboard update as it was before the display model."""
+    telemetry = client.get_telemetry()
+    window.labels['Speed'].setText(f"Speed: {telemetry.get('speed', 0):.1f} mph")
+    window.labels['RPM'].setText(f"RPM: {telemetry.get('rpm', 0):.0f}")
+    window.labels['Gear'].setText(f"Gear: {telemetry.get('gear', 0)}")
+    window.labels['Lap Time'].setText(f"Lap Time: {telemetry.get('lap_time', 0):.2f}")
+    window.labels['Fuel'].setText(f"Fuel: {telemetry.get('fuel_level', 0):.1f}")
+    window.labels['LF Temp'].setText(f"LF Temp: {telemetry.get('tire_temp_LF', 0):.1f}")
+    window.labels['RF Temp'].setText(f"RF Temp: {telemetry.get('tire_temp_RF', 0):.1f}")
+    window.labels['LR Temp'].setText(f"LR Temp: {telemetry.get('tire_temp_LR', 0):.1f}")
+    window.labels['RR Temp'].setText(f"RR Temp: {telemetry.get('tire_temp_RR', 0):.1f}")
+
+
+def count_set_text(window):
+    """Wrap every label's setText with a counter; return the counter dict."""
+    counter = {'calls': 0}
+    for label in window.labels.values():
+        def set_text(text, label=label):
+            counter['calls'] += 1
+            QtWidgets.QLabel.setText(label, text)
+        label.setText = set_text
+    return counter
+
+
+def run_case(update, tick_step, updates):
+    """Drive one update strategy and return its throughput and setText count."""
+    client = FakeClient()
+    client.step()
+    window = DashboardWindow(client, lambda: None, lambda: None)
+    window.timer.stop()
+    counter = count_set_text(window)
+    elapsed = 0.0
+    for _ in range(updates):
+        for _ in range(tick_step):
+            client.step()
+        start = time.perf_counter()
+        update(window, client)
+        elapsed += time.perf_counter() - start
+    window.close()
+    return {'updates_per_second': updates / elapsed,
+            'us_per_update': elapsed / updates * 1e6,
+            'set_text_per_update': counter['calls'] / updates}
+
+
+def main():
+    """Run both strategies at each tick step and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--updates', type=int, default=5000)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed throughput regression (fraction)')
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv)
+    strategies = [('legacy', legacy_update),
+                  ('display_model', lambda window, client: window.update_dashboard())]
+    results = {}
+    print(f"{'case':28} {'updates/s':>10} {'us/update':>10} {'setText/update':>15}")
+    for tick_step in TICK_STEPS:
+        for strategy, update in strategies:
+            name = f'{strategy}_every_{tick_step}_ticks'
+            stats = run_case(update, tick_step, args.updates)
+            results[name] = stats
+            print(f"{name:28} {stats['updates_per_second']:10.0f} {stats['us_per_update']:10.1f} "
+                  f"{stats['set_text_per_update']:15.2f}")
+
+    regressions = compare_baseline(SUITE, results, 'updates_per_second', args.tolerance, higher_is_better=True)
+    for name, old, new in regressions:
+        print(f"REGRESSION {name}: {old:.0f} -> {new:.0f} updates/s")
+    if args.save_baseline:
+        save_baseline(SUITE, results)
+    del app
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Idle Benchmark
+
+Measures the CPU the IRacingClient acquisition thread uses while the sim is
+not running, and how often it probes the SDK, against an SDK whose startup()
+always fails.
+
+Usage: python -m benchmarks.bench_idle [--seconds S]
+"""
+
+import argparse
+import sys
+import time
+
+from src.client.iracing_client import IRacingClient
+
+
+class OfflineSDK:
+    """SDK stand-in for a machine where iRacing is not running."""
+
+    is_initialized = False
+    is_connected = False
+
+    def __init__(self):
+        """Count connection attempts."""
+        self.startups = 0
+
+    def startup(self):
+        """Count the attempt and fail, as if the sim were not running."""
+        self.startups += 1
+        return False
+
+    def shutdown(self):
+        """Nothing to release."""
+
+
+class StateRecorder:
+    """Sink that records connection state changes."""
+
+    def __init__(self):
+        """Start with no recorded states."""
+        self.states = []
+
+    def on_snapshot(self, snapshot):
+        """Snapshots are not recorded."""
+
+    def on_session_info(self, update, session_info):
+        """Session info is not recorded."""
+
+    def on_connection_state(self, state):
+        """Record a state change."""
+        self.states.append(state)
+
+
+def main():
+    """Run the client against an offline SDK and report CPU use and probe count."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    args = parser.parse_args()
+
+    sdk = OfflineSDK()
+    recorder = StateRecorder()
+    cpu_start, start = time.process_time(), time.perf_counter()
+    client = IRacingClient(source=sdk)
+    client.add_sink(recorder)
+    time.sleep(args.seconds)
+    client.stop()
+    cpu, elapsed = time.process_time() - cpu_start, time.perf_counter() - start
+
+    print(f"wall {elapsed:.1f} s  cpu {cpu * 1000:.1f} ms ({cpu / elapsed * 100:.3f}%)")
+    print(f"probes {sdk.startups} ({sdk.startups / elapsed:.2f}/s, previously {1 / IRacingClient.POLL_INTERVAL:.0f}/s)")
+    print(f"state changes {len(recorder.states)}  final state {client.get_connection_state()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
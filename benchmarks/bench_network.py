@@ -0,0 +1,66 @@
+"""
+Network Streaming Benchmark
+
+Streams synthetic snapshots from a TelemetryPublisher to a NetworkClient over
+loopback at the sim tick rate and reports bandwidth, packet sizes, loss and
+publish-to-receive latency, next to the size of a naive JSON encoding.
+
+Usage: python -m benchmarks.bench_network [--seconds S] [--rate HZ]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.common import FakeClient
+from src.client.network import TelemetryPublisher, NetworkClient
+from src.utils.perf import monitor
+
+
+def main():
+    """Stream for the requested time and print the statistics."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--rate', type=float, default=60.0, help='snapshots per second; 0 sends as fast as possible')
+    args = parser.parse_args()
+
+    subscriber = NetworkClient(('127.0.0.1', 0))
+    publisher = TelemetryPublisher(subscriber.socket.getsockname())
+    source = FakeClient()
+    source.step()
+    publisher.on_connection_state('connected')
+    monitor.reset()
+
+    frames = 0
+    json_bytes = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < args.seconds:
+        source.step()
+        snapshot = source.get_snapshot()
+        publisher.on_snapshot(snapshot)
+        json_bytes += len(json.dumps({'telemetry': dict(snapshot.telemetry),
+                                      'session_info': dict(snapshot.session_info)}))
+        frames += 1
+        if args.rate:
+            time.sleep(max(0.0, start + frames / args.rate - time.perf_counter()))
+    elapsed = time.perf_counter() - start
+    time.sleep(0.2)
+    subscriber.stop()
+    publisher.close()
+
+    sent = publisher.get_stats()
+    received = subscriber.get_tick_stats()
+    latency = monitor.summary().get('latency.network', {})
+    print(f"frames sent        {frames} ({frames / elapsed:.0f}/s)")
+    print(f"frames received    {received['ticks']}  lost {frames - received['ticks']}")
+    print(f"packets            {sent['packets']}  keyframes {sent['keyframes']}  deltas {sent['deltas']}")
+    print(f"bandwidth          {sent['bytes'] / elapsed / 1024:.1f} KiB/s  "
+          f"({sent['bytes'] / max(frames, 1):.0f} B/frame, naive JSON {json_bytes / max(frames, 1):.0f} B/frame)")
+    print(f"latency ms         p50 {latency.get('p50_ms', 0):.3f}  p99 {latency.get('p99_ms', 0):.3f}  "
+          f"max {latency.get('max_ms', 0):.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
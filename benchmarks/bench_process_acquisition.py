@@ -0,0 +1,107 @@
+"""
+Process Acquisition Benchmark
+
+Compares in-process acquisition with the out-of-process mode while the main
+thread simulates heavy UI work: calls into C code that hold the GIL for tens
+of milliseconds, like long paints or GC pauses. Acquisition is paced at 60 Hz
+by a synthetic source; the benchmark reports acquired and dropped ticks and
+the worst gap between consecutive acquired samples.
+
+Usage: python -m benchmarks.bench_process_acquisition [--seconds S] [--stall-ms MS]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.common import synthetic_telemetry
+from src.client.acquisition_process import ProcessClient
+from src.client.iracing_client import IRacingClient
+from src.client.sources import TelemetrySource
+
+
+class PacedSource(TelemetrySource):
+    """Synthetic live source producing one tick every 1/60 s of wall time."""
+
+    def __init__(self):
+        """Start the tick clock now."""
+        self.start = time.perf_counter()
+        self.tick = 0
+
+    def connect(self):
+        """Always connected."""
+        return True
+
+    def wait_for_tick(self):
+        """Return the tick due at the current wall time."""
+        self.tick = int((time.perf_counter() - self.start) * self.tick_rate)
+        return self.tick
+
+    def read_channels(self, registry):
+        """Synthesize the current tick's telemetry, ignoring the registry."""
+        return synthetic_telemetry(self.tick, self.tick_rate)
+
+    def read_var(self, name):
+        """Every session variable reads 0."""
+        return 0
+
+    @property
+    def session_info_update(self):
+        """Session info never changes."""
+        return 1
+
+    def get_session_section(self, key):
+        """Every session info section is empty."""
+        return {}
+
+
+def calibrate_stall(milliseconds):
+    """Size of a range whose sum() holds the GIL for roughly `milliseconds`."""
+    n = 100000
+    start = time.perf_counter()
+    sum(range(n))
+    return int(n * milliseconds / 1000 / (time.perf_counter() - start))
+
+
+def run_case(client, seconds, stall_size):
+    """Load the main thread for `seconds` and return acquisition statistics."""
+    while not client.get_snapshot().telemetry:
+        time.sleep(0.01)
+    start_stats = client.get_tick_stats()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        # One C call: the GIL is not released until it returns
+        sum(range(stall_size))
+        time.sleep(0.002)
+    time.sleep(ProcessClient.STATS_INTERVAL * 2)
+    stats = client.get_tick_stats()
+    timestamps = np.array(client.history.timestamps(int(seconds * 60)))
+    client.stop()
+    gaps = np.diff(timestamps[timestamps > 0]) * 1000
+    return {'ticks': stats['ticks'] - start_stats['ticks'],
+            'dropped': stats['dropped'] - start_stats['dropped'],
+            'max_gap_ms': float(gaps.max()) if len(gaps) else 0.0,
+            'p99_gap_ms': float(np.percentile(gaps, 99)) if len(gaps) else 0.0}
+
+
+def main():
+    """Run both modes and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--stall-ms', type=float, default=40.0)
+    args = parser.parse_args()
+
+    stall_size = calibrate_stall(args.stall_ms)
+    print(f"{'mode':12} {'ticks':>7} {'dropped':>8} {'p99 gap ms':>11} {'max gap ms':>11}")
+    for mode, factory in [('in_process', lambda: IRacingClient(source=PacedSource())),
+                          ('process', lambda: ProcessClient(PacedSource))]:
+        stats = run_case(factory(), args.seconds, stall_size)
+        print(f"{mode:12} {stats['ticks']:7d} {stats['dropped']:8d} "
+              f"{stats['p99_gap_ms']:11.1f} {stats['max_gap_ms']:11.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
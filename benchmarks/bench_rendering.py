@@ -0,0 +1,110 @@
+"""
+Rendering Benchmark
+
+Renders TextOverlay, GraphOverlay and DashboardWindow into QImages under Qt's
+offscreen platform, sweeping window sizes and graph window lengths, and
+reports per-frame p50/p95/p99 times and traced allocations.
+
+Usage: python -m benchmarks.bench_rendering [--frames N] [--save-baseline]
+"""
+
+import argparse
+import os
+import sys
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5 import QtWidgets, QtGui
+
+from benchmarks.common import (FakeClient, time_frames, measure_allocations, summarize,
+                               save_baseline, compare_baseline)
+from src.ui.dashboard import DashboardWindow
+from src.ui.graph_overlay import GraphOverlay
+from src.ui.text_overlay import TextOverlay
+
+
+SUITE = 'rendering'
+WINDOW_SIZES = [(400, 200), (900, 300), (1920, 540), (3840, 1080)]
+GRAPH_SECONDS = [5, 60, 120]
+
+
+def render_case(widget, client, size, before=None):
+    """Return a callable that advances the fake client and renders one frame."""
+    widget.resize(*size)
+    image = QtGui.QImage(widget.size(), QtGui.QImage.Format_ARGB32_Premultiplied)
+
+    def frame():
+        client.step()
+        if before is not None:
+            before()
+        image.fill(0)
+        # render() repaints the whole widget regardless of the invalidated region
+        widget.render(image)
+    return frame
+
+
+def build_cases(client):
+    """Yield (name, frame callable) for every benchmark case."""
+    for size in WINDOW_SIZES:
+        label = f'{size[0]}x{size[1]}'
+        text = TextOverlay(client)
+        yield f'text_overlay/{label}', render_case(text, client, size, text.refresh)
+        for seconds in GRAPH_SECONDS:
+            graph = GraphOverlay(client)
+            graph.window_seconds = seconds
+            yield f'graph_overlay/{label}/{seconds}s', render_case(graph, client, size, graph.refresh)
+    dashboard = DashboardWindow(client, lambda: None, lambda: None)
+    dashboard.timer.stop()
+    yield 'dashboard/update', render_case(dashboard, client, (400, 400), dashboard.update_dashboard)
+
+
+def check_graph_scaling(results, tolerance):
+    """Graph frames must not get slower for shorter windows; return (name, longer, shorter) violations."""
+    violations = []
+    for size in WINDOW_SIZES:
+        label = f'{size[0]}x{size[1]}'
+        cases = [f'graph_overlay/{label}/{seconds}s' for seconds in sorted(GRAPH_SECONDS)]
+        for shorter, longer in zip(cases[:-1], cases[1:]):
+            if shorter in results and longer in results:
+                if results[shorter]['p50'] > results[longer]['p50'] * (1 + tolerance):
+                    print(f"SCALING {shorter}: p50 {results[shorter]['p50']:.3f} ms is slower than "
+                          f"{longer} ({results[longer]['p50']:.3f} ms)")
+                    violations.append((shorter, results[longer]['p50'], results[shorter]['p50']))
+    return violations
+
+
+def main():
+    """Run every case and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--filter', default='', help='only run cases containing this text')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed p95 regression (fraction)')
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication(sys.argv)
+    client = FakeClient()
+    client.fill(120)
+
+    results = {}
+    print(f"{'case':40} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'alloc KB':>9}")
+    for name, frame in build_cases(client):
+        if args.filter not in name:
+            continue
+        stats = summarize(time_frames(frame, args.frames))
+        stats['alloc_kb'] = measure_allocations(frame)
+        results[name] = stats
+        print(f"{name:40} {stats['p50']:8.3f} {stats['p95']:8.3f} {stats['p99']:8.3f} {stats['alloc_kb']:9.1f}")
+
+    regressions = compare_baseline(SUITE, results, 'p95', args.tolerance)
+    for name, old, new in regressions:
+        print(f"REGRESSION {name}: p95 {old:.3f} ms -> {new:.3f} ms")
+    regressions += check_graph_scaling(results, args.tolerance)
+    if args.save_baseline:
+        save_baseline(SUITE, results)
+    del app
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
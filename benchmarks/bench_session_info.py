@@ -0,0 +1,155 @@
+"""
+Session Info Benchmark
+
+Compares the per-tick cost of parsing the whole session document on every
+tick against the update-counter keyed cache in IRacingClient.
+
+Usage: python -m benchmarks.bench_session_info [--file session.yaml] [--ticks N]
+"""
+
+import argparse
+import time
+
+import yaml
+
+from src.client.iracing_client import IRacingClient
+
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def build_session_document(num_drivers=60, num_classes=4):
+    """Build a large multi-class session document similar to a full grid."""
+    drivers = []
+    for idx in range(num_drivers):
+        drivers.append({
+            'CarIdx': idx,
+            'UserName': f'Driver Number {idx}',
+            'AbbrevName': f'Driver, {idx}',
+            'Initials': 'DN',
+            'UserID': 100000 + idx,
+            'TeamID': 0,
+            'TeamName': f'Team {idx}',
+            'CarNumber': str(idx + 1),
+            'CarNumberRaw': idx + 1,
+            'CarPath': f'car_{idx % num_classes}',
+            'CarClassID': 1000 + idx % num_classes,
+            'CarID': 100 + idx % num_classes,
+            'CarScreenName': f'Car Model {idx % num_classes}',
+            'CarScreenNameShort': f'Car {idx % num_classes}',
+            'CarClassShortName': f'Class {idx % num_classes}',
+            'CarClassRelSpeed': 100 - (idx % num_classes) * 10,
+            'CarClassEstLapTime': 120.0 + (idx % num_classes) * 5,
+            'IRating': 1500 + idx * 37,
+            'LicLevel': 15,
+            'LicSubLevel': 399,
+            'LicString': 'A 3.99',
+            'LicColor': '0x0153db',
+            'IsSpectator': 0,
+            'CarDesignStr': '1,ffffff,000000,ff0000',
+            'HelmetDesignStr': '1,ffffff,000000,ff0000',
+            'SuitDesignStr': '1,ffffff,000000,ff0000',
+            'CarNumberDesignStr': '0,0,ffffff,777777,000000',
+            'CurDriverIncidentCount': 0,
+            'TeamIncidentCount': 0,
+        })
+    results = [{
+        'Position': idx + 1, 'ClassPosition': idx // num_classes, 'CarIdx': idx,
+        'Lap': 12, 'Time': 1800.0 + idx, 'FastestLap': 7, 'FastestTime': 120.0 + idx * 0.1,
+        'LastTime': 121.0 + idx * 0.1, 'LapsLed': 0, 'LapsComplete': 12,
+        'JokerLapsComplete': 0, 'LapsDriven': 12.0, 'Incidents': 0,
+        'ReasonOutId': 0, 'ReasonOutStr': 'Running',
+    } for idx in range(num_drivers)]
+    sessions = [{
+        'SessionNum': num,
+        'SessionLaps': 'unlimited',
+        'SessionTime': '3600.0000 sec',
+        'SessionType': session_type,
+        'SessionName': session_type.upper(),
+        'ResultsPositions': results,
+        'ResultsFastestLap': [{'CarIdx': 0, 'FastestLap': 7, 'FastestTime': 120.0}],
+    } for num, session_type in enumerate(['Practice', 'Qualify', 'Race'])]
+    document = {
+        'WeekendInfo': {
+            'TrackName': 'spa up',
+            'TrackDisplayName': 'Circuit de Spa-Francorchamps',
+            'TrackLength': '6.93 km',
+            'WeekendOptions': {'NumStarters': num_drivers, 'StartingGrid': 'single file'},
+        },
+        'SessionInfo': {'Sessions': sessions},
+        'DriverInfo': {'DriverCarIdx': 0, 'Drivers': drivers},
+    }
+    return yaml.safe_dump(document, sort_keys=False)
+
+
+class FakeSDK:
+    """Minimal stand-in for irsdk.IRSDK serving a fixed session document."""
+
+    def __init__(self, document):
+        """Initialize with the YAML session document text."""
+        self.document = document
+        self.session_info_update = 1
+        self.is_initialized = False
+        self.is_connected = False
+        self.parse_count = 0
+        self.channels = {'SessionNum': 2, 'SessionTime': 1834.5, 'SessionLapsRemain': 8}
+
+    def startup(self):
+        """Refuse to connect so the client's background loop stays idle."""
+        return False
+
+    def __getitem__(self, key):
+        """Return a live channel, or parse the requested YAML section."""
+        if key in self.channels:
+            return self.channels[key]
+        self.parse_count += 1
+        return yaml.load(self.document, Loader=YAML_LOADER).get(key)
+
+
+def full_parse_per_tick(sdk):
+    """Previous behaviour: parse the entire session document every tick."""
+    info = yaml.load(sdk.document, Loader=YAML_LOADER)
+    sessions = info.get('SessionInfo', {}).get('Sessions', [])
+    session_num = sdk['SessionNum']
+    return {
+        'track': info.get('WeekendInfo', {}).get('TrackName', ''),
+        'session_type': sessions[session_num]['SessionType'] if session_num < len(sessions) else '',
+        'session_time': sdk['SessionTime'],
+        'session_laps': sdk['SessionLapsRemain'],
+    }
+
+
+def time_per_tick(func, ticks):
+    """Return the mean cost of func() in microseconds."""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        func()
+    return (time.perf_counter() - start) / ticks * 1e6
+
+
+def main():
+    """Run the benchmark and print the per-tick cost before and after."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--file', help='recorded session info YAML document')
+    parser.add_argument('--ticks', type=int, default=600)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding='utf-8', errors='replace') as f:
+            document = f.read()
+    else:
+        document = build_session_document()
+    sdk = FakeSDK(document)
+    client = IRacingClient(source=sdk)
+    client.stop()
+
+    before = time_per_tick(lambda: full_parse_per_tick(sdk), max(1, args.ticks // 10))
+    sdk.parse_count = 0
+    after = time_per_tick(client._get_session_info, args.ticks)
+
+    print(f"Session document: {len(document) / 1024:.0f} KB")
+    print(f"Full parse per tick: {before:10.1f} us/tick")
+    print(f"Cached by counter:   {after:10.1f} us/tick ({sdk.parse_count} section parses in {args.ticks} ticks)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Standings Benchmark
+
+Times StandingsEngine.update() on a synthetic multi-class field moving around
+the track, and the cost of DriverInfo updates with and without a roster
+change.
+
+Usage: python -m benchmarks.bench_standings [--cars N] [--classes C] [--ticks N]
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import yaml
+
+from benchmarks.bench_session_info import build_session_document
+from benchmarks.common import time_frames, summarize
+from src.client.standings import StandingsEngine, MAX_CARS
+
+
+class SyntheticField:
+    """CarIdx arrays for `cars` cars lapping at slightly different paces."""
+
+    def __init__(self, cars, rate=60, seed=0):
+        """Spread `cars` cars over the first laps with randomized paces."""
+        rng = np.random.default_rng(seed)
+        self.rate = rate
+        self.lap_time = 120.0 * (1 + rng.normal(0, 0.01, cars))
+        self.progress = 5 + rng.random(cars)
+        self.on_pit_road = np.zeros(MAX_CARS, dtype=bool)
+        self.cars = cars
+
+    def step(self):
+        """Advance one tick and return the standings inputs."""
+        self.progress += 1.0 / (self.lap_time * self.rate)
+        dist = np.full(MAX_CARS, -1.0, dtype=np.float32)
+        lap = np.full(MAX_CARS, -1, dtype=np.int32)
+        position = np.zeros(MAX_CARS, dtype=np.int32)
+        est = np.zeros(MAX_CARS, dtype=np.float32)
+        cars = self.cars
+        dist[:cars] = self.progress % 1.0
+        lap[:cars] = self.progress
+        position[:cars] = np.argsort(np.argsort(-np.floor(self.progress * 4))) + 1
+        est[:cars] = dist[:cars] * self.lap_time
+        return {'car_lap_dist_pct': dist, 'car_lap': lap, 'car_position': position,
+                'car_on_pit_road': self.on_pit_road, 'car_est_time': est}
+
+
+def main():
+    """Run the benchmark and print per-tick costs."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cars', type=int, default=MAX_CARS)
+    parser.add_argument('--classes', type=int, default=3)
+    parser.add_argument('--ticks', type=int, default=6000)
+    args = parser.parse_args()
+
+    driver_info = yaml.safe_load(build_session_document(args.cars, args.classes))['DriverInfo']
+    engine = StandingsEngine()
+    engine.set_drivers(driver_info)
+    field = SyntheticField(args.cars)
+
+    inputs = [field.step() for _ in range(args.ticks)]
+    frames = iter(inputs * 2)
+    update = summarize(time_frames(lambda: engine.update(next(frames)), args.ticks))
+
+    unchanged = summarize(time_frames(lambda: engine.set_drivers(driver_info), 200))
+    rosters = [dict(driver_info, DriverCarIdx=i % args.cars) for i in range(220)]
+    changes = iter(rosters)
+    changed = summarize(time_frames(lambda: engine.set_drivers(next(changes)), 200))
+
+    print(f"{args.cars} cars, {args.classes} classes")
+    print(f"{'case':28} {'p50 us':>8} {'p99 us':>8}")
+    for name, stats in [('update per tick', update), ('session info, same roster', unchanged),
+                        ('session info, new roster', changed)]:
+        print(f"{name:28} {stats['p50'] * 1000:8.1f} {stats['p99'] * 1000:8.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Startup Benchmark
+
+Measures time from process start to the first telemetry sample for the GUI
+and headless entry points, replaying a short synthetic recording, and checks
+that headless mode never imports Qt.
+
+Usage: python -m benchmarks.bench_startup [--runs N]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import FakeClient
+from src.client.recorder import TelemetryRecorder
+
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+FIRST_SAMPLE = re.compile(r'First sample (\d+) ms')
+
+# Runs main.py in-process and reports whether Qt was imported
+QT_CHECK = ("import runpy, sys; sys.argv = {argv!r}\n"
+            "try:\n    runpy.run_path({main!r}, run_name='__main__')\n"
+            "except SystemExit:\n    pass\n"
+            "print('qt imported' if 'PyQt5' in sys.modules else 'qt not imported')")
+
+
+def write_recording(path, seconds=5.0):
+    """Record a few seconds of synthetic telemetry to replay."""
+    client = FakeClient()
+    recorder = TelemetryRecorder(path)
+    recorder.start()
+    recorder.on_session_info(1, {'track': 'Synthetic'})
+    for _ in range(int(seconds * client.rate)):
+        client.step()
+        recorder.on_snapshot(client.get_snapshot())
+    recorder.stop()
+
+
+def run_once(args):
+    """Run main.py until its first sample; return (first sample ms, wall ms)."""
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, MAIN] + args, capture_output=True, text=True, env=env, timeout=60)
+    wall = (time.perf_counter() - start) * 1000
+    match = FIRST_SAMPLE.search(result.stdout)
+    return (int(match.group(1)) if match else float('nan')), wall
+
+
+def main():
+    """Time both modes and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        recording = os.path.join(directory, 'startup.irtrec')
+        write_recording(recording)
+        common = ['--replay', recording, '--speed', '0', '--exit-after-first-sample']
+        print(f"{'mode':10} {'first sample ms':>16} {'process wall ms':>16}")
+        for mode, extra in [('gui', []), ('headless', ['--headless'])]:
+            runs = [run_once(common + extra) for _ in range(args.runs)]
+            print(f"{mode:10} {statistics.median(r[0] for r in runs):16.0f} "
+                  f"{statistics.median(r[1] for r in runs):16.0f}")
+
+        check = QT_CHECK.format(argv=[MAIN, '--headless'] + common, main=MAIN)
+        result = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True, timeout=60)
+        print(f"headless: {result.stdout.strip().splitlines()[-1]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
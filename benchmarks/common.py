@@ -0,0 +1,267 @@
+"""
+Benchmark Helpers
+
+Synthetic telemetry, a fake client for the UI, a mocked SDK for the
+acquisition loop, and timing/baseline utilities shared by the benchmarks.
+"""
+
+import json
+import math
+import os
+import struct
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.client.channels import DEFAULT_CHANNELS
+from src.client.history import TelemetryHistory
+from src.client.snapshot import TelemetrySnapshot, EMPTY_SNAPSHOT
+
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+
+SYNTHETIC_SESSION = {
+    'track': 'Circuit de Spa-Francorchamps',
+    'session_type': 'Race',
+    'session_time': 0.0,
+    'session_laps': 20,
+}
+
+
+def synthetic_telemetry(tick, rate=60):
+    """Return plausible telemetry values for a given tick."""
+    t = tick / rate
+    throttle = max(0.0, min(1.0, 0.5 + 0.6 * math.sin(t * 0.9)))
+    brake = max(0.0, min(1.0, -0.4 + 0.8 * math.sin(t * 0.9 + math.pi)))
+    return {
+        'speed': 45.0 + 20.0 * math.sin(t * 0.3),
+        'rpm': 6500.0 + 1500.0 * math.sin(t * 1.7),
+        'gear': 2 + int(3 * (0.5 + 0.5 * math.sin(t * 0.3))),
+        'lap_time': t % 120.0,
+        'fuel_level': max(0.0, 60.0 - t * 0.01),
+        'steering': 1.2 * math.sin(t * 0.7),
+        'throttle': throttle,
+        'brake': brake,
+        'clutch': 0.0,
+        'tire_temp_LF': 85.0 + math.sin(t * 0.05),
+        'tire_temp_RF': 86.0 + math.sin(t * 0.05),
+        'tire_temp_LR': 82.0 + math.sin(t * 0.05),
+        'tire_temp_RR': 83.0 + math.sin(t * 0.05),
+        'tick': tick,
+    }
+
+
+class FakeClient:
+    """Stand-in for IRacingClient serving synthetic telemetry to the UI."""
+
+    def __init__(self, history_seconds=120.0, rate=60):
+        """Create an empty fake client; call step() or fill() to add ticks."""
+        self.rate = rate
+        self.tick_rate = rate
+        self.is_connected = True
+        self.history = TelemetryHistory(history_seconds, rate)
+        self.snapshot = EMPTY_SNAPSHOT
+        self.tick = 0
+
+    def step(self):
+        """Publish the next synthetic tick."""
+        telemetry = synthetic_telemetry(self.tick, self.rate)
+        session_info = dict(SYNTHETIC_SESSION, session_time=self.tick / self.rate)
+        snapshot = TelemetrySnapshot(self.snapshot.seq + 1, telemetry, session_info, self.tick)
+        self.history.append(telemetry, snapshot.timestamp, self.tick)
+        self.snapshot = snapshot
+        self.tick += 1
+
+    def fill(self, seconds):
+        """Publish enough ticks to cover `seconds` of history."""
+        for _ in range(int(seconds * self.rate)):
+            self.step()
+
+    def get_snapshot(self):
+        """Get the latest synthetic snapshot."""
+        return self.snapshot
+
+    def has_changed_since(self, seq):
+        """Return True if a snapshot newer than seq was published."""
+        return self.snapshot.is_newer_than(seq)
+
+    def get_telemetry(self):
+        """Get the latest synthetic telemetry."""
+        return self.snapshot.telemetry
+
+    def get_session_info(self):
+        """Get the latest synthetic session info."""
+        return self.snapshot.session_info
+
+    def get_history(self, channel, seconds):
+        """Get a view of the last `seconds` seconds of a channel."""
+        return self.history.window(channel, seconds)
+
+    def get_tick_stats(self):
+        """Get tick counters; nothing is ever dropped."""
+        return {'ticks': self.tick, 'dropped': 0, 'idle_polls': 0}
+
+    def require_channels(self, owner, channels):
+        """Channel requests are ignored; every synthetic channel is always published."""
+
+    def release_channels(self, owner):
+        """See require_channels()."""
+
+
+class _VarHeader:
+    """Minimal irsdk.VarHeader replacement."""
+
+    def __init__(self, name, var_type, offset, count=1):
+        """Describe a variable of irsdk type code var_type at a byte offset."""
+        self.name = name
+        self.type = var_type
+        self.offset = offset
+        self.count = count
+
+
+class _VarBuffer:
+    """Minimal irsdk.VarBuffer replacement backed by a bytearray."""
+
+    def __init__(self, memory):
+        """Serve memory as the latest var buffer."""
+        self.memory = memory
+        self.buf_offset = 0
+
+    def get_memory(self):
+        """Return the buffer's memory."""
+        return self.memory
+
+
+class _Header:
+    """Minimal irsdk.Header replacement."""
+
+    def __init__(self, buf_len):
+        """Record the var buffer length."""
+        self.buf_len = buf_len
+
+
+class MockSDK:
+    """irsdk.IRSDK look-alike whose var buffer advances one tick per freeze.
+
+    Exposes the same private buffer attributes IRSDKSource uses, so the
+    client's full decode path is exercised without a sim.
+    """
+
+    def __init__(self, extra_arrays=0):
+        """Lay out the default channels (plus optional 64-wide CarIdx arrays)."""
+        names = ['SessionTick', 'SessionTime', 'SessionNum', 'SessionLapsRemain'] + list(DEFAULT_CHANNELS.values())
+        self._var_headers_dict = {}
+        offset = 0
+        for name in names:
+            var_type = 5 if name == 'SessionTime' else 2 if name in ('SessionTick', 'SessionNum', 'SessionLapsRemain', 'Gear') else 4
+            self._var_headers_dict[name] = _VarHeader(name, var_type, offset)
+            offset += 8 if var_type == 5 else 4
+        for i in range(extra_arrays):
+            name = f'CarIdxArray{i}'
+            self._var_headers_dict[name] = _VarHeader(name, 4, offset, 64)
+            offset += 4 * 64
+        self._header = _Header(offset)
+        self._memory = bytearray(offset)
+        self._var_buffer_latest = _VarBuffer(self._memory)
+        self._tick_header = self._var_headers_dict['SessionTick']
+        self.is_initialized = False
+        self.is_connected = False
+        self.session_info_update = 1
+        self.tick = 0
+
+    def startup(self):
+        """Connect immediately."""
+        self.is_initialized = self.is_connected = True
+        return True
+
+    def shutdown(self):
+        """Disconnect."""
+        self.is_initialized = self.is_connected = False
+
+    def freeze_var_buffer_latest(self):
+        """Advance SessionTick by one, as if the sim produced a new frame."""
+        self.tick += 1
+        struct.pack_into('<i', self._memory, self._tick_header.offset, self.tick)
+
+    def unfreeze_var_buffer_latest(self):
+        """Nothing is frozen."""
+
+    def __getitem__(self, key):
+        """Read a variable from the buffer, or a canned session info section."""
+        header = self._var_headers_dict.get(key)
+        if header is not None:
+            fmt = '<d' if header.type == 5 else '<i' if header.type == 2 else '<f'
+            return struct.unpack_from(fmt, self._memory, header.offset)[0]
+        if key == 'WeekendInfo':
+            return {'TrackName': 'spa up'}
+        if key == 'SessionInfo':
+            return {'Sessions': [{'SessionType': 'Race'}]}
+        if key == 'DriverInfo':
+            return {'DriverCarIdx': 0, 'Drivers': []}
+        return None
+
+
+def time_frames(func, frames, warmup=20):
+    """Call func repeatedly and return per-call durations in milliseconds."""
+    for _ in range(warmup):
+        func()
+    durations = np.empty(frames)
+    perf_counter = time.perf_counter
+    for i in range(frames):
+        start = perf_counter()
+        func()
+        durations[i] = perf_counter() - start
+    return durations * 1000.0
+
+
+def measure_allocations(func, frames=50):
+    """Return the mean peak traced allocation (KB) of one call to func."""
+    tracemalloc.start()
+    try:
+        peaks = []
+        for _ in range(frames):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return float(np.mean(peaks)) / 1024.0
+
+
+def summarize(durations):
+    """Return p50/p95/p99/mean of a duration array."""
+    p50, p95, p99 = np.percentile(durations, [50, 95, 99])
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'mean': float(np.mean(durations))}
+
+
+def baseline_path(name):
+    """Path of the saved baseline for a benchmark suite."""
+    return os.path.join(BASELINE_DIR, f'{name}.json')
+
+
+def save_baseline(name, results):
+    """Store results as the new baseline for a suite."""
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def compare_baseline(name, results, metric, tolerance=0.2, higher_is_better=False):
+    """Return (case, baseline, current) for every case that regressed beyond tolerance."""
+    path = baseline_path(name)
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        baseline = json.load(f)
+    regressions = []
+    for case, values in results.items():
+        old = baseline.get(case, {}).get(metric)
+        if not old:
+            continue
+        new = values[metric]
+        change = (old - new) / old if higher_is_better else (new - old) / old
+        if change > tolerance:
+            regressions.append((case, old, new))
+    return regressions
@@ -2,31 +2,171 @@
 iRacing Telemetry Overlay
 
 Main application entry point for the iRacing telemetry overlay system.
+With --headless only the client, recorder and streaming pieces are loaded
+and Qt is never imported.
 """
 
+import argparse
+import functools
+import signal
 import sys
+import threading
+import time
 
-# PyQt5 imports
-try:
-    from PyQt5 import QtWidgets
-except ImportError:
-    print('PyQt5 is not installed. Please run: pip install PyQt5')
-    sys.exit(1)
+START_TIME = time.perf_counter()
 
-# Local imports
-from src.client.iracing_client import IRacingClient
-from src.ui.dashboard import DashboardWindow
-from src.ui.text_overlay import TextOverlay
-from src.ui.graph_overlay import GraphOverlay
+# Seconds between status lines in headless mode
+STATUS_INTERVAL = 10.0
 
 
-def main():
-    """Main application entry point."""
+def parse_args(argv):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description='iRacing telemetry overlay')
+    parser.add_argument('--replay', metavar='FILE',
+                        help='play back a telemetry recording or .ibt file instead of the live sim')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='replay speed multiplier; 0 plays as fast as possible')
+    parser.add_argument('--loop', action='store_true', help='loop the replay')
+    parser.add_argument('--process', action='store_true',
+                        help='acquire telemetry in a separate process sharing memory with the UI')
+    parser.add_argument('--publish', metavar='HOST:PORT', nargs='?', const='127.0.0.1',
+                        help='stream telemetry over UDP to HOST:PORT (broadcast with x.x.x.255)')
+    parser.add_argument('--connect', metavar='HOST:PORT', nargs='?', const='0.0.0.0',
+                        help='show telemetry received over UDP on HOST:PORT instead of acquiring it')
+    parser.add_argument('--record', metavar='FILE', help='record telemetry to FILE')
+    parser.add_argument('--standings', action='store_true',
+                        help='compute field standings, gaps and the relative for every snapshot')
+    parser.add_argument('--headless', action='store_true',
+                        help='run without a GUI: acquire, record and/or publish only')
+    parser.add_argument('--exit-after-first-sample', action='store_true', help=argparse.SUPPRESS)
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+class FirstSampleTimer:
+    """Sink that reports the time from process start to the first telemetry sample."""
+
+    def __init__(self, mode, done=None):
+        """Report for `mode`; done, if given, is an Event set once the sample arrived."""
+        self.mode = mode
+        self.done = done
+        self.elapsed = None
+
+    def on_snapshot(self, snapshot):
+        """Print the time to the first snapshot carrying telemetry."""
+        if self.elapsed is not None or not snapshot.telemetry:
+            return
+        self.elapsed = time.perf_counter() - START_TIME
+        print(f'First sample {self.elapsed * 1000:.0f} ms after start ({self.mode})', flush=True)
+        if self.done is not None:
+            self.done.set()
+
+    def on_session_info(self, update, session_info):
+        """Session info is not timed."""
+
+    def on_connection_state(self, state):
+        """Connection changes are not timed."""
+
+
+def create_client(args):
+    """Build the telemetry client selected on the command line; pieces are imported only when used."""
+    source_factory = None
+    if args.replay:
+        if args.replay.lower().endswith('.ibt'):
+            from src.client.ibt_reader import IbtSource as source_class
+        else:
+            from src.client.sources import ReplaySource as source_class
+        source_factory = functools.partial(source_class, args.replay, speed=args.speed, loop=args.loop)
+    if args.connect:
+        from src.client.network import NetworkClient, parse_address
+        return NetworkClient(parse_address(args.connect, '0.0.0.0'))
+    if args.process:
+        from src.client.acquisition_process import ProcessClient
+        ir_client = ProcessClient(source_factory)
+    else:
+        from src.client.iracing_client import IRacingClient
+        ir_client = IRacingClient(source=source_factory() if source_factory else None)
+    if args.standings:
+        from src.client.standings import STANDINGS_INPUTS
+        ir_client.require_channels('standings', STANDINGS_INPUTS)
+    return ir_client
+
+
+def create_outputs(args, ir_client):
+    """Attach the recorder and publisher sinks requested on the command line; return them."""
+    outputs = []
+    if args.record:
+        from src.client.recorder import TelemetryRecorder
+        recorder = TelemetryRecorder(args.record)
+        recorder.start()
+        recorder.attach(ir_client)
+        outputs.append(recorder)
+    if args.publish and not args.connect:
+        from src.client.network import TelemetryPublisher, parse_address
+        publisher = TelemetryPublisher(parse_address(args.publish))
+        publisher.attach(ir_client)
+        outputs.append(publisher)
+    return outputs
+
+
+def close_outputs(ir_client, outputs):
+    """Detach and shut down recorder and publisher sinks."""
+    for output in outputs:
+        output.detach(ir_client)
+        if hasattr(output, 'stop'):
+            output.stop()
+            error = output.get_stats()['error']
+            if error:
+                print(f"Recording to {output.path} failed: {error}", file=sys.stderr)
+        else:
+            output.close()
+
+
+def run_headless(args):
+    """Acquire, record and publish without a GUI until interrupted."""
+    stop = threading.Event()
+    first_sample = threading.Event()
+    ir_client = create_client(args)
+    ir_client.add_sink(FirstSampleTimer('headless', first_sample))
+    outputs = create_outputs(args, ir_client)
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    if args.exit_after_first_sample:
+        stop = first_sample
+    while not stop.wait(STATUS_INTERVAL):
+        stats = ir_client.get_tick_stats()
+        print(f"{ir_client.get_connection_state()}: ticks {stats['ticks']}  dropped {stats['dropped']}", flush=True)
+
+    close_outputs(ir_client, outputs)
+    ir_client.stop()
+    return 0
+
+
+def run_gui(args):
+    """Run the dashboard; the overlay modules are imported when first opened."""
+    try:
+        from PyQt5 import QtWidgets
+    except ImportError:
+        print('PyQt5 is not installed. Please run: pip install PyQt5')
+        return 1
+    from src.ui.dashboard import DashboardWindow
+    from src.ui.frame_scheduler import FrameScheduler
+    from src.ui.signal_bridge import SnapshotNotifier
+
     app = QtWidgets.QApplication(sys.argv)
-    
+
     # Initialize iRacing client
-    ir_client = IRacingClient()
-    
+    ir_client = create_client(args)
+    first_sample = FirstSampleTimer('gui')
+    ir_client.add_sink(first_sample)
+    outputs = create_outputs(args, ir_client)
+
+    # New snapshots are pushed to the UI thread; one scheduler drives every window
+    notifier = SnapshotNotifier()
+    ir_client.add_sink(notifier)
+    scheduler = FrameScheduler(ir_client, notifier)
+
     # Overlay instances
     text_overlay = None
     graph_overlay = None
@@ -35,7 +175,8 @@ def main():
         """Show or activate the text overlay."""
         nonlocal text_overlay
         if text_overlay is None or not text_overlay.isVisible():
-            text_overlay = TextOverlay(ir_client)
+            from src.ui.text_overlay import TextOverlay
+            text_overlay = TextOverlay(ir_client, scheduler)
             text_overlay.show()
         else:
             text_overlay.activateWindow()
@@ -45,23 +186,36 @@ def main():
         """Show or activate the graph overlay."""
         nonlocal graph_overlay
         if graph_overlay is None or not graph_overlay.isVisible():
-            graph_overlay = GraphOverlay(ir_client)
+            from src.ui.graph_overlay import GraphOverlay
+            graph_overlay = GraphOverlay(ir_client, scheduler)
             graph_overlay.show()
         else:
             graph_overlay.activateWindow()
             graph_overlay.raise_()
 
     # Create and show dashboard
-    dashboard = DashboardWindow(ir_client, show_text_overlay, show_graph_overlay)
+    dashboard = DashboardWindow(ir_client, show_text_overlay, show_graph_overlay, scheduler)
+    notifier.connection_state_changed.connect(dashboard.set_connection_state)
+    if args.exit_after_first_sample:
+        notifier.snapshot_ready.connect(lambda _: first_sample.elapsed is not None and app.quit())
     dashboard.show()
-    
+    scheduler.start()
+
     # Run application
     exit_code = app.exec_()
-    
+
     # Cleanup
+    scheduler.stop()
+    close_outputs(ir_client, outputs)
     ir_client.stop()
-    sys.exit(exit_code)
+    return exit_code
+
+
+def main():
+    """Main application entry point."""
+    args = parse_args(sys.argv[1:])
+    sys.exit(run_headless(args) if args.headless else run_gui(args))
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
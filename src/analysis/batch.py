@@ -0,0 +1,185 @@
+"""
+Batch Session Analysis
+
+Computes per-lap statistics for many TelemetryRecorder recordings (found by
+their file header, whatever their extension) and .ibt files on a process
+pool and writes one summary table. Files are read as memory-mapped
+NumPy columns, and each file's result is cached by content hash so re-runs
+only analyze new or changed files.
+
+Usage: python -m src.analysis.batch PATH... [--output summary.csv] [--workers N]
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+from src.analysis.laps import ANALYSIS_CHANNELS, lap_statistics
+from src.client.channels import DEFAULT_CHANNELS
+from src.client.lap_delta import LAP_DELTA_INPUTS
+from src.client.recorder import MAGIC, map_recording
+
+
+# Bump when lap_statistics() output changes to invalidate cached results
+ANALYSIS_VERSION = 2
+IBT_EXTENSION = '.ibt'
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.iracing_overlay', 'analysis_cache')
+HASH_BLOCK_SIZE = 1 << 20
+
+# Analysis channel -> .ibt variable name
+IBT_CHANNELS = dict(DEFAULT_CHANNELS, **LAP_DELTA_INPUTS, time='SessionTime')
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_channels(path):
+    """Load the analysis channels of a file as name -> 1-D array.
+
+    .ibt columns are strided views of the mapped file; recordings are mapped
+    too and their chunks concatenated once per channel. A recording's time is
+    its SessionTime channel when recorded, otherwise the snapshot timestamps;
+    tick numbers are not used since they are -1 without tick sync and restart
+    with each session.
+    """
+    if path.lower().endswith(IBT_EXTENSION):
+        from src.client.ibt_reader import IbtReader
+        reader = IbtReader(path)
+        return {name: reader.column(IBT_CHANNELS[name]) for name in ANALYSIS_CHANNELS
+                if IBT_CHANNELS[name] in reader}
+
+    chunks = {}
+    for kind, value in map_recording(path):
+        if kind == 'chunk':
+            for name, column in value.items():
+                chunks.setdefault(name, []).append(column)
+    channels = {name: np.concatenate(chunks[name]) for name in ANALYSIS_CHANNELS if name in chunks}
+    rows = sum(len(column) for column in chunks.get('timestamp', []))
+    for time_channel in (IBT_CHANNELS['time'], 'timestamp'):
+        # SessionTime is only usable if it was recorded from the first chunk on
+        if time_channel in chunks and sum(len(column) for column in chunks[time_channel]) == rows:
+            channels['time'] = np.concatenate(chunks[time_channel])
+            break
+    return channels
+
+
+def analyze_file(path, cache_dir=None):
+    """Per-lap statistics rows for one file, served from cache_dir when its contents are unchanged."""
+    digest = file_digest(path)
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, f'{digest}.v{ANALYSIS_VERSION}.json')
+        try:
+            with open(cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    channels = load_channels(path)
+    if not {'lap', 'lap_dist_pct', 'time'} <= channels.keys():
+        rows = []
+    else:
+        rows = lap_statistics(channels)
+
+    if cache_path is not None:
+        temp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(rows, f)
+        os.replace(temp_path, cache_path)
+    return rows
+
+
+def is_analyzable(path):
+    """True for .ibt files and for recordings, which are recognized by their header whatever their name."""
+    if path.lower().endswith(IBT_EXTENSION):
+        return True
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def find_files(paths):
+    """Expand directories into the analyzable files they contain, sorted."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(candidate for candidate in (os.path.join(root, name) for name in names)
+                             if is_analyzable(candidate))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def analyze_files(files, cache_dir=None, workers=None):
+    """Analyze files on a process pool; return {path: rows}.
+
+    A file that fails to analyze gets a single row holding the error, so one
+    malformed recording does not abort the batch.
+    """
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+    results = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyze_file, path, cache_dir): path for path in files}
+        for future in concurrent.futures.as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                error = f'{type(e).__name__}: {e}'
+                print(f"Failed to analyze {path}: {error}", file=sys.stderr)
+                results[path] = [{'error': error}]
+    return results
+
+
+def write_summary(results, output):
+    """Write one CSV row per lap, prefixed with its source file."""
+    fieldnames = ['file']
+    for rows in results.values():
+        for row in rows:
+            fieldnames.extend(key for key in row if key not in fieldnames)
+    with open(output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames)
+        writer.writeheader()
+        for path in sorted(results):
+            for row in results[path]:
+                writer.writerow(dict(row, file=os.path.basename(path)))
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Per-lap statistics for recorded sessions')
+    parser.add_argument('paths', nargs='+', help='recordings, .ibt files or directories containing them')
+    parser.add_argument('--output', default='lap_summary.csv', help='summary CSV to write')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='per-file result cache')
+    parser.add_argument('--no-cache', action='store_true', help='ignore and do not write cached results')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    args = parser.parse_args(argv)
+
+    files = find_files(args.paths)
+    results = analyze_files(files, None if args.no_cache else args.cache_dir, args.workers)
+    write_summary(results, args.output)
+    failed = sum(1 for rows in results.values() if rows and 'error' in rows[0])
+    laps = sum(len(rows) for rows in results.values()) - failed
+    print(f"{laps} laps from {len(results) - failed} files written to {args.output}"
+          + (f" ({failed} failed)" if failed else ''))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
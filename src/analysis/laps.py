@@ -0,0 +1,116 @@
+"""
+Lap Statistics
+
+Vectorized per-lap statistics over whole-session channel columns. Laps are
+segmented on changes of the lap counter; every statistic is computed for all
+laps at once with reduceat/searchsorted rather than a loop over samples.
+"""
+
+import numpy as np
+
+from src.utils.telemetry_utils import MPS_TO_MPH
+
+
+# Fractions of the lap where sectors 2 and 3 start
+SECTOR_SPLITS = (1 / 3, 2 / 3)
+BRAKE_THRESHOLD = 0.1
+MIN_LAP_COVERAGE = 0.95  # a complete lap reaches at least this LapDistPct
+TIRES = ('LF', 'RF', 'LR', 'RR')
+
+# Channels lap_statistics() reads; 'time' is in seconds
+ANALYSIS_CHANNELS = ['lap', 'lap_dist_pct', 'time', 'speed', 'brake', 'fuel_level'] + [
+    f'tire_temp_{tire}' for tire in TIRES]
+
+
+def segment_laps(lap, dist):
+    """Split a session into laps.
+
+    Returns (boundaries, complete): boundaries are the sample indices where
+    the lap counter changes, lap i spans boundaries[i]:boundaries[i + 1],
+    and complete flags the laps entered from the previous lap number, left
+    to the next one and covering the whole distance.
+    """
+    boundaries = np.flatnonzero(np.diff(lap) != 0) + 1
+    if len(boundaries) < 2:
+        return boundaries, np.zeros(0, dtype=bool)
+    starts, ends = boundaries[:-1], boundaries[1:]
+    max_dist = np.maximum.reduceat(dist, boundaries)[:-1]
+    complete = ((lap[starts] == lap[starts - 1] + 1) & (lap[ends] == lap[starts] + 1)
+                & (max_dist >= MIN_LAP_COVERAGE))
+    return boundaries, complete
+
+
+def lap_distance_key(dist, boundaries):
+    """Monotonic lap index + distance for every sample between the first and last boundary.
+
+    Samples just after the line that still report the previous lap's
+    distance (~0.99) are clamped to the start of their lap.
+    """
+    lengths = np.diff(boundaries)
+    segment = np.repeat(np.arange(len(lengths)), lengths)
+    local = np.arange(boundaries[0], boundaries[-1]) - np.repeat(boundaries[:-1], lengths)
+    lap_dist = np.clip(dist[boundaries[0]:boundaries[-1]], 0.0, np.nextafter(1.0, 0.0))
+    wrapped = (lap_dist > 0.5) & (local < np.repeat(lengths, lengths) * 0.1)
+    return np.maximum.accumulate(segment + np.where(wrapped, 0.0, lap_dist))
+
+
+def lap_statistics(channels):
+    """Per-lap statistics of the complete laps in a session.
+
+    channels maps the ANALYSIS_CHANNELS names to equal-length arrays (any
+    missing besides lap, lap_dist_pct and time are reported as NaN).
+    Returns a list of row dictionaries, one per complete lap.
+    """
+    lap = np.asarray(channels['lap'])
+    dist = np.asarray(channels['lap_dist_pct'], dtype=np.float64)
+    time = np.asarray(channels['time'], dtype=np.float64)
+    boundaries, complete = segment_laps(lap, dist)
+    if not complete.any():
+        return []
+    starts, ends = boundaries[:-1], boundaries[1:]
+    n = len(time)
+
+    def column(name):
+        values = channels.get(name)
+        return np.full(n, np.nan) if values is None else np.asarray(values, dtype=np.float64)
+
+    speed = column('speed')
+    brake = column('brake')
+    fuel = column('fuel_level')
+    lap_times = time[ends] - time[starts]
+
+    # Sector boundaries: first sample at or past each split, found on the monotonic distance key
+    key = lap_distance_key(dist, boundaries)
+    laps = np.arange(len(starts))
+    crossings = [np.minimum(np.searchsorted(key, laps + split), len(key) - 1) + boundaries[0]
+                 for split in SECTOR_SPLITS]
+    edges = [starts] + crossings + [ends]
+    sectors = [time[b] - time[a] for a, b in zip(edges[:-1], edges[1:])]
+
+    # Braking points: samples where the brake rises through the threshold
+    pressed = brake > BRAKE_THRESHOLD
+    onsets = np.flatnonzero(pressed[1:] & ~pressed[:-1]) + 1
+    onsets = onsets[(onsets >= boundaries[0]) & (onsets < boundaries[-1])]
+    onset_lap = np.searchsorted(boundaries, onsets, side='right') - 1
+    # Minimum speed from each braking point to the next, i.e. the corner it leads into
+    corner_speeds = np.minimum.reduceat(speed, onsets) if len(onsets) else np.zeros(0)
+
+    min_speed = np.minimum.reduceat(speed, boundaries)[:-1]
+    lengths = np.diff(boundaries)
+    temps = {tire: np.add.reduceat(column(f'tire_temp_{tire}'), boundaries)[:-1] / lengths for tire in TIRES}
+
+    rows = []
+    for i in np.flatnonzero(complete):
+        zone = onset_lap == i
+        rows.append({
+            'lap': int(lap[starts[i]]),
+            'lap_time': round(float(lap_times[i]), 3),
+            **{f's{j + 1}': round(float(sector[i]), 3) for j, sector in enumerate(sectors)},
+            'fuel_used': round(float(fuel[starts[i]] - fuel[ends[i]]), 3),
+            'min_speed_mph': round(float(min_speed[i] * MPS_TO_MPH), 1),
+            'brake_zones': int(zone.sum()),
+            'brake_points': ' '.join(f'{d:.3f}' for d in dist[onsets[zone]]),
+            'corner_speeds_mph': ' '.join(f'{v * MPS_TO_MPH:.1f}' for v in corner_speeds[zone]),
+            **{f'temp_{tire}': round(float(temps[tire][i]), 1) for tire in TIRES},
+        })
+    return rows
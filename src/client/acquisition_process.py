@@ -0,0 +1,257 @@
+"""
+Out-of-Process Acquisition
+
+Runs IRacingClient (acquisition plus derived channels) in a child process
+that publishes into a SharedTelemetryHistory, so UI work and acquisition no
+longer share a GIL. ProcessClient is the UI-side stand-in for IRacingClient.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+
+from src.client.iracing_client import IRacingClient, DISCONNECTED, PROBING, CONNECTED, STALE
+from src.client.shared_ring import SharedTelemetryHistory
+from src.client.snapshot import TelemetrySnapshot, EMPTY_SNAPSHOT
+
+
+# Prefix of the ring channels that carry numeric session info fields
+SESSION_PREFIX = 'session.'
+
+
+class RingWriter:
+    """IRacingClient sink that publishes snapshots into a shared ring."""
+
+    def __init__(self, ring):
+        """Write into an attached SharedTelemetryHistory."""
+        self.ring = ring
+        self.session_info = None
+        self.session_cache = None
+        self.session_update = None
+
+    def on_snapshot(self, snapshot):
+        """Append the snapshot's scalar telemetry and numeric session fields to the ring."""
+        if not snapshot.telemetry:
+            self.ring.clear()
+            self.ring.set_status(snapshot.seq)
+            return
+        values = dict(snapshot.telemetry)
+        static = {}
+        for key, value in snapshot.session_info.items():
+            if isinstance(value, (int, float)):
+                values[SESSION_PREFIX + key] = value
+            else:
+                static[key] = value
+        if static != self.session_info:
+            self.session_info = static
+            self._write_session()
+        self.ring.append(values, snapshot.timestamp, snapshot.tick)
+        self.ring.set_status(snapshot.seq)
+
+    def on_session_info(self, update, session_info):
+        """Publish the parsed session structures."""
+        self.session_update = update
+        self.session_cache = session_info
+        self._write_session()
+
+    def on_connection_state(self, state):
+        """Publish the connection state."""
+        self.ring.set_status(None, state=state)
+
+    def _write_session(self):
+        """Write the session document read by ProcessClient."""
+        self.ring.write_session({'info': self.session_info, 'update': self.session_update,
+                                 'cache': self.session_cache})
+
+
+def run_acquisition(ring_name, control, source_factory, client_kwargs):
+    """Child process entry point: acquire into the shared ring until told to stop.
+
+    control is a queue of ('require', owner, channels), ('release', owner)
+    and ('stop',) commands from the UI process.
+    """
+    ring = SharedTelemetryHistory(ring_name)
+    source = source_factory() if source_factory is not None else None
+    client = IRacingClient(source=source, **client_kwargs)
+    ring.rate = client.tick_rate
+    client.add_sink(RingWriter(ring))
+    try:
+        while True:
+            try:
+                command = control.get(timeout=ProcessClient.STATS_INTERVAL)
+            except queue.Empty:
+                ring.set_status(None, tick_stats=client.get_tick_stats())
+                continue
+            if command[0] == 'require':
+                client.require_channels(command[1], command[2])
+            elif command[0] == 'release':
+                client.release_channels(command[1])
+            elif command[0] == 'stop':
+                break
+    finally:
+        client.stop()
+        ring.close()
+
+
+class ProcessClient:
+    """IRacingClient API backed by an acquisition process and a shared ring.
+
+    A reader thread polls the ring's sequence number and republishes new
+    samples as TelemetrySnapshots to the same sinks IRacingClient supports.
+    history is the shared ring itself, so history windows are zero-copy
+    views of the writer's buffers.
+    """
+
+    STATS_INTERVAL = 0.25
+    IDLE_INTERVAL = 0.1
+
+    def __init__(self, source_factory=None, history_seconds=120.0, **client_kwargs):
+        """Start the acquisition process.
+
+        source_factory is a picklable callable returning the TelemetrySource
+        to acquire from (e.g. functools.partial(ReplaySource, path)); by
+        default the live SDK is used. client_kwargs are passed to the child's
+        IRacingClient, which keeps no history of its own since the shared ring
+        is the history.
+        """
+        self.history = SharedTelemetryHistory(create=True, duration=history_seconds,
+                                              rate=IRacingClient.TICK_RATE)
+        context = multiprocessing.get_context('spawn')
+        self.control = context.Queue()
+        self.process = context.Process(
+            target=run_acquisition, name='telemetry-acquisition', daemon=True,
+            args=(self.history.name, self.control, source_factory,
+                  dict(client_kwargs, history_seconds=0)))
+        self.process.start()
+        self.snapshot = EMPTY_SNAPSHOT
+        self.state = DISCONNECTED
+        self.sinks = []
+        self.session_cache = {}
+        self.session_info_update = None
+        self._session_info = {}
+        self.running = True
+        self._wake = threading.Event()
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+
+    def _read_loop(self):
+        """Background thread that turns new ring samples into snapshots."""
+        history = self.history
+        seq = 0
+        next_check = 0.0
+        while self.running:
+            now = time.perf_counter()
+            if now >= next_check:
+                next_check = now + self.STATS_INTERVAL
+                state = history.state if self.process.is_alive() else DISCONNECTED
+                if state != self.state:
+                    self.state = state
+                    for sink in self.sinks:
+                        sink.on_connection_state(state)
+            self._read_session()
+            if history.seq != seq:
+                seq = history.seq
+                self._publish(seq)
+            elif self.state in (DISCONNECTED, PROBING):
+                self._wake.wait(self.IDLE_INTERVAL)
+            else:
+                self._wake.wait(1.0 / (history.rate * 4))
+
+    def _read_session(self):
+        """Pick up a new session document and notify sinks if the session cache changed."""
+        document = self.history.read_session()
+        if not document:
+            return
+        self._session_info = document['info'] or {}
+        if document['update'] != self.session_info_update and document['cache'] is not None:
+            self.session_info_update = document['update']
+            self.session_cache = document['cache']
+            for sink in self.sinks:
+                sink.on_session_info(self.session_info_update, self.session_cache)
+
+    def _publish(self, seq):
+        """Publish the newest ring sample as a snapshot."""
+        latest = self.history.latest()
+        if latest is None:
+            snapshot = TelemetrySnapshot(seq)
+        else:
+            values, timestamp, tick = latest
+            telemetry, session_info = {}, dict(self._session_info)
+            for key, value in values.items():
+                if key.startswith(SESSION_PREFIX):
+                    session_info[key[len(SESSION_PREFIX):]] = value
+                else:
+                    telemetry[key] = value
+            snapshot = TelemetrySnapshot(seq, telemetry, session_info, tick, timestamp)
+        self.snapshot = snapshot
+        for sink in self.sinks:
+            sink.on_snapshot(snapshot)
+
+    @property
+    def is_connected(self):
+        """True while the acquisition process is connected to a source."""
+        return self.state in (CONNECTED, STALE)
+
+    @property
+    def tick_rate(self):
+        """Telemetry tick rate of the acquisition process's source in Hz."""
+        return self.history.rate
+
+    def get_connection_state(self):
+        """Get the acquisition process's connection state."""
+        return self.state
+
+    def get_snapshot(self):
+        """Get the most recently published telemetry snapshot."""
+        return self.snapshot
+
+    def has_changed_since(self, seq):
+        """Return True if a snapshot newer than sequence number seq is available."""
+        return self.snapshot.is_newer_than(seq)
+
+    def get_telemetry(self):
+        """Get a read-only view of the current telemetry data."""
+        return self.snapshot.telemetry
+
+    def get_session_info(self):
+        """Get a read-only view of the current session information."""
+        return self.snapshot.session_info
+
+    def require_channels(self, owner, channels):
+        """Forward a consumer's channel request to the acquisition process."""
+        self.control.put(('require', owner, dict(channels) if hasattr(channels, 'items') else list(channels)))
+
+    def release_channels(self, owner):
+        """Forward a channel release to the acquisition process."""
+        self.control.put(('release', owner))
+
+    def add_sink(self, sink):
+        """Register a sink, fed from the reader thread."""
+        self.sinks = self.sinks + [sink]
+        sink.on_connection_state(self.state)
+        if self.session_info_update is not None:
+            sink.on_session_info(self.session_info_update, self.session_cache)
+
+    def remove_sink(self, sink):
+        """Unregister a sink."""
+        self.sinks = [s for s in self.sinks if s is not sink]
+
+    def get_history(self, channel, seconds):
+        """Get a zero-copy view of the last `seconds` seconds of a channel."""
+        return self.history.window(channel, seconds)
+
+    def get_tick_stats(self):
+        """Get the acquisition process's acquired and dropped tick counts and idle polls."""
+        return self.history.tick_stats
+
+    def stop(self):
+        """Stop the reader thread and the acquisition process and free the ring."""
+        self.running = False
+        self._wake.set()
+        self.thread.join()
+        self.control.put(('stop',))
+        self.process.join(timeout=5.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.history.close()
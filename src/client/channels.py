@@ -0,0 +1,141 @@
+"""
+Channel Registry
+
+Resolves SDK variable offsets once per session and decodes every requested
+channel from the var buffer in a single NumPy pass.
+"""
+
+import threading
+
+import numpy as np
+
+
+# Display key -> SDK variable name for the standard channels; consumers that show,
+# record or stream them require the ones they use
+DEFAULT_CHANNELS = {
+    'speed': 'Speed',
+    'rpm': 'RPM',
+    'gear': 'Gear',
+    'lap_time': 'LapCurrentLapTime',
+    'fuel_level': 'FuelLevel',
+    'steering': 'SteeringWheelAngle',
+    'throttle': 'Throttle',
+    'brake': 'Brake',
+    'clutch': 'Clutch',
+    'tire_temp_LF': 'LFtempCL',
+    'tire_temp_RF': 'RFtempCL',
+    'tire_temp_LR': 'LRtempCL',
+    'tire_temp_RR': 'RRtempCL',
+}
+
+# irsdk var header type codes (see irsdk.VAR_TYPE_MAP) -> NumPy dtypes
+VAR_TYPE_DTYPES = ['S1', '?', '<i4', '<u4', '<f4', '<f8']
+
+
+class ChannelRegistry:
+    """Union of the channels requested by the client's consumers.
+
+    Only requested channels are decoded; the base set is empty unless given.
+
+    require()/release() run on the UI thread while decode() runs on the
+    acquisition thread; every change bumps a generation under a lock, and a
+    layout bound against an older generation is used once but not kept.
+    """
+
+    def __init__(self, channels=None):
+        """Initialize with an optional base set of display key -> SDK variable mappings."""
+        self._requests = {'client': dict(channels or {})}
+        self._channels = None
+        self._layout = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def channels(self):
+        """Display key -> SDK variable mapping for the union of all requests."""
+        channels = self._channels
+        if channels is None:
+            with self._lock:
+                channels = {}
+                for requested in self._requests.values():
+                    channels.update(requested)
+                self._channels = channels
+        return channels
+
+    def require(self, owner, channels):
+        """Declare the channels a consumer needs, replacing its previous request.
+
+        channels may be a mapping of display key -> SDK variable name, or an
+        iterable of SDK variable names used as their own keys.
+        """
+        if not hasattr(channels, 'items'):
+            channels = {name: name for name in channels}
+        with self._lock:
+            self._requests[owner] = dict(channels)
+            self._invalidate()
+
+    def release(self, owner):
+        """Drop a consumer's channel request."""
+        with self._lock:
+            if self._requests.pop(owner, None) is not None:
+                self._invalidate()
+
+    def invalidate(self):
+        """Forget the resolved layout; it is rebuilt on the next decode."""
+        with self._lock:
+            self._invalidate()
+
+    def _invalidate(self):
+        """Drop the cached union and layout and start a new generation; the lock is held."""
+        self._generation += 1
+        self._channels = None
+        self._layout = None
+
+    def bind(self, var_headers, buf_len):
+        """Resolve offsets and types of the requested channels into a structured dtype.
+
+        The layout is only cached if no request changed while it was built.
+        """
+        with self._lock:
+            generation = self._generation
+        names, formats, offsets = [], [], []
+        scalar_fields, scalar_keys, array_fields = [], [], []
+        for key, var_name in self.channels.items():
+            header = var_headers.get(var_name)
+            if header is None:
+                continue
+            field = f'f{len(names)}'
+            dtype = VAR_TYPE_DTYPES[header.type]
+            names.append(field)
+            formats.append(dtype if header.count == 1 else (dtype, (header.count,)))
+            offsets.append(header.offset)
+            if header.count == 1:
+                scalar_fields.append(field)
+                scalar_keys.append(key)
+            else:
+                array_fields.append((key, field))
+        dtype = np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': buf_len})
+        # Swapped in as one tuple so a concurrent require() never sees a half-built layout
+        layout = (var_headers, dtype, scalar_fields, scalar_keys, array_fields)
+        with self._lock:
+            if generation == self._generation:
+                self._layout = layout
+        return layout
+
+    def decode(self, var_headers, memory, offset, buf_len):
+        """Decode all requested channels from one var buffer line."""
+        layout = self._layout
+        if layout is None or layout[0] is not var_headers:
+            layout = self.bind(var_headers, buf_len)
+        _, dtype, scalar_fields, scalar_keys, array_fields = layout
+        record = np.frombuffer(memory, dtype, count=1, offset=offset)
+        values = dict(zip(scalar_keys, record[scalar_fields].tolist()[0]))
+        for key, field in array_fields:
+            array = record[field][0].copy()
+            array.flags.writeable = False
+            values[key] = array
+        return values
+
+    def read_each(self, ir):
+        """Fallback for sources without raw buffer access: look up channels one by one."""
+        return {key: ir[var_name] for key, var_name in self.channels.items()}
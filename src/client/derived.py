@@ -0,0 +1,217 @@
+"""
+Derived Channels
+
+Metrics computed from the raw channels as they are acquired: fuel per lap,
+laps of fuel remaining, rolling average lap time, pedal application rates and
+peak g. Every metric is an incremental operator doing O(1) (amortized) work
+per tick, so nothing is ever recomputed over the history.
+"""
+
+import collections
+import math
+
+
+NAN = float('nan')
+STANDARD_GRAVITY = 9.80665
+
+# Raw channels the derived metrics read (display key -> SDK variable)
+DERIVED_INPUTS = {
+    'fuel_level': 'FuelLevel',
+    'throttle': 'Throttle',
+    'brake': 'Brake',
+    'lap': 'Lap',
+    'lat_accel': 'LatAccel',
+    'long_accel': 'LongAccel',
+}
+
+
+class EWMA:
+    """Exponentially weighted moving average."""
+
+    def __init__(self, alpha):
+        """alpha is the weight of each new sample (0 < alpha <= 1)."""
+        self.alpha = alpha
+        self.value = NAN
+
+    def update(self, x):
+        """Fold in a sample and return the new average."""
+        if math.isnan(self.value):
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+    def reset(self):
+        """Forget the average."""
+        self.value = NAN
+
+
+class RollingMean:
+    """Mean of the last n samples, kept as a running sum."""
+
+    def __init__(self, n):
+        """Average over at most n samples."""
+        self.samples = collections.deque(maxlen=n)
+        self.total = 0.0
+
+    def update(self, x):
+        """Add a sample and return the mean of the window."""
+        if len(self.samples) == self.samples.maxlen:
+            self.total -= self.samples[0]
+        self.samples.append(x)
+        self.total += x
+        return self.value
+
+    @property
+    def value(self):
+        """Current mean, or NaN before the first sample."""
+        return self.total / len(self.samples) if self.samples else NAN
+
+    def reset(self):
+        """Empty the window."""
+        self.samples.clear()
+        self.total = 0.0
+
+
+class WindowedExtreme:
+    """Maximum (or minimum) over a sliding time window using a monotonic deque.
+
+    Each sample is pushed and popped at most once, so updates are amortized O(1).
+    """
+
+    def __init__(self, window, maximum=True):
+        """Track the extreme of samples in the last `window` seconds."""
+        self.window = window
+        self.sign = 1.0 if maximum else -1.0
+        self._deque = collections.deque()
+
+    def update(self, t, x):
+        """Add sample x taken at time t (seconds) and return the window's extreme."""
+        x *= self.sign
+        d = self._deque
+        while d and d[-1][1] <= x:
+            d.pop()
+        d.append((t, x))
+        while d[0][0] <= t - self.window:
+            d.popleft()
+        return d[0][1] * self.sign
+
+    def reset(self):
+        """Drop every sample in the window."""
+        self._deque.clear()
+
+
+class LapAccumulator:
+    """Change in a cumulative value over each completed lap."""
+
+    def __init__(self):
+        """Start with no lap seen."""
+        self.lap = None
+        self.start = NAN
+
+    def update(self, lap, value):
+        """Feed the current lap number and value.
+
+        Returns the change in value over the lap that just ended when lap
+        increments, otherwise None. The first lap seen is partial and is
+        never reported.
+        """
+        if lap == self.lap:
+            return None
+        completed = lap == self.lap + 1 if self.lap is not None else False
+        change = value - self.start if completed and not math.isnan(self.start) else None
+        self.lap = lap
+        self.start = value
+        return change
+
+    def reset(self):
+        """Forget the current lap and its starting value."""
+        self.lap = None
+        self.start = NAN
+
+
+class DerivedChannels:
+    """Incremental derived metrics, updated once per acquired frame.
+
+    update() takes the raw telemetry of a frame and its time in seconds and
+    returns the derived values to publish alongside it. Values that are not
+    known yet (e.g. before the first complete lap) are NaN.
+    """
+
+    LAP_WINDOW = 5  # laps averaged for lap time and fuel per lap
+    RATE_ALPHA = 0.2  # smoothing of pedal application rates
+    PEAK_G_WINDOW = 10.0  # seconds
+    MAX_GAP = 1.0  # seconds between frames before rates restart
+
+    def __init__(self):
+        """Create the operators with empty state."""
+        self.fuel_lap = LapAccumulator()
+        self.time_lap = LapAccumulator()
+        self.fuel_per_lap = RollingMean(self.LAP_WINDOW)
+        self.lap_time = RollingMean(self.LAP_WINDOW)
+        self.throttle_rate = EWMA(self.RATE_ALPHA)
+        self.brake_rate = EWMA(self.RATE_ALPHA)
+        self.peak_g = WindowedExtreme(self.PEAK_G_WINDOW)
+        self.last_time = None
+        self.last_pedals = None
+        self.last_fuel_used = NAN
+
+    def update(self, telemetry, now):
+        """Advance every operator by one frame and return the derived channels."""
+        dt = None if self.last_time is None else now - self.last_time
+        if dt is not None and not 0 < dt <= self.MAX_GAP:
+            # Seek, loop or long stall: restart the time-based operators
+            self.reset_rates()
+            dt = None
+        self.last_time = now
+
+        fuel = telemetry.get('fuel_level', 0.0)
+        lap = telemetry.get('lap')
+        if lap is not None:
+            fuel_change = self.fuel_lap.update(lap, fuel)
+            # Fuel is consumed, so a lap's change is negative; a positive change means the
+            # car was refuelled during the lap and says nothing about consumption
+            if fuel_change is not None and fuel_change < 0:
+                self.last_fuel_used = -fuel_change
+                self.fuel_per_lap.update(-fuel_change)
+            lap_time = self.time_lap.update(lap, now)
+            if lap_time is not None:
+                self.lap_time.update(lap_time)
+        fuel_per_lap = self.fuel_per_lap.value
+
+        throttle = telemetry.get('throttle', 0.0)
+        brake = telemetry.get('brake', 0.0)
+        if dt is not None:
+            last_throttle, last_brake = self.last_pedals
+            self.throttle_rate.update((throttle - last_throttle) / dt)
+            self.brake_rate.update((brake - last_brake) / dt)
+        self.last_pedals = (throttle, brake)
+
+        g = math.hypot(telemetry.get('lat_accel', 0.0), telemetry.get('long_accel', 0.0)) / STANDARD_GRAVITY
+
+        return {
+            'fuel_used_last_lap': self.last_fuel_used,
+            'fuel_per_lap': fuel_per_lap,
+            'fuel_laps_remaining': fuel / fuel_per_lap if fuel_per_lap > 0 else NAN,
+            'lap_time_avg': self.lap_time.value,
+            'throttle_rate': self.throttle_rate.value,
+            'brake_rate': self.brake_rate.value,
+            'peak_g': self.peak_g.update(now, g),
+        }
+
+    def reset_rates(self):
+        """Forget the state of the time-based operators."""
+        self.last_time = None
+        self.last_pedals = None
+        self.throttle_rate.reset()
+        self.brake_rate.reset()
+        self.peak_g.reset()
+        self.time_lap.reset()
+
+    def reset(self):
+        """Forget all state, e.g. after a disconnect."""
+        self.reset_rates()
+        self.fuel_lap.reset()
+        self.fuel_per_lap.reset()
+        self.lap_time.reset()
+        self.last_fuel_used = NAN
@@ -0,0 +1,232 @@
+"""
+Telemetry History
+
+Preallocated NumPy ring buffer holding every acquired channel at the full tick rate.
+"""
+
+import numpy as np
+
+
+class TelemetryHistory:
+    """Fixed-duration ring buffer of numeric telemetry channels.
+
+    Each channel is stored twice back to back (a mirrored ring), so any window
+    of up to `capacity` samples is a contiguous slice and can be returned as a
+    read-only view without copying. Views alias the ring and are only valid
+    until the writer wraps around to them again.
+    """
+
+    def __init__(self, duration=120.0, rate=60):
+        """Allocate room for `duration` seconds of samples at `rate` Hz."""
+        self.rate = rate
+        self.capacity = max(2, int(duration * rate))
+        self.count = 0
+        self._pos = 0
+        self._columns = {}
+        self._timestamps = np.zeros(self.capacity * 2, dtype=np.float64)
+        self._ticks = np.zeros(self.capacity * 2, dtype=np.int64)
+
+    def __len__(self):
+        """Return the number of samples currently held."""
+        return min(self.count, self.capacity)
+
+    @property
+    def channels(self):
+        """Names of the channels being recorded."""
+        return list(self._columns)
+
+    def clear(self):
+        """Drop all samples, keeping the allocated buffers."""
+        self.count = 0
+        self._pos = 0
+        for column in self._columns.values():
+            column[:] = np.nan
+
+    def append(self, values, timestamp, tick=None):
+        """Append one tick of channel values.
+
+        Non-scalar values are skipped; known channels that are absent or not
+        scalar this tick read as NaN rather than keeping an older sample.
+        """
+        pos = self._pos
+        mirror = pos + self.capacity
+        columns = self._columns
+        for name, column in columns.items():
+            value = values.get(name)
+            column[pos] = column[mirror] = value if isinstance(value, (int, float)) else np.nan
+        for name, value in values.items():
+            if name not in columns and isinstance(value, (int, float)):
+                column = self._add_channel(name)
+                column[pos] = column[mirror] = value
+        self._timestamps[pos] = self._timestamps[mirror] = timestamp
+        self._ticks[pos] = self._ticks[mirror] = -1 if tick is None else tick
+        self._pos = (pos + 1) % self.capacity
+        self.count += 1
+
+    def _add_channel(self, name):
+        """Allocate a column for a channel first seen mid-session."""
+        column = np.full(self.capacity * 2, np.nan, dtype=np.float64)
+        self._columns[name] = column
+        return column
+
+    def _view(self, column, n):
+        """Return a read-only view of the newest n samples of a column."""
+        n = max(0, min(n, len(self)))
+        end = self._pos + self.capacity
+        view = column[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def last(self, channel, n):
+        """Get the newest n samples of a channel, oldest first."""
+        column = self._columns.get(channel)
+        if column is None:
+            return self._view(self._timestamps, 0)
+        return self._view(column, n)
+
+    def window(self, channel, seconds):
+        """Get the samples of a channel covering the last `seconds` seconds."""
+        return self.last(channel, int(seconds * self.rate))
+
+    def timestamps(self, n):
+        """Get the acquisition timestamps of the newest n samples."""
+        return self._view(self._timestamps, n)
+
+    def ticks(self, n):
+        """Get the sim tick numbers of the newest n samples."""
+        return self._view(self._ticks, n)
+
+
+class NullHistory(TelemetryHistory):
+    """History that keeps no samples, for clients whose samples are stored elsewhere."""
+
+    def __init__(self, rate=60):
+        """Report `rate` Hz without allocating a ring."""
+        super().__init__(0, rate)
+
+    def append(self, values, timestamp, tick=None):
+        """Discard the sample."""
+
+
+class MinMaxPyramid:
+    """Incrementally maintained min/max summaries of one history channel.
+
+    Level i holds the minimum and maximum of consecutive buckets of
+    BASE * FACTOR**i samples in a mirrored ring, so drawing a long window
+    only has to reduce a few buckets per pixel (M4-style) instead of every
+    sample, and short spikes such as brake taps survive decimation. sync()
+    feeds the samples appended to a history since the previous call.
+    """
+
+    BASE = 2
+    FACTOR = 4
+
+    def __init__(self, capacity):
+        """Summarize up to `capacity` samples (normally the history's capacity)."""
+        self.capacity = capacity
+        self.bucket_sizes = []
+        size = self.BASE
+        while size * 2 <= capacity:
+            self.bucket_sizes.append(size)
+            size *= self.FACTOR
+        self._slots = [capacity // size + 2 for size in self.bucket_sizes]
+        self._mins = [np.full(slots * 2, np.nan) for slots in self._slots]
+        self._maxs = [np.full(slots * 2, np.nan) for slots in self._slots]
+        self.reset()
+
+    def reset(self):
+        """Forget all samples."""
+        self.synced = 0
+        self.total = 0
+        self._counts = [0] * len(self.bucket_sizes)
+        self._pending = [(np.zeros(0), np.zeros(0)) for _ in self.bucket_sizes]
+
+    def sync(self, history, channel):
+        """Add the samples appended to history since the last sync.
+
+        A cleared history, or one that has wrapped past everything summarized,
+        restarts the pyramid from the samples the history still holds.
+        """
+        count = history.count
+        new = count - self.synced
+        if new < 0 or new > min(count, self.capacity):
+            self.reset()
+            new = min(count, self.capacity)
+        self.synced = count
+        if new == 0:
+            return
+        values = history.last(channel, new)
+        if len(values) < new:
+            self.reset()
+            self.synced = count
+            return
+        self.extend(values)
+
+    def extend(self, values):
+        """Add a batch of consecutive samples."""
+        self.total += len(values)
+        mins = maxs = np.asarray(values, dtype=np.float64)
+        factor = self.BASE
+        for level in range(len(self.bucket_sizes)):
+            pending_min, pending_max = self._pending[level]
+            if len(pending_min):
+                mins = np.concatenate([pending_min, mins])
+                maxs = np.concatenate([pending_max, maxs])
+            full = len(mins) // factor * factor
+            self._pending[level] = (mins[full:].copy(), maxs[full:].copy())
+            # NaN marks samples of a channel that did not exist yet; fmin/fmax skip them
+            mins = np.fmin.reduce(mins[:full].reshape(-1, factor), axis=1)
+            maxs = np.fmax.reduce(maxs[:full].reshape(-1, factor), axis=1)
+            if not len(mins):
+                break
+            self._push(level, mins, maxs)
+            factor = self.FACTOR
+
+    def _push(self, level, mins, maxs):
+        """Append completed buckets to a level's mirrored ring."""
+        slots = self._slots[level]
+        skipped = max(0, len(mins) - slots)
+        index = (self._counts[level] + skipped + np.arange(len(mins) - skipped)) % slots
+        self._mins[level][index] = self._mins[level][index + slots] = mins[skipped:]
+        self._maxs[level][index] = self._maxs[level][index + slots] = maxs[skipped:]
+        self._counts[level] += len(mins)
+
+    def level_for(self, n, pixels):
+        """Coarsest level with at least one bucket per pixel for a window of n samples, or None."""
+        level = None
+        for i, size in enumerate(self.bucket_sizes):
+            if size * pixels <= n:
+                level = i
+        return level
+
+    def minmax(self, n, pixels):
+        """Per-pixel (mins, maxs) of the newest n samples, or None if n is too short to decimate.
+
+        None is returned when there are fewer than BASE samples per pixel;
+        callers then reduce or draw the raw samples.
+        """
+        n = min(n, self.total)
+        level = self.level_for(n, pixels)
+        if level is None:
+            return None
+        size = self.bucket_sizes[level]
+        # Samples newer than the last completed bucket are still pending on levels 0..level
+        tail = self.total - self._counts[level] * size
+        buckets = min(-(-(n - tail) // size), self._counts[level], self._slots[level])
+        end = self._counts[level] % self._slots[level] + self._slots[level]
+        mins = self._mins[level][end - buckets:end]
+        maxs = self._maxs[level][end - buckets:end]
+        if tail:
+            pending = self._pending[:level + 1]
+            tail_min = np.fmin.reduce(np.concatenate([p[0] for p in pending]))
+            tail_max = np.fmax.reduce(np.concatenate([p[1] for p in pending]))
+            mins = np.append(mins, tail_min)
+            maxs = np.append(maxs, tail_max)
+        return pixel_minmax(mins, maxs, pixels)
+
+
+def pixel_minmax(mins, maxs, pixels):
+    """Reduce consecutive (mins, maxs) buckets to at most `pixels` evenly sized groups."""
+    pixels = min(pixels, len(mins))
+    edges = np.arange(pixels) * len(mins) // pixels
+    return np.fmin.reduceat(mins, edges), np.fmax.reduceat(maxs, edges)
@@ -0,0 +1,172 @@
+"""
+IBT Telemetry Reader
+
+Memory-maps iRacing .ibt telemetry files and exposes each channel as a lazily
+created, zero-copy NumPy column.
+"""
+
+import mmap
+
+import irsdk
+import numpy as np
+
+from src.client.channels import VAR_TYPE_DTYPES
+from src.client.sources import PlaybackSource
+
+
+DISK_SUB_HEADER_OFFSET = 112
+VAR_HEADER_SIZE = 144
+
+
+class IbtReader:
+    """Read-only view of an .ibt file.
+
+    Headers are parsed once on open; channel columns are strided views over
+    the mapped file, created on first access and never copied.
+    """
+
+    def __init__(self, path):
+        """Open and memory-map the file at path."""
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mem = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = irsdk.Header(self._mem)
+        self.disk_header = irsdk.DiskSubHeader(self._mem, DISK_SUB_HEADER_OFFSET)
+        self.buf_len = self.header.buf_len
+        self.data_offset = self.header.var_buf[0].buf_offset
+        available = (len(self._mem) - self.data_offset) // self.buf_len
+        self.record_count = max(0, min(self.disk_header.session_record_count, available))
+        self.var_headers = {}
+        for i in range(self.header.num_vars):
+            var_header = irsdk.VarHeader(self._mem, self.header.var_header_offset + i * VAR_HEADER_SIZE)
+            self.var_headers[var_header.name] = var_header
+        self._columns = {}
+        self._sdk = None
+
+    def __enter__(self):
+        """Use the reader as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the reader."""
+        self.close()
+
+    def __len__(self):
+        """Return the number of recorded samples."""
+        return self.record_count
+
+    def __contains__(self, name):
+        """Return True if the file has a channel called name."""
+        return name in self.var_headers
+
+    def __getitem__(self, name):
+        """Get a channel column by name; see column()."""
+        return self.column(name)
+
+    @property
+    def var_names(self):
+        """Names of all channels in the file."""
+        return list(self.var_headers)
+
+    @property
+    def tick_rate(self):
+        """Sample rate of the file in Hz."""
+        return self.header.tick_rate
+
+    def column(self, name):
+        """Get a channel as a read-only (records,) or (records, count) array view."""
+        column = self._columns.get(name)
+        if column is None:
+            var_header = self.var_headers[name]
+            dtype = np.dtype(VAR_TYPE_DTYPES[var_header.type])
+            shape = (self.record_count,)
+            strides = (self.buf_len,)
+            if var_header.count > 1:
+                shape += (var_header.count,)
+                strides += (dtype.itemsize,)
+            column = np.ndarray(shape, dtype, buffer=self._mem,
+                                offset=self.data_offset + var_header.offset, strides=strides)
+            self._columns[name] = column
+        return column
+
+    def columns(self, names):
+        """Get several channels as a name -> array view dictionary."""
+        return {name: self.column(name) for name in names}
+
+    def record_offset(self, index):
+        """Byte offset of a record line in the mapped file."""
+        return self.data_offset + index * self.buf_len
+
+    @property
+    def memory(self):
+        """The underlying read-only memory map."""
+        return self._mem
+
+    def session_info(self, key):
+        """Get a parsed session info section such as 'WeekendInfo'.
+
+        Parsing is deferred to the first call and done by irsdk, which knows
+        how to cope with the quirks of iRacing's YAML.
+        """
+        if self._sdk is None:
+            self._sdk = irsdk.IRSDK()
+            self._sdk.startup(test_file=self.path)
+        return self._sdk[key]
+
+    def close(self):
+        """Release the memory map and file handle."""
+        self._columns = {}
+        if self._sdk is not None:
+            self._sdk.shutdown()
+            self._sdk = None
+        if self._mem is not None:
+            try:
+                self._mem.close()
+            except BufferError:
+                pass  # column views still reference the map; it closes once they are gone
+            self._mem = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class IbtSource(PlaybackSource):
+    """Plays an .ibt file through IRacingClient like a live session."""
+
+    def __init__(self, path, speed=1.0, loop=False):
+        """Open the .ibt file at path."""
+        super().__init__(speed, loop)
+        self.reader = IbtReader(path)
+        self.tick_rate = self.reader.tick_rate or self.tick_rate
+        self.frame_count = len(self.reader)
+        if 'SessionTime' in self.reader:
+            self.timestamps = np.asarray(self.reader['SessionTime'], dtype=np.float64)
+        else:
+            self.timestamps = np.arange(self.frame_count) / self.tick_rate
+        if 'SessionTick' in self.reader:
+            self.ticks = self.reader['SessionTick']
+        else:
+            self.ticks = np.arange(self.frame_count)
+
+    def read_channels(self, registry):
+        """Decode the requested channels straight from the current record line."""
+        if self.position < 0:
+            return {}
+        reader = self.reader
+        return registry.decode(reader.var_headers, reader.memory,
+                               reader.record_offset(self.position), reader.buf_len)
+
+    def read_var(self, name):
+        """Read one channel at the current record."""
+        if self.position < 0 or name not in self.reader:
+            return None
+        return self.reader[name][self.position].item()
+
+    @property
+    def session_info_update(self):
+        """An .ibt file carries a single session info document."""
+        return 1
+
+    def get_session_section(self, key):
+        """Get a session info section from the file."""
+        return self.reader.session_info(key)
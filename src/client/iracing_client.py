@@ -6,95 +6,317 @@ Handles connection to iRacing and provides real-time telemetry data.
 
 import threading
 import time
-import json
-import irsdk
+
+from src.client.channels import ChannelRegistry
+from src.client.derived import DerivedChannels, DERIVED_INPUTS
+from src.client.history import TelemetryHistory, NullHistory
+from src.client.lap_delta import LapDeltaEngine, LAP_DELTA_INPUTS
+from src.client.snapshot import TelemetrySnapshot, EMPTY_SNAPSHOT
+from src.client.sources import TelemetrySource, IRSDKSource
+from src.client.standings import StandingsEngine
+from src.utils.perf import monitor
+
+
+# Connection states reported through get_connection_state() and sinks' on_connection_state();
+# PROBING lasts from the first probe after a disconnect until a probe succeeds
+DISCONNECTED = 'disconnected'
+PROBING = 'probing'
+CONNECTED = 'connected'
+STALE = 'stale'
 
 
 class IRacingClient:
     """Client for connecting to iRacing and retrieving telemetry data."""
     
-    def __init__(self):
-        """Initialize the iRacing client with background telemetry updates."""
-        self.ir = irsdk.IRSDK()
+    TICK_RATE = 60  # iRacing publishes telemetry at 60 Hz
+    POLL_INTERVAL = 0.05
+    PROBE_INTERVAL = 0.5  # first retry after a failed connection probe, doubled per failure
+    MAX_PROBE_INTERVAL = 5.0
+    STALE_TIMEOUT = 1.0  # seconds without a new tick before a connection is considered stale
+    STALE_POLL_INTERVAL = 0.1
+
+    def __init__(self, tick_sync=True, source=None, history_seconds=120.0, channels=None, reference_dir=None):
+        """Initialize the iRacing client with background telemetry updates.
+
+        With tick_sync enabled the loop waits for each new sim tick and reads
+        all channels from one frozen var buffer; otherwise it falls back to
+        sampling every POLL_INTERVAL seconds. source is a TelemetrySource
+        (e.g. ReplaySource) or an irsdk.IRSDK-like object; by default the
+        live SDK is used. The last
+        history_seconds of every channel are kept in a TelemetryHistory
+        (none if history_seconds is 0).
+        channels is a base display key -> SDK variable mapping decoded for
+        every frame (none by default); consumers add the channels they use
+        through require_channels(). Best laps for the
+        live delta are kept in reference_dir. Field standings are computed once
+        a consumer requires standings.STANDINGS_INPUTS.
+        """
+        if not isinstance(source, TelemetrySource):
+            source = IRSDKSource(source)
+        self.source = source
         self.is_connected = False
-        self.lock = threading.Lock()
-        self.telemetry = {}
-        self.session_info = {}
+        self.state = DISCONNECTED
+        self.probe_interval = 0.0
+        self.last_tick_time = None
+        self.snapshot = EMPTY_SNAPSHOT
+        self.channels = ChannelRegistry(channels)
+        self.channels.require('derived', DERIVED_INPUTS)
+        self.derived = DerivedChannels()
+        self.channels.require('lap_delta', LAP_DELTA_INPUTS)
+        self.lap_delta = LapDeltaEngine(reference_dir)
+        self.standings = StandingsEngine()
+        self.sinks = []
+        if history_seconds:
+            self.history = TelemetryHistory(history_seconds, source.tick_rate)
+        else:
+            self.history = NullHistory(source.tick_rate)
+        self.session_cache = {}
+        self.session_info_update = None
+        self.tick_sync = tick_sync
+        self.last_tick = None
+        self.tick_stats = {'ticks': 0, 'dropped': 0, 'idle_polls': 0}
         self.running = True
+        self._wake = threading.Event()
         self.thread = threading.Thread(target=self._update_loop, daemon=True)
         self.thread.start()
 
     def connect(self):
         """Attempt to connect to iRacing."""
-        if not self.ir.is_initialized:
-            self.ir.startup()
-        self.is_connected = self.ir.is_initialized and self.ir.is_connected
+        self.is_connected = self.source.connect()
         return self.is_connected
 
     def _update_loop(self):
         """Background thread that continuously updates telemetry data."""
         while self.running:
-            if self.connect():
-                with self.lock:
-                    self.telemetry = self._get_telemetry()
-                    self.session_info = self._get_session_info()
-            time.sleep(0.05)
+            if self.state in (DISCONNECTED, PROBING):
+                if not self._probe():
+                    self._wake.wait(self.probe_interval)
+                continue
+            if not self.connect():
+                self._handle_disconnect()
+                continue
+            if not self.tick_sync:
+                self._publish(self._derive(self._get_telemetry()), self._get_session_info())
+                self._wake.wait(self.POLL_INTERVAL)
+                continue
+            tick = self._wait_for_tick()
+            if tick is None:
+                # No new frame yet; back off for a fraction of a tick, or longer once stale
+                if self.state == CONNECTED and time.perf_counter() - self.last_tick_time > self.STALE_TIMEOUT:
+                    self._set_state(STALE)
+                self._wake.wait(self.STALE_POLL_INTERVAL if self.state == STALE
+                                else 1.0 / (self.source.tick_rate * 4))
+                continue
+            self.last_tick_time = time.perf_counter()
+            if self.state == STALE:
+                self._set_state(CONNECTED)
+            telemetry = self._get_telemetry()
+            if telemetry:
+                telemetry['tick'] = tick
+            self._derive(telemetry)
+            session_info = self._get_session_info()
+            self.source.release_frame()
+            self._publish(telemetry, session_info, tick)
+
+    def _probe(self):
+        """Try to connect once; on failure double the delay before the next probe.
+
+        Failed probes stay in PROBING, so sinks see one state change per
+        disconnect rather than one per backoff cycle.
+        """
+        self._set_state(PROBING)
+        try:
+            connected = self.connect()
+        except Exception:
+            connected = False
+        if connected:
+            self.probe_interval = 0.0
+            self.last_tick_time = time.perf_counter()
+            self._set_state(CONNECTED)
+            return True
+        self.probe_interval = min(max(self.probe_interval * 2, self.PROBE_INTERVAL), self.MAX_PROBE_INTERVAL)
+        return False
+
+    def _handle_disconnect(self):
+        """Drop everything cached from the lost connection and publish an empty snapshot."""
+        self.source.invalidate()
+        self.channels.invalidate()
+        self.session_cache = {}
+        self.session_info_update = None
+        self.last_tick = None
+        self.last_tick_time = None
+        self.history.clear()
+        self.derived.reset()
+        self.lap_delta.reset()
+        self.standings.reset()
+        self._publish({}, {})
+        self._set_state(DISCONNECTED)
+
+    def _set_state(self, state):
+        """Enter a connection state and notify the sinks if it changed."""
+        if state == self.state:
+            return
+        self.state = state
+        for sink in self.sinks:
+            sink.on_connection_state(state)
+
+    def _publish(self, telemetry, session_info, tick=None):
+        """Publish a new immutable snapshot with a single reference swap."""
+        start = time.perf_counter()
+        snapshot = TelemetrySnapshot(self.snapshot.seq + 1, telemetry, session_info, tick)
+        if telemetry:
+            self.history.append(telemetry, snapshot.timestamp, tick)
+        self.snapshot = snapshot
+        for sink in self.sinks:
+            sink.on_snapshot(snapshot)
+        monitor.record_since('snapshot_publish', start)
+
+    def _wait_for_tick(self):
+        """Wait for the next sim tick and freeze its var buffer.
+
+        Returns the new tick number, or None if the sim has not advanced since
+        the last frame (the buffer is left unfrozen in that case).
+        """
+        # Does not block; the update loop polls at a fraction of a tick until the sim advances
+        try:
+            tick = self.source.wait_for_tick()
+        except Exception:
+            tick = None
+        if tick is None or tick == self.last_tick:
+            self.source.release_frame()
+            if tick is not None:
+                self.tick_stats['idle_polls'] += 1
+            return None
+        if self.last_tick is not None and tick > self.last_tick + 1:
+            self.tick_stats['dropped'] += tick - self.last_tick - 1
+        self.tick_stats['ticks'] += 1
+        self.last_tick = tick
+        return tick
 
     def _get_telemetry(self):
         """Extract telemetry data from iRacing."""
+        start = time.perf_counter()
         try:
-            return {
-                'speed': self.ir['Speed'],
-                'rpm': self.ir['RPM'],
-                'gear': self.ir['Gear'],
-                'lap_time': self.ir['LapCurrentLapTime'],
-                'fuel_level': self.ir['FuelLevel'],
-                'steering': self.ir['SteeringWheelAngle'],
-                'throttle': self.ir['Throttle'],
-                'brake': self.ir['Brake'],
-                'clutch': self.ir['Clutch'],
-                'tire_temp_LF': self.ir['LFtempCL'],
-                'tire_temp_RF': self.ir['RFtempCL'],
-                'tire_temp_LR': self.ir['LRtempCL'],
-                'tire_temp_RR': self.ir['RRtempCL'],
-            }
+            return self.source.read_channels(self.channels)
         except Exception:
             return {}
+        finally:
+            monitor.record_since('sdk_read', start)
+
+    def _derive(self, telemetry):
+        """Add the derived channels (fuel per lap, rates, peak g, lap delta, standings, ...) to a frame's telemetry."""
+        if not telemetry:
+            return telemetry
+        start = time.perf_counter()
+        tick = telemetry.get('tick')
+        now = tick / self.source.tick_rate if tick is not None else start
+        telemetry.update(self.derived.update(telemetry, now))
+        telemetry.update(self.lap_delta.update(telemetry))
+        telemetry.update(self.standings.update(telemetry))
+        monitor.record_since('derived', start)
+        return telemetry
 
     def _get_session_info(self):
-        """Extract session information from iRacing."""
+        """Extract session information from iRacing.
+
+        The session YAML is only re-read when the source's SessionInfoUpdate
+        counter changes; the per-tick fields are read as live channels.
+        """
         try:
-            # Use get_session_info_string to get JSON, then parse
-            info_str = self.ir.get_session_info_string()
-            if not info_str:
-                return {}
-            info = json.loads(info_str)
-            track = info.get('WeekendInfo', {}).get('TrackName', '')
-            session_num = self.ir['SessionNum'] if 'SessionNum' in self.ir.var_headers else 0
-            sessions = info.get('SessionInfo', {}).get('Sessions', [])
-            session_type = sessions[session_num]['SessionType'] if session_num < len(sessions) else ''
-            session_time = self.ir['SessionTime'] if 'SessionTime' in self.ir.var_headers else 0
-            session_laps = self.ir['SessionLapsRemain'] if 'SessionLapsRemain' in self.ir.var_headers else 0
+            update = self.source.session_info_update
+            if update != self.session_info_update:
+                self._refresh_session_cache(update)
+            sessions = self.session_cache.get('sessions', [])
+            session_num = self.source.read_var('SessionNum') or 0
+            session_type = sessions[session_num].get('SessionType', '') if session_num < len(sessions) else ''
             return {
-                'track': track,
+                'track': self.session_cache.get('track', ''),
                 'session_type': session_type,
-                'session_time': session_time,
-                'session_laps': session_laps
+                'session_time': self.source.read_var('SessionTime') or 0,
+                'session_laps': self.source.read_var('SessionLapsRemain') or 0
             }
         except Exception:
             return {}
 
+    def _refresh_session_cache(self, update):
+        """Rebuild the parsed session structures for a new update counter."""
+        weekend_info = self.source.get_session_section('WeekendInfo') or {}
+        driver_info = self.source.get_session_section('DriverInfo') or {}
+        drivers = driver_info.get('Drivers') or []
+        car_idx = driver_info.get('DriverCarIdx')
+        player = next((d for d in drivers if d.get('CarIdx') == car_idx), {})
+        self.session_cache = {
+            'weekend_info': weekend_info,
+            'sessions': (self.source.get_session_section('SessionInfo') or {}).get('Sessions') or [],
+            'driver_info': driver_info,
+            'track': weekend_info.get('TrackName', ''),
+            'car': player.get('CarPath', ''),
+        }
+        self.session_info_update = update
+        self.lap_delta.set_session(self.session_cache['track'], self.session_cache['car'])
+        self.standings.set_drivers(driver_info)
+        for sink in self.sinks:
+            sink.on_session_info(update, self.session_cache)
+
+    @property
+    def tick_rate(self):
+        """Telemetry tick rate of the current source in Hz."""
+        return self.source.tick_rate
+
+    def get_snapshot(self):
+        """Get the most recently published telemetry snapshot."""
+        return self.snapshot
+
+    def get_connection_state(self):
+        """Get the connection state: DISCONNECTED, PROBING, CONNECTED or STALE."""
+        return self.state
+
+    def has_changed_since(self, seq):
+        """Return True if a snapshot newer than sequence number seq is available."""
+        return self.snapshot.is_newer_than(seq)
+
     def get_telemetry(self):
-        """Get a copy of the current telemetry data."""
-        with self.lock:
-            return self.telemetry.copy()
+        """Get a read-only view of the current telemetry data."""
+        return self.snapshot.telemetry
 
     def get_session_info(self):
-        """Get a copy of the current session information."""
-        with self.lock:
-            return self.session_info.copy()
+        """Get a read-only view of the current session information."""
+        return self.snapshot.session_info
+
+    def require_channels(self, owner, channels):
+        """Declare the channels a consumer needs in addition to the base set."""
+        self.channels.require(owner, channels)
+
+    def release_channels(self, owner):
+        """Drop a consumer's channel request."""
+        self.channels.release(owner)
+
+    def add_sink(self, sink):
+        """Register a sink (e.g. TelemetryRecorder) fed from the acquisition thread.
+
+        Sinks implement on_snapshot(snapshot), on_session_info(update,
+        session_info) and on_connection_state(state) and must not block.
+        """
+        self.sinks = self.sinks + [sink]
+        sink.on_connection_state(self.state)
+        if self.session_info_update is not None:
+            sink.on_session_info(self.session_info_update, self.session_cache)
+
+    def remove_sink(self, sink):
+        """Unregister a sink."""
+        self.sinks = [s for s in self.sinks if s is not sink]
+
+    def get_history(self, channel, seconds):
+        """Get a zero-copy view of the last `seconds` seconds of a channel."""
+        return self.history.window(channel, seconds)
+
+    def get_tick_stats(self):
+        """Get counts of acquired and dropped sim ticks and of polls that found no new tick."""
+        return dict(self.tick_stats)
 
     def stop(self):
         """Stop the background telemetry updates."""
         self.running = False
-        self.thread.join() 
\ No newline at end of file
+        self._wake.set()
+        self.thread.join()
+        self.lap_delta.stop()
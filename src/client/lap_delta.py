@@ -0,0 +1,217 @@
+"""
+Lap Delta
+
+Live delta to the best lap. The best lap's elapsed time is resampled onto a
+fixed LapDistPct grid, so the reference time at any track position is one
+indexed linear interpolation. Reference laps are stored per track and car as
+.npy files, written on a background thread and memory-mapped on load.
+"""
+
+import os
+import queue
+import re
+import threading
+
+import numpy as np
+
+
+NAN = float('nan')
+
+# Grid points per lap; 2000 is ~3.5 m on a 7 km track
+GRID_SIZE = 2000
+GRID = np.linspace(0.0, 1.0, GRID_SIZE + 1)
+
+# Longest lap that can be captured, in samples (10 minutes at 60 Hz)
+MAX_LAP_SAMPLES = 36000
+
+DEFAULT_REFERENCE_DIR = os.path.join(os.path.expanduser('~'), '.iracing_overlay', 'reference_laps')
+
+# Raw channels the delta reads (display key -> SDK variable)
+LAP_DELTA_INPUTS = {
+    'lap_time': 'LapCurrentLapTime',
+    'lap': 'Lap',
+    'lap_dist_pct': 'LapDistPct',
+}
+
+
+def reference_path(directory, track, car):
+    """Path of the reference lap file for a track and car."""
+    name = re.sub(r'[^A-Za-z0-9_.-]+', '_', f'{track}__{car}')
+    return os.path.join(directory, f'{name}.npy')
+
+
+def resample_lap(dist, times):
+    """Resample a lap's (LapDistPct, elapsed time) samples onto GRID.
+
+    Samples taken just after the line that still report the previous lap's
+    distance (~0.99) are unwrapped, and the distance is forced monotonic so
+    the interpolation is well defined.
+    """
+    lap_time = times[-1]
+    dist = np.where((dist > 0.5) & (times < 0.25 * lap_time), dist - 1.0, dist)
+    dist = np.maximum.accumulate(dist)
+    dist, first = np.unique(dist, return_index=True)
+    reference = np.interp(GRID, dist, times[first])
+    reference[0] = 0.0
+    reference[-1] = lap_time
+    return reference
+
+
+def save_reference(path, reference):
+    """Write a reference lap, replacing the old file atomically; False if it could not be written."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            np.save(f, reference)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        return False
+    return True
+
+
+def load_reference(path):
+    """Memory-map a saved reference lap, or None if it is missing or not on GRID."""
+    try:
+        reference = np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    return reference if reference.shape == GRID.shape else None
+
+
+class LapDeltaEngine:
+    """Captures the best lap and computes the live delta against it.
+
+    update() runs once per frame on the acquisition thread and returns
+    'lap_delta' (seconds, positive when slower than the reference) and
+    'best_lap_time'; both are NaN until a reference exists. A new best lap is
+    saved by a writer thread and becomes the reference once it is on disk.
+    """
+
+    MIN_START_DIST = 0.05  # a captured lap must start before this distance...
+    MIN_END_DIST = 0.95  # ...and reach this one
+
+    def __init__(self, reference_dir=None):
+        """Store reference laps under reference_dir (the user's home directory by default)."""
+        self.reference_dir = DEFAULT_REFERENCE_DIR if reference_dir is None else reference_dir
+        self.track = None
+        self.car = None
+        self.reference = None
+        self.best_lap_time = NAN
+        self._best_captured = NAN
+        self._session = 0
+        self._lock = threading.Lock()
+        self._saves = queue.Queue()
+        self._thread = None
+        self._dist = np.empty(MAX_LAP_SAMPLES)
+        self._times = np.empty(MAX_LAP_SAMPLES)
+        self._count = 0
+        self._lap = None
+        self._valid = False
+
+    def set_session(self, track, car):
+        """Switch to the reference lap of a track and car, memory-mapping it if saved."""
+        if (track, car) == (self.track, self.car):
+            return
+        with self._lock:
+            # Saves still queued for the previous session no longer swap in
+            self._session += 1
+            self.track, self.car = track, car
+            self.reference = None
+            self.best_lap_time = NAN
+        self._best_captured = NAN
+        self._valid = False
+        if not track or not car:
+            return
+        reference = load_reference(reference_path(self.reference_dir, track, car))
+        if reference is not None:
+            with self._lock:
+                self.reference = reference
+                self.best_lap_time = float(reference[-1])
+            self._best_captured = self.best_lap_time
+
+    def update(self, telemetry):
+        """Capture the frame into the current lap and return the live delta."""
+        lap = telemetry.get('lap')
+        dist = telemetry.get('lap_dist_pct')
+        elapsed = telemetry.get('lap_time')
+        if lap is None or dist is None or elapsed is None:
+            return {'lap_delta': NAN, 'best_lap_time': self.best_lap_time}
+        if lap != self._lap:
+            if self._lap is not None and lap == self._lap + 1:
+                self._complete_lap()
+            # Only laps entered at the line can become a reference
+            self._valid = self._lap is not None and lap == self._lap + 1
+            self._lap = lap
+            self._count = 0
+        if self._count < MAX_LAP_SAMPLES:
+            self._dist[self._count] = dist
+            self._times[self._count] = elapsed
+            self._count += 1
+        else:
+            self._valid = False
+        return {'lap_delta': self.delta(dist, elapsed), 'best_lap_time': self.best_lap_time}
+
+    def delta(self, dist, elapsed):
+        """Seconds gained (negative) or lost (positive) against the reference at dist."""
+        reference = self.reference
+        if reference is None or not 0.0 <= dist <= 1.0:
+            return NAN
+        position = dist * GRID_SIZE
+        i = min(int(position), GRID_SIZE - 1)
+        reference_time = reference[i] + (reference[i + 1] - reference[i]) * (position - i)
+        return float(elapsed - reference_time)
+
+    def _complete_lap(self):
+        """Make the lap that just ended the reference if it is a valid new best."""
+        n = self._count
+        if not self._valid or n < 2:
+            return
+        dist, times = self._dist[:n], self._times[:n]
+        lap_time = times[-1]
+        if self.MIN_START_DIST < dist[0] < 0.5 or dist[-1] < self.MIN_END_DIST:
+            return
+        # Compared against the last captured best, which may still be waiting to be saved
+        if not lap_time > 0 or lap_time >= self._best_captured:
+            return
+        self._best_captured = float(lap_time)
+        reference = resample_lap(dist, times)
+        if not self.track or not self.car:
+            self._swap(self._session, reference)
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._save_loop, daemon=True)
+            self._thread.start()
+        path = reference_path(self.reference_dir, self.track, self.car)
+        self._saves.put((self._session, path, reference))
+
+    def _swap(self, session, reference):
+        """Make reference the current one unless the session changed since it was captured."""
+        with self._lock:
+            if session == self._session:
+                self.reference = reference
+                self.best_lap_time = float(reference[-1])
+
+    def _save_loop(self):
+        """Writer thread: save queued references and swap each in once written."""
+        while True:
+            item = self._saves.get()
+            if item is None:
+                break
+            session, path, reference = item
+            # Serve a saved lap from the mapped file like a loaded one
+            saved = load_reference(path) if save_reference(path, reference) else None
+            self._swap(session, reference if saved is None else saved)
+
+    def stop(self):
+        """Finish writing queued references and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._saves.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def reset(self):
+        """Forget the lap in progress, e.g. after a disconnect."""
+        self._count = 0
+        self._lap = None
+        self._valid = False
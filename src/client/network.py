@@ -0,0 +1,473 @@
+"""
+Network Telemetry
+
+Streams snapshots to other machines over UDP. TelemetryPublisher is an
+IRacingClient sink that sends a keyframe with every scalar channel once per
+KEYFRAME_INTERVAL ticks and, in between, delta packets carrying only the
+channels whose value differs from that keyframe. Each delta is
+self-contained given its keyframe, so a lost packet costs one frame and a
+lost keyframe at most one keyframe interval. NetworkClient is the receiving
+stand-in for IRacingClient that the overlays run against.
+
+Packet layout: a 29-byte HEADER, then a kind-specific payload.
+  KEYFRAME  u16 count, count x f32 values of the narrow channels in schema
+            order, then u16 count, count x f64 values of the wide channels
+  DELTA     u16 count, count x u8 channel index, count x f32 values, then
+            u16 count, count x u8 channel index, count x f64 values
+  SCHEMA    zlib JSON [[name, kind, is_wide], ...], kind 'float', 'int' or 'bool'
+  SESSION   zlib JSON {'info', 'update', 'cache'}
+  EMPTY, HEARTBEAT  no payload
+Integer channels other than flags are wide, since f32 holds integers exactly
+only up to 2**24, and so are the float channels in WIDE_CHANNELS.
+"""
+
+import json
+import math
+import socket
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from src.client.acquisition_process import SESSION_PREFIX
+from src.client.channels import DEFAULT_CHANNELS
+from src.client.history import TelemetryHistory
+from src.client.iracing_client import DISCONNECTED, CONNECTED, STALE
+from src.client.shared_ring import STATES
+from src.client.snapshot import TelemetrySnapshot, EMPTY_SNAPSHOT
+from src.utils.perf import monitor
+
+
+DEFAULT_PORT = 47820
+MAGIC = b'IRTN'
+VERSION = 2
+MAX_CHANNELS = 255
+MAX_DATAGRAM = 65507
+
+# magic, version, kind, connection state, schema generation, snapshot seq, keyframe id, timestamp, tick
+HEADER = struct.Struct('<4sBBBHIIdi')
+COUNT = struct.Struct('<H')
+
+# Float channels sent as f64 (names without SESSION_PREFIX): SessionTime reaches
+# 86400 s, where f32 resolves only ~8 ms
+WIDE_CHANNELS = frozenset(['SessionTime', 'session_time'])
+
+# Schema kind -> conversion restoring a decoded value's type
+KIND_TYPES = {'float': float, 'int': int, 'bool': bool}
+
+KEYFRAME, DELTA, SCHEMA, SESSION, EMPTY, HEARTBEAT = range(6)
+
+
+def is_wide(name, value):
+    """True for channels sent as f64: integers other than flags, and WIDE_CHANNELS."""
+    return (isinstance(value, int) and not isinstance(value, bool)) or name in WIDE_CHANNELS
+
+
+def split_values(payload, offset, indexed):
+    """Read an f32 section then an f64 section of a packet.
+
+    Returns (indices, f32 values, indices, f64 values); indices are None
+    unless the sections carry channel indices (deltas).
+    """
+    sections = []
+    for dtype in (np.float32, np.float64):
+        count, = COUNT.unpack_from(payload, offset)
+        offset += COUNT.size
+        indices = None
+        if indexed:
+            indices = np.frombuffer(payload, np.uint8, count, offset)
+            offset += count
+        values = np.frombuffer(payload, dtype, count, offset)
+        offset += values.nbytes
+        sections += [indices, values]
+    return sections
+
+
+def parse_address(text, default_host='127.0.0.1'):
+    """Parse 'host:port', 'host' or ':port' into a (host, port) tuple."""
+    host, _, port = text.rpartition(':') if ':' in text else (text, '', '')
+    return host or default_host, int(port) if port else DEFAULT_PORT
+
+
+class TelemetryPublisher:
+    """IRacingClient sink that streams snapshots as UDP datagrams.
+
+    address may be a unicast, broadcast ('<broadcast>' or x.x.x.255) or
+    loopback address. Sends are non-blocking; datagrams the socket cannot
+    take are counted as dropped.
+    """
+
+    KEYFRAME_INTERVAL = 60  # ticks between keyframes
+    SESSION_INTERVAL = 5.0  # seconds between session document repeats
+
+    def __init__(self, address=('127.0.0.1', DEFAULT_PORT)):
+        """Open a UDP socket sending to address."""
+        self.address = address
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if address[0] == '<broadcast>' or address[0].endswith('.255'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        self.socket.setblocking(False)
+        self.names = []
+        self.kinds = []
+        self.wide = np.zeros(0, bool)
+        self.index = {}
+        self.schema_gen = 0
+        self.keyframe = 0
+        self.key_values = np.zeros(0)
+        self.frames_since_keyframe = 0
+        self.state = DISCONNECTED
+        self.session_info = None
+        self.session_cache = None
+        self.session_update = None
+        self.session_sent = 0.0
+        self.stats = {'packets': 0, 'bytes': 0, 'keyframes': 0, 'deltas': 0, 'dropped': 0}
+
+    # Sink interface (acquisition thread)
+
+    def on_snapshot(self, snapshot):
+        """Encode and send one snapshot."""
+        start = time.perf_counter()
+        if not snapshot.telemetry:
+            self.key_values = np.zeros(0)
+            self._send(EMPTY, snapshot)
+            return
+        values = {key: value for key, value in snapshot.telemetry.items() if isinstance(value, (int, float))}
+        static = {}
+        for key, value in snapshot.session_info.items():
+            if isinstance(value, (int, float)):
+                values[SESSION_PREFIX + key] = value
+            else:
+                static[key] = value
+        if static != self.session_info or start - self.session_sent > self.SESSION_INTERVAL:
+            self.session_info = static
+            self._send_session(snapshot)
+
+        schema_changed = False
+        wide = list(self.wide)
+        for key, value in values.items():
+            if key not in self.index and len(self.names) < MAX_CHANNELS:
+                self.index[key] = len(self.names)
+                self.names.append(key)
+                self.kinds.append(type(value).__name__ if isinstance(value, (bool, int)) else 'float')
+                name = key[len(SESSION_PREFIX):] if key.startswith(SESSION_PREFIX) else key
+                wide.append(is_wide(name, value))
+                schema_changed = True
+        if schema_changed:
+            self.schema_gen = (self.schema_gen + 1) & 0xFFFF
+            self.wide = np.array(wide, bool)
+        current = np.array([values.get(name, math.nan) for name in self.names])
+        # Round narrow channels to what the subscriber will see, so unchanged values compare equal
+        narrow = ~self.wide
+        current[narrow] = current[narrow].astype(np.float32)
+
+        if schema_changed or self.frames_since_keyframe >= self.KEYFRAME_INTERVAL or not len(self.key_values):
+            # The schema rides along with every keyframe so late subscribers can decode
+            schema = list(zip(self.names, self.kinds, self.wide.tolist()))
+            self._send(SCHEMA, snapshot, zlib.compress(json.dumps(schema).encode()))
+            self.keyframe = (self.keyframe + 1) & 0xFFFFFFFF
+            self.key_values = current
+            self.frames_since_keyframe = 0
+            self.stats['keyframes'] += 1
+            self._send(KEYFRAME, snapshot, self._encode(current, narrow, None))
+        else:
+            key_values = self.key_values
+            same = (current == key_values) | (np.isnan(current) & np.isnan(key_values))
+            changed = ~same
+            self.frames_since_keyframe += 1
+            self.stats['deltas'] += 1
+            self._send(DELTA, snapshot, self._encode(current, narrow & changed, self.wide & changed))
+        monitor.record_since('network_publish', start)
+
+    def on_session_info(self, update, session_info):
+        """Send the new parsed session structures."""
+        self.session_update = update
+        self.session_cache = session_info
+        self._send_session(None)
+
+    def on_connection_state(self, state):
+        """Tell subscribers about a connection state change."""
+        self.state = state
+        self._send(HEARTBEAT, None)
+
+    # Lifecycle
+
+    def attach(self, ir_client):
+        """Register as a sink of ir_client, requesting the standard channels for remote overlays."""
+        ir_client.require_channels('publisher', DEFAULT_CHANNELS)
+        ir_client.add_sink(self)
+
+    def detach(self, ir_client):
+        """Unregister from ir_client and drop the channel request."""
+        ir_client.remove_sink(self)
+        ir_client.release_channels('publisher')
+
+    # Encoding
+
+    @staticmethod
+    def _encode(current, narrow, wide):
+        """Pack the f32 section of the narrow mask, then the f64 section of the wide mask.
+
+        wide=None packs a keyframe: every value, without channel indices.
+        """
+        if wide is None:
+            return (COUNT.pack(narrow.sum()) + current[narrow].astype(np.float32).tobytes()
+                    + COUNT.pack(len(current) - narrow.sum()) + current[~narrow].tobytes())
+        parts = []
+        for mask, dtype in ((narrow, np.float32), (wide, np.float64)):
+            indices = np.flatnonzero(mask)
+            parts += [COUNT.pack(len(indices)), indices.astype(np.uint8).tobytes(),
+                      current[indices].astype(dtype).tobytes()]
+        return b''.join(parts)
+
+    def _send_session(self, snapshot):
+        """Send the session document, without the session cache if it does not fit a datagram."""
+        document = {'info': self.session_info, 'update': self.session_update, 'cache': self.session_cache}
+        payload = zlib.compress(json.dumps(document, default=str).encode())
+        if len(payload) > MAX_DATAGRAM - HEADER.size:
+            document['cache'] = None
+            payload = zlib.compress(json.dumps(document, default=str).encode())
+        self.session_sent = time.perf_counter()
+        self._send(SESSION, snapshot, payload)
+
+    def _send(self, kind, snapshot, payload=b''):
+        """Prefix a payload with the packet header and send it."""
+        if snapshot is None:
+            seq, timestamp, tick = 0, time.perf_counter(), -1
+        else:
+            seq, timestamp = snapshot.seq, snapshot.timestamp
+            tick = -1 if snapshot.tick is None else snapshot.tick
+        packet = HEADER.pack(MAGIC, VERSION, kind, STATES.index(self.state), self.schema_gen,
+                             seq & 0xFFFFFFFF, self.keyframe, timestamp, tick) + payload
+        try:
+            self.socket.sendto(packet, self.address)
+        except (BlockingIOError, OSError):
+            self.stats['dropped'] += 1
+            return
+        self.stats['packets'] += 1
+        self.stats['bytes'] += len(packet)
+
+    def get_stats(self):
+        """Get counts of packets, bytes, keyframes, deltas and dropped sends."""
+        return dict(self.stats)
+
+    def close(self):
+        """Close the socket."""
+        self.socket.close()
+
+
+class NetworkClient:
+    """IRacingClient API backed by a TelemetryPublisher's UDP stream.
+
+    A receiver thread decodes packets into TelemetrySnapshots, appends them
+    to a local TelemetryHistory and feeds the same sinks IRacingClient
+    supports. Channel requests cannot reach the publisher and are ignored.
+    Latency is measured from the publisher's perf_counter timestamps, so it
+    is only meaningful when both run on the same machine.
+    """
+
+    TICK_RATE = 60
+    RECEIVE_TIMEOUT = 0.25
+    STALE_TIMEOUT = 1.0
+
+    def __init__(self, address=('0.0.0.0', DEFAULT_PORT), history_seconds=120.0):
+        """Bind a UDP socket on address and start receiving."""
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(address)
+        self.socket.settimeout(self.RECEIVE_TIMEOUT)
+        self.tick_rate = self.TICK_RATE
+        self.history = TelemetryHistory(history_seconds, self.tick_rate)
+        self.snapshot = EMPTY_SNAPSHOT
+        self.state = DISCONNECTED
+        self.remote_state = DISCONNECTED
+        self.sinks = []
+        self.session_cache = {}
+        self.session_info_update = None
+        self._session_info = {}
+        self._schemas = {}
+        self._keyframe = None
+        self._key_values = None
+        self._last_packet = None
+        self.stats = {'ticks': 0, 'dropped': 0, 'duplicate': 0, 'packets': 0, 'bytes': 0}
+        self.running = True
+        self.thread = threading.Thread(target=self._receive_loop, daemon=True)
+        self.thread.start()
+
+    def _receive_loop(self):
+        """Background thread that receives and decodes packets."""
+        while self.running:
+            try:
+                packet = self.socket.recv(MAX_DATAGRAM)
+            except socket.timeout:
+                self._update_state()
+                continue
+            except OSError:
+                break
+            try:
+                self._handle(packet)
+            except (struct.error, ValueError, IndexError, zlib.error):
+                continue
+            self._update_state()
+
+    def _handle(self, packet):
+        """Decode one packet."""
+        magic, version, kind, state, schema_gen, seq, keyframe, timestamp, tick = HEADER.unpack_from(packet)
+        if magic != MAGIC or version != VERSION:
+            return
+        self.stats['packets'] += 1
+        self.stats['bytes'] += len(packet)
+        self._last_packet = time.perf_counter()
+        self.remote_state = STATES[state]
+        payload = memoryview(packet)[HEADER.size:]
+        if kind == SCHEMA:
+            if schema_gen not in self._schemas:
+                # Only the newest generation is live; dropping the rest keeps a
+                # wrapped generation number from matching a stale schema
+                schema = json.loads(zlib.decompress(payload))
+                wide = np.array([entry[2] for entry in schema], bool)
+                self._schemas = {schema_gen: (schema, np.flatnonzero(~wide), np.flatnonzero(wide))}
+        elif kind == SESSION:
+            self._handle_session(json.loads(zlib.decompress(payload)))
+        elif kind == EMPTY:
+            self._key_values = None
+            self.history.clear()
+            self._publish(TelemetrySnapshot(seq, timestamp=timestamp))
+        elif kind in (KEYFRAME, DELTA):
+            entry = self._schemas.get(schema_gen)
+            if entry is None:
+                return
+            schema, narrow, wide = entry
+            if kind == KEYFRAME:
+                _, narrow_values, _, wide_values = split_values(payload, 0, False)
+                if len(narrow_values) != len(narrow) or len(wide_values) != len(wide):
+                    return
+                values = np.empty(len(schema))
+                values[narrow] = narrow_values
+                values[wide] = wide_values
+                self._keyframe = (schema_gen, keyframe)
+                self._key_values = values
+            elif self._keyframe == (schema_gen, keyframe) and self._key_values is not None:
+                narrow_indices, narrow_values, wide_indices, wide_values = split_values(payload, 0, True)
+                values = self._key_values.copy()
+                values[narrow_indices] = narrow_values
+                values[wide_indices] = wide_values
+            else:
+                return
+            self._decode(schema, values, seq, timestamp, tick)
+
+    def _handle_session(self, document):
+        """Apply a session document."""
+        self._session_info = document.get('info') or {}
+        cache = document.get('cache')
+        if cache is not None and document.get('update') != self.session_info_update:
+            self.session_info_update = document['update']
+            self.session_cache = cache
+            for sink in self.sinks:
+                sink.on_session_info(self.session_info_update, cache)
+
+    def _decode(self, schema, values, seq, timestamp, tick):
+        """Build, record and publish a snapshot from decoded channel values."""
+        last_seq = self.snapshot.seq
+        if seq == last_seq:
+            self.stats['duplicate'] += 1
+            return
+        if last_seq and seq > last_seq + 1:
+            self.stats['dropped'] += seq - last_seq - 1
+        self.stats['ticks'] += 1
+        telemetry, session_info = {}, dict(self._session_info)
+        for (name, kind, _), value in zip(schema, values.tolist()):
+            if kind != 'float':
+                if value != value:
+                    continue
+                value = KIND_TYPES[kind](value)
+            if name.startswith(SESSION_PREFIX):
+                session_info[name[len(SESSION_PREFIX):]] = value
+            else:
+                telemetry[name] = value
+        tick = None if tick < 0 else tick
+        now = time.perf_counter()
+        monitor.record('latency.network', now - timestamp)
+        # Local timestamps keep the UI's latency measurements on this machine's clock
+        snapshot = TelemetrySnapshot(seq, telemetry, session_info, tick, now)
+        self.history.append(telemetry, now, tick)
+        self._publish(snapshot)
+
+    def _publish(self, snapshot):
+        """Swap in a snapshot and feed the sinks."""
+        self.snapshot = snapshot
+        for sink in self.sinks:
+            sink.on_snapshot(snapshot)
+
+    def _update_state(self):
+        """Derive the connection state from the publisher's state and packet arrival."""
+        state = self.remote_state
+        if self._last_packet is None:
+            state = DISCONNECTED
+        elif state == CONNECTED and time.perf_counter() - self._last_packet > self.STALE_TIMEOUT:
+            state = STALE
+        if state != self.state:
+            self.state = state
+            for sink in self.sinks:
+                sink.on_connection_state(state)
+
+    @property
+    def is_connected(self):
+        """True while the publisher reports a connected source."""
+        return self.state in (CONNECTED, STALE)
+
+    def get_connection_state(self):
+        """Get the connection state of the remote feed."""
+        return self.state
+
+    def get_snapshot(self):
+        """Get the most recently received telemetry snapshot."""
+        return self.snapshot
+
+    def has_changed_since(self, seq):
+        """Return True if a snapshot newer than sequence number seq is available."""
+        return self.snapshot.is_newer_than(seq)
+
+    def get_telemetry(self):
+        """Get a read-only view of the current telemetry data."""
+        return self.snapshot.telemetry
+
+    def get_session_info(self):
+        """Get a read-only view of the current session information."""
+        return self.snapshot.session_info
+
+    def require_channels(self, owner, channels):
+        """Channel requests cannot be forwarded; the publisher decides what is sent."""
+
+    def release_channels(self, owner):
+        """See require_channels()."""
+
+    def add_sink(self, sink):
+        """Register a sink, fed from the receiver thread."""
+        self.sinks = self.sinks + [sink]
+        sink.on_connection_state(self.state)
+        if self.session_info_update is not None:
+            sink.on_session_info(self.session_info_update, self.session_cache)
+
+    def remove_sink(self, sink):
+        """Unregister a sink."""
+        self.sinks = [s for s in self.sinks if s is not sink]
+
+    def get_history(self, channel, seconds):
+        """Get a zero-copy view of the last `seconds` seconds of a channel."""
+        return self.history.window(channel, seconds)
+
+    def get_tick_stats(self):
+        """Get counts of received, lost and duplicate snapshots."""
+        return {key: self.stats[key] for key in ('ticks', 'dropped', 'duplicate')}
+
+    def get_network_stats(self):
+        """Get received packet and byte counts."""
+        return {key: self.stats[key] for key in ('packets', 'bytes')}
+
+    def stop(self):
+        """Stop receiving and close the socket."""
+        self.running = False
+        self.thread.join()
+        self.socket.close()
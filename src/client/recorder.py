@@ -0,0 +1,283 @@
+"""
+Telemetry Recorder
+
+Streams published snapshots to disk in a chunked, columnar binary format from
+a dedicated writer thread.
+
+File layout: MAGIC followed by blocks of `<tag:1s><length:u4><payload>`:
+    H  schema   JSON {'columns': [[name, dtype, shape], ...]}
+    S  session  JSON {'update': n, 'info': {...}} (parsed session info)
+    C  chunk    u4 row count, then each column's rows back to back
+A new schema block is written whenever the recorded channel set or a
+channel's type changes.
+"""
+
+import json
+import mmap
+import queue
+import struct
+import threading
+
+import numpy as np
+
+from src.client.channels import DEFAULT_CHANNELS
+
+MAGIC = b'IRTREC\x00\x01'
+BLOCK_HEADER = struct.Struct('<cI')
+ROW_COUNT = struct.Struct('<I')
+
+# Bookkeeping columns present in every chunk
+BASE_COLUMNS = [('seq', '<i8', ()), ('tick', '<i8', ()), ('timestamp', '<f8', ())]
+BASE_NAMES = frozenset(name for name, _, _ in BASE_COLUMNS)
+
+# SDK variables IRacingClient reads for session info each tick; recorded under their
+# own names so ReplaySource.read_var() can serve them on playback
+SESSION_VARS = ['SessionNum', 'SessionTime', 'SessionLapsRemain']
+
+
+def column_spec(name, value):
+    """Return the (name, dtype, shape) column description for a channel value."""
+    if isinstance(value, np.ndarray):
+        return (name, value.dtype.str, value.shape)
+    if isinstance(value, bool):
+        return (name, '|b1', ())
+    if isinstance(value, int):
+        # Wide enough for unsigned 32-bit SDK bitfields such as SessionFlags
+        return (name, '<i8', ())
+    return (name, '<f8', ())
+
+
+class TelemetryRecorder:
+    """Background recorder fed by IRacingClient through the sink interface.
+
+    Attach it with attach(), which requires DEFAULT_CHANNELS and
+    SESSION_VARS so replays reproduce the overlays and the session type, time
+    and laps remaining. If a write fails the
+    writer thread stops, the error is reported by get_stats() and further
+    snapshots are dropped.
+    """
+
+    def __init__(self, path, chunk_rows=600, queue_size=1200):
+        """Prepare a recording at path; call start() to open it."""
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.rows_written = 0
+        self.chunks_written = 0
+        self.error = None
+        self._pending_session = None
+        self._columns = None
+        self._chunk = None
+        self._rows = 0
+        self._file = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    # Sink interface (called on the acquisition thread; never blocks)
+
+    def on_snapshot(self, snapshot):
+        """Queue a snapshot for writing, counting it as dropped if the queue is full or the writer failed."""
+        if not snapshot.telemetry:
+            return
+        if self.error is not None:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(snapshot)
+        except queue.Full:
+            self.dropped += 1
+
+    def on_session_info(self, update, session_info):
+        """Hand the latest parsed session info to the writer."""
+        self._pending_session = (update, session_info)
+
+    def on_connection_state(self, state):
+        """Connection changes need no handling; disconnects publish an empty snapshot that is skipped."""
+
+    # Lifecycle
+
+    def attach(self, ir_client):
+        """Register as a sink of ir_client, requesting the standard channels and session variables."""
+        ir_client.require_channels('recorder', dict(DEFAULT_CHANNELS, **{name: name for name in SESSION_VARS}))
+        ir_client.add_sink(self)
+
+    def detach(self, ir_client):
+        """Unregister from ir_client and drop the channel request."""
+        ir_client.remove_sink(self)
+        ir_client.release_channels('recorder')
+
+    def start(self):
+        """Open the output file and start the writer thread."""
+        self._file = open(self.path, 'wb')
+        self._file.write(MAGIC)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Drain the queue, flush the last chunk and close the file."""
+        if self._thread is None:
+            return
+        # An event rather than a sentinel, so a full queue behind a failed writer cannot block
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        try:
+            self._file.close()
+        except OSError as e:
+            self.error = self.error or f'{type(e).__name__}: {e}'
+        self._file = None
+
+    def get_stats(self):
+        """Get queue depth, dropped samples, write counters and the write error, if any."""
+        return {
+            'queue_depth': self.queue.qsize(),
+            'dropped': self.dropped,
+            'rows_written': self.rows_written,
+            'chunks_written': self.chunks_written,
+            'error': self.error,
+        }
+
+    # Writer thread
+
+    def _write_loop(self):
+        """Writer thread: copy snapshots into the chunk buffer and flush full chunks.
+
+        Runs until stop() is requested and the queue is drained, or until a
+        write fails.
+        """
+        try:
+            while True:
+                try:
+                    snapshot = self.queue.get(timeout=0.1 if self._stopping.is_set() else 0.5)
+                except queue.Empty:
+                    self._write_pending_session()
+                    if self._stopping.is_set():
+                        break
+                    continue
+                self._write_pending_session()
+                self._append(snapshot)
+            self._flush_chunk()
+            self._file.flush()
+        except (OSError, ValueError, OverflowError, TypeError) as e:
+            self.error = f'{type(e).__name__}: {e}'
+
+    def _write_pending_session(self):
+        """Write a session block if new session info arrived."""
+        pending, self._pending_session = self._pending_session, None
+        if pending is None:
+            return
+        self._flush_chunk()
+        update, info = pending
+        self._write_block(b'S', json.dumps({'update': update, 'info': info}, default=str).encode('utf-8'))
+
+    def _append(self, snapshot):
+        """Copy one snapshot into the preallocated chunk, starting a new schema if needed."""
+        telemetry = snapshot.telemetry
+        names = [name for name in telemetry if name not in BASE_NAMES]
+        columns = BASE_COLUMNS + [column_spec(name, telemetry[name]) for name in names]
+        if columns != self._columns:
+            self._start_schema(columns)
+        row = self._chunk[self._rows]
+        row['seq'] = snapshot.seq
+        row['tick'] = -1 if snapshot.tick is None else snapshot.tick
+        row['timestamp'] = snapshot.timestamp
+        for name in names:
+            row[name] = telemetry[name]
+        self._rows += 1
+        if self._rows == self.chunk_rows:
+            self._flush_chunk()
+
+    def _start_schema(self, columns):
+        """Flush the current chunk and write a schema block for a new set of columns."""
+        self._flush_chunk()
+        self._columns = columns
+        dtype = np.dtype([(name, dtype, shape) for name, dtype, shape in self._columns])
+        self._chunk = np.zeros(self.chunk_rows, dtype=dtype)
+        schema = {'columns': [[name, dtype, list(shape)] for name, dtype, shape in self._columns]}
+        self._write_block(b'H', json.dumps(schema).encode('utf-8'))
+
+    def _flush_chunk(self):
+        """Write buffered rows as one columnar chunk."""
+        rows = self._rows
+        if not rows:
+            return
+        parts = [ROW_COUNT.pack(rows)]
+        for name, _, _ in self._columns:
+            parts.append(np.ascontiguousarray(self._chunk[name][:rows]).tobytes())
+        self._write_block(b'C', b''.join(parts))
+        self._rows = 0
+        self.rows_written += rows
+        self.chunks_written += 1
+
+    def _write_block(self, tag, payload):
+        """Write a tagged block to the file."""
+        self._file.write(BLOCK_HEADER.pack(tag, len(payload)))
+        self._file.write(payload)
+
+
+def read_recording(path):
+    """Yield ('schema', columns), ('session', dict) and ('chunk', {name: array}) blocks."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a telemetry recording")
+        columns = None
+        while True:
+            header = f.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                return
+            tag, length = BLOCK_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                return  # truncated final block
+            kind, value = _decode_block(tag, payload, columns)
+            if kind == 'schema':
+                columns = value
+            if kind is not None:
+                yield kind, value
+
+
+def map_recording(path):
+    """Like read_recording(), but chunk columns are zero-copy views of a read-only memory map.
+
+    The map stays open for as long as any yielded array references it.
+    """
+    with open(path, 'rb') as f:
+        mem = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mem[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a telemetry recording")
+    buffer = memoryview(mem)
+    offset = len(MAGIC)
+    columns = None
+    while offset + BLOCK_HEADER.size <= len(buffer):
+        tag, length = BLOCK_HEADER.unpack_from(buffer, offset)
+        offset += BLOCK_HEADER.size
+        if offset + length > len(buffer):
+            return  # truncated final block
+        kind, value = _decode_block(tag, buffer[offset:offset + length], columns)
+        offset += length
+        if kind == 'schema':
+            columns = value
+        if kind is not None:
+            yield kind, value
+
+
+def _decode_block(tag, payload, columns):
+    """Decode one block payload into a (kind, value) pair; unknown tags give (None, None)."""
+    if tag == b'H':
+        schema = json.loads(bytes(payload))['columns']
+        return 'schema', [(name, np.dtype(dtype), tuple(shape)) for name, dtype, shape in schema]
+    if tag == b'S':
+        return 'session', json.loads(bytes(payload))
+    if tag == b'C':
+        rows = ROW_COUNT.unpack_from(payload)[0]
+        offset = ROW_COUNT.size
+        chunk = {}
+        for name, dtype, shape in columns:
+            count = rows * int(np.prod(shape, dtype=np.int64))
+            chunk[name] = np.frombuffer(payload, dtype, count, offset).reshape((rows,) + shape)
+            offset += count * dtype.itemsize
+        return 'chunk', chunk
+    return None, None
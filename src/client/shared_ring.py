@@ -0,0 +1,305 @@
+"""
+Shared Telemetry Ring
+
+A TelemetryHistory whose buffers live in a multiprocessing.shared_memory
+segment, so an acquisition process can write samples that another process
+reads without locks or copies. Every ring slot carries a seqlock version:
+the writer makes it odd while the slot is being written and even again when
+it is complete, and readers retry if the version was odd or changed under
+them.
+"""
+
+import json
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.client.history import TelemetryHistory
+
+
+MAGIC = 0x4952545249474e31  # 'IRTRIGN1'
+MAX_CHANNELS = 128
+SCHEMA_BYTES = 64 * 1024
+SESSION_BYTES = 1024 * 1024
+READ_RETRIES = 8
+
+# Header fields (int64 slots at the start of the segment)
+H_MAGIC, H_CAPACITY, H_MAX_CHANNELS, H_RATE, H_COUNT, H_POS = range(6)
+H_SCHEMA_GEN, H_SCHEMA_LEN, H_SESSION_VERSION, H_SESSION_LEN = range(6, 10)
+H_SEQ, H_STATE, H_TICKS, H_DROPPED, H_IDLE_POLLS = range(10, 15)
+HEADER_FIELDS = 32
+
+# Connection state codes stored in H_STATE
+STATES = ['disconnected', 'probing', 'connected', 'stale']
+
+
+def segment_size(capacity, max_channels=MAX_CHANNELS):
+    """Bytes needed for a ring of `capacity` samples."""
+    slots = capacity * 2
+    return (HEADER_FIELDS * 8 + SCHEMA_BYTES + SESSION_BYTES + capacity * 8
+            + slots * 8 * 2 + max_channels * slots * 8)
+
+
+class SharedTelemetryHistory(TelemetryHistory):
+    """Mirrored telemetry ring in shared memory.
+
+    One process creates the segment (create=True) and one writer process
+    attaches to it and calls append(); readers attach and use the usual
+    TelemetryHistory read methods, whose views alias shared memory. Channels
+    are float64 columns; integer channels are flagged in the schema so
+    latest() can restore their type.
+
+    Only latest() is protected by the seqlock. Views from last(), window(),
+    timestamps() and ticks() are not: the writer keeps appending while they
+    are read, so their newest sample may be half written and, as with
+    TelemetryHistory, their oldest samples are overwritten once the writer
+    wraps. They suit drawing; copy the view and check that count advanced by
+    less than capacity minus the window length if exact samples are needed.
+    """
+
+    def __init__(self, name=None, create=False, duration=120.0, rate=60, max_channels=MAX_CHANNELS):
+        """Create a segment for `duration` seconds at `rate` Hz, or attach to segment `name`."""
+        if create:
+            capacity = max(2, int(duration * rate))
+            self.segment = shared_memory.SharedMemory(name=name, create=True,
+                                                      size=segment_size(capacity, max_channels))
+        else:
+            # Processes started by multiprocessing share the creator's resource
+            # tracker, so attaching does not take over ownership of the segment
+            self.segment = shared_memory.SharedMemory(name=name)
+        self.owner = create
+        buf = self.segment.buf
+        self._header = np.ndarray(HEADER_FIELDS, np.int64, buf)
+        if create:
+            self._header[:] = 0
+            self._header[H_MAGIC] = MAGIC
+            self._header[H_CAPACITY] = capacity
+            self._header[H_MAX_CHANNELS] = max_channels
+            self._header[H_RATE] = rate
+        elif self._header[H_MAGIC] != MAGIC:
+            raise ValueError(f'{name} is not a telemetry ring')
+        self.capacity = capacity = int(self._header[H_CAPACITY])
+        self.max_channels = max_channels = int(self._header[H_MAX_CHANNELS])
+        slots = capacity * 2
+
+        offset = HEADER_FIELDS * 8
+        self._schema = np.ndarray(SCHEMA_BYTES, np.uint8, buf, offset)
+        offset += SCHEMA_BYTES
+        self._session = np.ndarray(SESSION_BYTES, np.uint8, buf, offset)
+        offset += SESSION_BYTES
+        self._versions = np.ndarray(capacity, np.int64, buf, offset)
+        offset += capacity * 8
+        self._timestamps = np.ndarray(slots, np.float64, buf, offset)
+        offset += slots * 8
+        self._ticks = np.ndarray(slots, np.int64, buf, offset)
+        offset += slots * 8
+        self._block = np.ndarray((max_channels, slots), np.float64, buf, offset)
+        if create:
+            self._versions[:] = 0
+        # Written by channels past max_channels, which are never published
+        self._scratch = np.empty(slots)
+        self._overflow = set()
+
+        self._names = []
+        self._ints = []
+        self._index = {}
+        self._schema_gen = None
+        self._session_version = None
+        self._session_value = None
+
+    # Ring position and rate are kept in the shared header
+
+    @property
+    def name(self):
+        """Name other processes attach to."""
+        return self.segment.name
+
+    @property
+    def rate(self):
+        """Sample rate in Hz, shared through the header."""
+        return int(self._header[H_RATE])
+
+    @rate.setter
+    def rate(self, value):
+        self._header[H_RATE] = value
+
+    @property
+    def count(self):
+        """Samples appended since the last clear, shared through the header."""
+        return int(self._header[H_COUNT])
+
+    @count.setter
+    def count(self, value):
+        self._header[H_COUNT] = value
+
+    @property
+    def _pos(self):
+        """Slot the next sample is written to, shared through the header."""
+        return int(self._header[H_POS])
+
+    @_pos.setter
+    def _pos(self, value):
+        self._header[H_POS] = value
+
+    @property
+    def _columns(self):
+        """Channel name -> shared column, re-read whenever the writer adds a channel."""
+        self._refresh_schema()
+        return self._index
+
+    # Schema
+
+    def _refresh_schema(self):
+        """Reload the channel list if its generation changed."""
+        gen = int(self._header[H_SCHEMA_GEN])
+        if gen == self._schema_gen or gen & 1:
+            return
+        length = int(self._header[H_SCHEMA_LEN])
+        data = self._schema[:length].tobytes()
+        if int(self._header[H_SCHEMA_GEN]) != gen:
+            return
+        schema = json.loads(data) if length else []
+        self._names = [name for name, _ in schema]
+        self._ints = [is_int for _, is_int in schema]
+        self._index = {name: self._block[i] for i, name in enumerate(self._names)}
+        self._schema_gen = gen
+
+    def _register(self, name, value):
+        """Writer: allocate the next column for a new channel and publish the schema."""
+        self._refresh_schema()
+        if len(self._names) >= self.max_channels:
+            self._overflow.add(name)
+            return
+        column = self._block[len(self._names)]
+        column[:] = np.nan
+        self._names.append(name)
+        self._ints.append(isinstance(value, int))
+        self._index[name] = column
+        data = json.dumps(list(zip(self._names, self._ints))).encode()
+        self._header[H_SCHEMA_GEN] += 1
+        self._schema[:len(data)] = np.frombuffer(data, np.uint8)
+        self._header[H_SCHEMA_LEN] = len(data)
+        self._header[H_SCHEMA_GEN] += 1
+        self._schema_gen = int(self._header[H_SCHEMA_GEN])
+
+    # Writer
+
+    def append(self, values, timestamp, tick=None):
+        """Append one sample under the slot's seqlock; channels absent from values read as NaN."""
+        for name, value in values.items():
+            if name not in self._index and name not in self._overflow and isinstance(value, (int, float)):
+                self._register(name, value)
+        slot = self._pos
+        self._versions[slot] += 1
+        super().append(values, timestamp, tick)
+        self._versions[slot] += 1
+
+    def _add_channel(self, name):
+        """Channels past max_channels share one scratch column and are never published."""
+        return self._scratch
+
+    def write_session(self, value):
+        """Writer: publish a JSON-serializable session document under its seqlock.
+
+        Documents larger than SESSION_BYTES are not published.
+        """
+        data = json.dumps(value, default=str).encode()
+        if len(data) > SESSION_BYTES:
+            return
+        self._header[H_SESSION_VERSION] += 1
+        self._session[:len(data)] = np.frombuffer(data, np.uint8)
+        self._header[H_SESSION_LEN] = len(data)
+        self._header[H_SESSION_VERSION] += 1
+
+    def set_status(self, seq, state=None, tick_stats=None):
+        """Writer: publish the latest snapshot sequence, connection state and tick counters."""
+        if state is not None:
+            self._header[H_STATE] = STATES.index(state)
+        if tick_stats is not None:
+            self._header[H_TICKS] = tick_stats['ticks']
+            self._header[H_DROPPED] = tick_stats['dropped']
+            self._header[H_IDLE_POLLS] = tick_stats['idle_polls']
+        if seq is not None:
+            self._header[H_SEQ] = seq
+
+    # Reader
+
+    @property
+    def seq(self):
+        """Sequence number of the writer's latest snapshot."""
+        return int(self._header[H_SEQ])
+
+    @property
+    def state(self):
+        """Writer's connection state."""
+        return STATES[int(self._header[H_STATE])]
+
+    @property
+    def tick_stats(self):
+        """Writer's acquired and dropped tick counts and idle polls."""
+        header = self._header
+        return {'ticks': int(header[H_TICKS]), 'dropped': int(header[H_DROPPED]),
+                'idle_polls': int(header[H_IDLE_POLLS])}
+
+    def latest(self):
+        """Return (values, timestamp, tick) of the newest sample, or None if empty.
+
+        Integer channels are restored to int; NaN integer channels are omitted.
+        """
+        for _ in range(READ_RETRIES):
+            if not self.count:
+                return None
+            slot = (self._pos - 1) % self.capacity
+            version = self._versions[slot]
+            if version & 1:
+                continue
+            self._refresh_schema()
+            names, ints = self._names, self._ints
+            row = self._block[:len(names), slot].tolist()
+            timestamp = float(self._timestamps[slot])
+            tick = int(self._ticks[slot])
+            if self._versions[slot] == version:
+                break
+        else:
+            return None
+        values = {}
+        for name, is_int, value in zip(names, ints, row):
+            if is_int:
+                if value != value:
+                    continue
+                value = int(value)
+            values[name] = value
+        return values, timestamp, None if tick < 0 else tick
+
+    def read_session(self):
+        """Return the latest session document, parsing it only when it changed."""
+        header = self._header
+        for _ in range(READ_RETRIES):
+            version = int(header[H_SESSION_VERSION])
+            if version == self._session_version:
+                return self._session_value
+            if version & 1:
+                continue
+            length = int(header[H_SESSION_LEN])
+            data = self._session[:length].tobytes()
+            if int(header[H_SESSION_VERSION]) == version:
+                self._session_value = json.loads(data) if length else None
+                self._session_version = version
+                break
+        return self._session_value
+
+    def close(self):
+        """Detach from the segment, unlinking it if this side created it.
+
+        Views handed out by the read methods keep the mapping alive; if any
+        are still referenced the mapping is left for the OS to reclaim.
+        """
+        self._header = self._schema = self._session = self._versions = None
+        self._timestamps = self._ticks = self._block = None
+        self._index = {}
+        try:
+            self.segment.close()
+        except BufferError:
+            pass
+        if self.owner:
+            self.segment.unlink()
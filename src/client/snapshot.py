@@ -0,0 +1,45 @@
+"""
+Telemetry Snapshot
+
+Immutable, sequence-numbered view of one acquired telemetry frame.
+"""
+
+import time
+from types import MappingProxyType
+
+
+EMPTY = MappingProxyType({})
+
+
+class TelemetrySnapshot:
+    """Read-only telemetry frame published by the client with a single reference swap."""
+
+    __slots__ = ('seq', 'timestamp', 'tick', 'telemetry', 'session_info')
+
+    def __init__(self, seq, telemetry=None, session_info=None, tick=None, timestamp=None):
+        """Freeze the given telemetry and session dictionaries into a snapshot."""
+        set_field = object.__setattr__
+        set_field(self, 'seq', seq)
+        set_field(self, 'timestamp', time.perf_counter() if timestamp is None else timestamp)
+        set_field(self, 'tick', tick)
+        set_field(self, 'telemetry', MappingProxyType(telemetry) if telemetry else EMPTY)
+        set_field(self, 'session_info', MappingProxyType(session_info) if session_info else EMPTY)
+
+    def __setattr__(self, name, value):
+        """Reject mutation; publish a new snapshot instead."""
+        raise AttributeError('TelemetrySnapshot is immutable')
+
+    def __delattr__(self, name):
+        """Reject attribute deletion."""
+        raise AttributeError('TelemetrySnapshot is immutable')
+
+    def __repr__(self):
+        """Return a short description of the snapshot."""
+        return f"<TelemetrySnapshot seq={self.seq} tick={self.tick} channels={len(self.telemetry)}>"
+
+    def is_newer_than(self, seq):
+        """Return True if this snapshot was published after sequence number seq."""
+        return seq is None or self.seq > seq
+
+
+EMPTY_SNAPSHOT = TelemetrySnapshot(0)
@@ -0,0 +1,303 @@
+"""
+Telemetry Sources
+
+Pluggable backends IRacingClient acquires telemetry through: the live iRacing
+SDK, or a replay of a recording made with TelemetryRecorder.
+"""
+
+import bisect
+import threading
+import time
+
+import irsdk
+import numpy as np
+
+from src.client.recorder import read_recording
+
+
+# Parsed session cache key -> SDK session info section
+SESSION_SECTIONS = {
+    'WeekendInfo': 'weekend_info',
+    'DriverInfo': 'driver_info',
+}
+
+
+class TelemetrySource:
+    """Interface between IRacingClient and whatever produces telemetry frames."""
+
+    tick_rate = 60
+
+    def connect(self):
+        """Try to (re)connect; return True while frames are available."""
+        raise NotImplementedError
+
+    def disconnect(self):
+        """Release any resources held by the source."""
+
+    def invalidate(self):
+        """Drop any state cached from the previous connection once it is lost."""
+
+    def wait_for_tick(self):
+        """Freeze the newest frame and return its tick (or None); may wait briefly but need not block."""
+        raise NotImplementedError
+
+    def release_frame(self):
+        """Unfreeze the frame captured by wait_for_tick()."""
+
+    def read_channels(self, registry):
+        """Decode the channels in a ChannelRegistry from the current frame."""
+        raise NotImplementedError
+
+    def read_var(self, name):
+        """Read a single live variable by SDK name, or None if unavailable."""
+        raise NotImplementedError
+
+    @property
+    def session_info_update(self):
+        """Counter that changes whenever the session info changes."""
+        raise NotImplementedError
+
+    def get_session_section(self, key):
+        """Get a parsed session info section such as 'WeekendInfo'."""
+        raise NotImplementedError
+
+
+class IRSDKSource(TelemetrySource):
+    """Live telemetry from the iRacing shared-memory SDK."""
+
+    def __init__(self, ir=None):
+        """Wrap an irsdk.IRSDK (or compatible) instance."""
+        self.ir = ir if ir is not None else irsdk.IRSDK()
+
+    def connect(self):
+        """Attempt to connect to iRacing."""
+        if not self.ir.is_initialized:
+            self.ir.startup()
+        return bool(self.ir.is_initialized and self.ir.is_connected)
+
+    def disconnect(self):
+        """Shut down the SDK connection."""
+        self.ir.shutdown()
+
+    def invalidate(self):
+        """Unmap shared memory so the next connect() re-reads the headers."""
+        self.ir.shutdown()
+
+    def wait_for_tick(self):
+        """Freeze the newest var buffer and return its SessionTick.
+
+        Does not block: pyirsdk exposes no wait on the data-valid event, so
+        the client polls until the tick advances.
+        """
+        self.ir.freeze_var_buffer_latest()
+        return self.ir['SessionTick']
+
+    def release_frame(self):
+        """Unfreeze the var buffer."""
+        self.ir.unfreeze_var_buffer_latest()
+
+    def read_channels(self, registry):
+        """Decode all requested channels from the raw var buffer in one pass."""
+        var_buffer = self._get_var_buffer()
+        if var_buffer is None:
+            return registry.read_each(self.ir)
+        return registry.decode(*var_buffer)
+
+    def _get_var_buffer(self):
+        """Locate the latest (or frozen) var buffer line in shared memory.
+
+        Returns (var_headers, memory, offset, buf_len), or None when the SDK
+        does not expose its raw buffers.
+        """
+        header = getattr(self.ir, '_header', None)
+        if header is None:
+            return None
+        var_buf = self.ir._var_buffer_latest
+        return self.ir._var_headers_dict, var_buf.get_memory(), var_buf.buf_offset, header.buf_len
+
+    def read_var(self, name):
+        """Read a live SDK variable."""
+        return self.ir[name]
+
+    @property
+    def session_info_update(self):
+        """The SDK's SessionInfoUpdate counter."""
+        return self.ir.session_info_update
+
+    def get_session_section(self, key):
+        """Get a session info section parsed by the SDK."""
+        return self.ir[key]
+
+
+class PlaybackSource(TelemetrySource):
+    """Base for sources that play back recorded frames against the wall clock.
+
+    Subclasses set frame_count and the per-frame timestamps (seconds) and
+    ticks arrays. speed is a multiple of real time (1.0, 10.0, 100.0, ...);
+    None or 0 plays every frame as fast as the client can consume it.
+    seek() may be called from any thread; the acquisition thread applies it
+    in its next wait_for_tick(), so the frame being read never moves.
+    """
+
+    def __init__(self, speed=1.0, loop=False):
+        """Initialize playback state."""
+        self.speed = speed
+        self.loop = loop
+        self.position = -1
+        self.finished = False
+        self.frame_count = 0
+        self.timestamps = np.zeros(0)
+        self.ticks = np.zeros(0, dtype=np.int64)
+        self._anchor = None
+        self._seek_lock = threading.Lock()
+        self._seek_to = None
+
+    @property
+    def duration(self):
+        """Length of the recording in seconds."""
+        return float(self.timestamps[-1] - self.timestamps[0]) if self.frame_count else 0.0
+
+    def connect(self):
+        """Available until playback reaches the end (forever when looping) or a seek is pending."""
+        return self.frame_count > 0 and (not self.finished or self._seek_to is not None)
+
+    def disconnect(self):
+        """Rewind to the start of the recording."""
+        self.seek(0.0)
+
+    def seek(self, seconds):
+        """Request a jump to `seconds` from the start of the recording, applied at the next frame."""
+        with self._seek_lock:
+            self._seek_to = seconds
+
+    def _apply_seek(self):
+        """Acquisition thread: perform a jump requested by seek()."""
+        with self._seek_lock:
+            seconds, self._seek_to = self._seek_to, None
+        if seconds is not None:
+            self._jump(seconds)
+
+    def _jump(self, seconds):
+        """Move playback to `seconds` from the start of the recording."""
+        if not self.frame_count:
+            return
+        target = self.timestamps[0] + seconds
+        self.position = max(-1, int(np.searchsorted(self.timestamps, target, 'left')) - 1)
+        self.finished = False
+        self._anchor = None
+
+    def wait_for_tick(self):
+        """Advance to the frame due at the current playback time and return its tick."""
+        self._apply_seek()
+        if self.position >= self.frame_count - 1:
+            if not self.loop:
+                self.finished = True
+                return None
+            self._jump(0.0)
+        if not self.speed:
+            self.position += 1
+            return int(self.ticks[self.position])
+        now = time.perf_counter()
+        if self._anchor is None:
+            self._anchor = (now, self.timestamps[self.position + 1])
+        anchor_wall, anchor_time = self._anchor
+        due = anchor_wall + (self.timestamps[self.position + 1] - anchor_time) / self.speed
+        if due > now:
+            time.sleep(min(due - now, 0.032))
+            now = time.perf_counter()
+        target_time = anchor_time + (now - anchor_wall) * self.speed
+        target = int(np.searchsorted(self.timestamps, target_time, 'right')) - 1
+        if target <= self.position:
+            return None
+        self.position = min(target, self.frame_count - 1)
+        return int(self.ticks[self.position])
+
+
+class ReplaySource(PlaybackSource):
+    """Plays back a TelemetryRecorder file through the TelemetrySource interface."""
+
+    def __init__(self, path, speed=1.0, loop=False):
+        """Load the recording at path."""
+        super().__init__(speed, loop)
+        self.path = path
+        self._segments = []
+        self._sessions = []
+        self._load(path)
+
+    def _load(self, path):
+        """Read all blocks and concatenate chunks into per-segment columns."""
+        chunks, start, rows = [], 0, 0
+        for kind, block in read_recording(path):
+            if kind == 'schema':
+                self._add_segment(start, chunks)
+                chunks, start = [], rows
+            elif kind == 'session':
+                self._sessions.append((rows, block['update'], block['info']))
+            elif kind == 'chunk':
+                chunks.append(block)
+                rows += len(block['seq'])
+        self._add_segment(start, chunks)
+        self.frame_count = rows
+        if rows:
+            self.timestamps = np.concatenate([columns['timestamp'] for _, columns in self._segments])
+            ticks = np.concatenate([columns['tick'] for _, columns in self._segments])
+            self.ticks = np.where(ticks < 0, np.arange(rows), ticks)
+        self._segment_starts = [seg_start for seg_start, _ in self._segments]
+        self._session_rows = [row for row, _, _ in self._sessions]
+
+    def _add_segment(self, start, chunks):
+        """Store the chunks recorded under one schema as contiguous columns."""
+        if not chunks:
+            return
+        columns = {}
+        for name in chunks[0]:
+            column = np.concatenate([chunk[name] for chunk in chunks])
+            column.flags.writeable = False
+            columns[name] = column
+        self._segments.append((start, columns))
+
+    def _current_frame(self):
+        """Return the segment columns and row index for the current position."""
+        index = bisect.bisect_right(self._segment_starts, self.position) - 1
+        start, columns = self._segments[index]
+        return columns, self.position - start
+
+    def read_channels(self, registry):
+        """Return the recorded values of the requested channels at the current frame."""
+        if self.position < 0:
+            return {}
+        columns, row = self._current_frame()
+        values = {}
+        for key in registry.channels:
+            column = columns.get(key)
+            if column is not None:
+                values[key] = column[row] if column.ndim > 1 else column[row].item()
+        return values
+
+    def read_var(self, name):
+        """Read a recorded channel by name at the current frame."""
+        if self.position < 0:
+            return None
+        columns, row = self._current_frame()
+        column = columns.get(name)
+        return None if column is None else column[row].item()
+
+    def _current_session(self):
+        """Return (update, info) of the session block in effect at the current frame."""
+        index = bisect.bisect_right(self._session_rows, max(self.position, 0)) - 1
+        if index < 0:
+            return 0, {}
+        _, update, info = self._sessions[index]
+        return update, info
+
+    @property
+    def session_info_update(self):
+        """Update counter of the session block in effect at the current frame."""
+        return self._current_session()[0]
+
+    def get_session_section(self, key):
+        """Rebuild an SDK-style session section from the recorded session info."""
+        info = self._current_session()[1]
+        if key == 'SessionInfo':
+            return {'Sessions': info.get('sessions', [])}
+        return info.get(SESSION_SECTIONS.get(key, key))
@@ -0,0 +1,180 @@
+"""
+Standings
+
+Race order, gaps, class positions and the on-track relative for the whole
+field, computed from the SDK's CarIdx arrays with a fixed number of NumPy
+operations per tick. Driver names and classes come from a DriverTable built
+from DriverInfo, which is only rebuilt when the roster changes.
+
+The engine runs once a consumer requires STANDINGS_INPUTS; its outputs are
+per-CarIdx arrays added to the snapshot's telemetry.
+"""
+
+import numpy as np
+
+
+NAN = float('nan')
+
+# iRacing sizes every CarIdx array for 64 cars
+MAX_CARS = 64
+
+# Raw CarIdx arrays the engine needs (display key -> SDK variable)
+STANDINGS_INPUTS = {
+    'car_lap_dist_pct': 'CarIdxLapDistPct',
+    'car_lap': 'CarIdxLap',
+    'car_position': 'CarIdxPosition',
+    'car_on_pit_road': 'CarIdxOnPitRoad',
+    'car_est_time': 'CarIdxEstTime',
+}
+
+# Used for cars whose class reports no estimated lap time
+DEFAULT_EST_LAP_TIME = 120.0
+
+
+def roster_key(driver_info):
+    """Identify a roster by car, driver and class, ignoring fields that change every update."""
+    return (driver_info.get('DriverCarIdx'),) + tuple(
+        (d.get('CarIdx'), d.get('UserID'), d.get('CarClassID')) for d in driver_info.get('Drivers') or [])
+
+
+class DriverTable:
+    """Per-CarIdx driver and class attributes from DriverInfo.
+
+    Numeric attributes are arrays indexed by CarIdx so they can be joined
+    against the telemetry arrays with plain indexing; names and numbers are
+    lists indexed the same way.
+    """
+
+    def __init__(self, driver_info=None):
+        """Build the table from a parsed DriverInfo section."""
+        driver_info = driver_info or {}
+        self.key = roster_key(driver_info)
+        self.player = driver_info.get('DriverCarIdx')
+        self.names = [''] * MAX_CARS
+        self.numbers = [''] * MAX_CARS
+        self.class_names = [''] * MAX_CARS
+        self.class_id = np.zeros(MAX_CARS, dtype=np.int32)
+        self.est_lap_time = np.full(MAX_CARS, DEFAULT_EST_LAP_TIME)
+        self.racing = np.zeros(MAX_CARS, dtype=bool)
+        for driver in driver_info.get('Drivers') or []:
+            idx = driver.get('CarIdx')
+            if idx is None or not 0 <= idx < MAX_CARS:
+                continue
+            self.names[idx] = driver.get('UserName', '')
+            self.numbers[idx] = str(driver.get('CarNumber', ''))
+            self.class_names[idx] = driver.get('CarClassShortName', '')
+            self.class_id[idx] = driver.get('CarClassID') or 0
+            self.est_lap_time[idx] = driver.get('CarClassEstLapTime') or DEFAULT_EST_LAP_TIME
+            self.racing[idx] = not (driver.get('IsSpectator') or driver.get('CarIsPaceCar'))
+        if self.player is None or not 0 <= self.player < MAX_CARS:
+            self.player = None
+
+
+EMPTY_TABLE = DriverTable()
+
+
+def frozen(array):
+    """Mark an array read-only before it is published in a snapshot."""
+    array.flags.writeable = False
+    return array
+
+
+class StandingsEngine:
+    """Computes the field's standings once per frame on the acquisition thread.
+
+    update() returns, all indexed by CarIdx unless noted:
+      'standings_order'    CarIdx by race position, padded with -1
+      'relative_order'     CarIdx from furthest ahead to furthest behind the
+                           player on track, padded with -1
+      'car_gap'            seconds behind the leader
+      'car_interval'       seconds behind the car one position ahead (never
+                           negative)
+      'car_class_position' position within the car's class (0 if not running)
+      'car_relative'       seconds ahead (+) or behind (-) the player on track
+    Cars not in the world (LapDistPct < 0), spectators and the pace car get
+    NaN or 0. 'car_on_pit_road' is passed through for overlays to dim pitting cars.
+    """
+
+    def __init__(self):
+        """Start with an empty driver table."""
+        self.drivers = EMPTY_TABLE
+
+    def set_drivers(self, driver_info):
+        """Adopt a new DriverInfo section, rebuilding the table only if the roster changed."""
+        if roster_key(driver_info or {}) != self.drivers.key:
+            self.drivers = DriverTable(driver_info)
+
+    def reset(self):
+        """Forget the roster."""
+        self.drivers = EMPTY_TABLE
+
+    def update(self, telemetry):
+        """Compute the standings outputs for one frame, or {} without the CarIdx inputs."""
+        try:
+            dist = telemetry['car_lap_dist_pct']
+            lap = telemetry['car_lap']
+            position = telemetry['car_position']
+            est = telemetry['car_est_time']
+        except KeyError:
+            return {}
+        if not isinstance(dist, np.ndarray):
+            return {}
+        drivers = self.drivers
+        n = min(len(dist), MAX_CARS)
+        dist, lap, position, est = dist[:n], lap[:n], position[:n], est[:n]
+        lap_time = drivers.est_lap_time[:n]
+        running = (dist >= 0) & drivers.racing[:n]
+        cars = np.flatnonzero(running)
+
+        # Race order: official positions first, then cars without one by distance covered
+        progress = lap[cars] + dist[cars]
+        placed = position[cars] > 0
+        order = cars[np.lexsort((-progress, np.where(placed, position[cars], MAX_CARS + 1)))]
+
+        gap = np.full(n, NAN)
+        interval = np.full(n, NAN)
+        class_position = np.zeros(n, dtype=np.int16)
+        if len(order):
+            # Time behind the leader: laps down at the car's class pace plus the difference
+            # in estimated time from the line to each car's position; a car that passed the
+            # leader on track since positions were last scored counts as 0
+            leader = order[0]
+            gap[order] = np.maximum((lap[leader] - lap[order]) * lap_time[order] + est[leader] - est[order], 0.0)
+            # Gaps follow scored position, not est-time order, so a car can be "ahead" of the one
+            # in front of it between scoring updates; that counts as no interval
+            interval[order[1:]] = np.maximum(gap[order[1:]] - gap[order[:-1]], 0.0)
+            interval[leader] = 0.0
+
+            # Class position: rank within each class following race order
+            classes = drivers.class_id[order]
+            by_class = np.argsort(classes, kind='stable')
+            sorted_classes = classes[by_class]
+            starts = np.flatnonzero(np.r_[True, sorted_classes[1:] != sorted_classes[:-1]])
+            first = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+            class_position[order[by_class]] = np.arange(len(order)) - first + 1
+
+        # Relative: estimated time between each car and the player, wrapped to half a lap
+        relative = np.full(n, NAN)
+        relative_order = cars[:0]
+        player = drivers.player
+        if player is not None and player < n and dist[player] >= 0:
+            player_lap_time = lap_time[player]
+            ahead = est[cars] - est[player]
+            relative[cars] = (ahead + player_lap_time / 2) % player_lap_time - player_lap_time / 2
+            relative_order = cars[np.argsort(-relative[cars], kind='stable')]
+
+        return {
+            'standings_order': frozen(self._padded(order)),
+            'relative_order': frozen(self._padded(relative_order)),
+            'car_gap': frozen(gap),
+            'car_interval': frozen(interval),
+            'car_class_position': frozen(class_position),
+            'car_relative': frozen(relative),
+        }
+
+    @staticmethod
+    def _padded(cars):
+        """CarIdx list as a fixed-size int16 array padded with -1, so recordings keep one schema."""
+        padded = np.full(MAX_CARS, -1, dtype=np.int16)
+        padded[:len(cars)] = cars
+        return padded
@@ -4,16 +4,48 @@ Dashboard Component
 Main dashboard window that provides controls for opening overlays and displaying telemetry data.
 """
 
+import time
+
 from PyQt5 import QtWidgets, QtCore, QtGui
 
+from src.client.channels import DEFAULT_CHANNELS
+from src.utils.perf import monitor
+from src.utils.telemetry_utils import TelemetryDisplayModel
+
+
+# Dashboard label -> display model field
+LABEL_FIELDS = {
+    'Speed': 'speed',
+    'RPM': 'rpm',
+    'Gear': 'gear',
+    'Lap Time': 'lap_time',
+    'Fuel': 'fuel_level',
+    'LF Temp': 'tire_temp_LF',
+    'RF Temp': 'tire_temp_RF',
+    'LR Temp': 'tire_temp_LR',
+    'RR Temp': 'tire_temp_RR',
+    'Fuel/Lap': 'fuel_per_lap',
+    'Laps Left': 'fuel_laps_remaining',
+    'Avg Lap': 'lap_time_avg',
+    'Peak G': 'peak_g',
+}
+
+# Raw channels behind the labels; the rest are derived by the client
+LABEL_CHANNELS = {field: DEFAULT_CHANNELS[field] for field in LABEL_FIELDS.values() if field in DEFAULT_CHANNELS}
+
 
 class DashboardWindow(QtWidgets.QWidget):
     """Main dashboard window for controlling overlays and displaying telemetry."""
     
-    def __init__(self, ir_client, show_text_overlay_callback, show_graph_overlay_callback):
-        """Initialize the dashboard with the iRacing client and overlay callbacks."""
+    FRAME_RATE = 10
+    SESSION_RATE = 2
+
+    def __init__(self, ir_client, show_text_overlay_callback, show_graph_overlay_callback, scheduler=None):
+        """Initialize the dashboard with the iRacing client, overlay callbacks and optional FrameScheduler."""
         super().__init__()
         self.ir_client = ir_client
+        self.ir_client.require_channels('dashboard', LABEL_CHANNELS)
+        self.scheduler = scheduler
         self.setWindowTitle('iRacing Dashboard')
         self.setGeometry(200, 200, 400, 400)
         
@@ -22,12 +54,19 @@ class DashboardWindow(QtWidgets.QWidget):
         
         # Info labels
         self.labels = {}
-        for key in ['Track', 'Session', 'Speed', 'RPM', 'Gear', 'Lap Time', 'Fuel', 'LF Temp', 'RF Temp', 'LR Temp', 'RR Temp']:
+        for key in ['Status', 'Track', 'Session', 'Speed', 'RPM', 'Gear', 'Lap Time', 'Fuel',
+                    'LF Temp', 'RF Temp', 'LR Temp', 'RR Temp', 'Fuel/Lap', 'Laps Left', 'Avg Lap', 'Peak G']:
             lbl = QtWidgets.QLabel(f"{key}: ...")
             lbl.setFont(QtGui.QFont('Segoe UI', 14))
             layout.addWidget(lbl)
             self.labels[key] = lbl
         
+        # Labels are only re-set when their text changes at display precision
+        self.display_model = TelemetryDisplayModel(LABEL_FIELDS.values())
+        for key, field in LABEL_FIELDS.items():
+            self.display_model.subscribe(field, self._label_setter(key))
+        self._session_text = {}
+        
         # Pop out overlay buttons
         self.text_overlay_btn = QtWidgets.QPushButton('Pop Out Text Overlay')
         self.text_overlay_btn.clicked.connect(show_text_overlay_callback)
@@ -37,24 +76,95 @@ class DashboardWindow(QtWidgets.QWidget):
         self.graph_overlay_btn.clicked.connect(show_graph_overlay_callback)
         layout.addWidget(self.graph_overlay_btn)
         
-        # Timer for updates
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self.update_dashboard)
-        self.timer.start(100)
+        # Optional performance panel
+        self.perf_btn = QtWidgets.QPushButton('Show Performance')
+        self.perf_btn.setCheckable(True)
+        self.perf_btn.toggled.connect(self.toggle_perf_panel)
+        layout.addWidget(self.perf_btn)
+        
+        self.perf_label = QtWidgets.QLabel()
+        self.perf_label.setFont(QtGui.QFont('Consolas', 9))
+        self.perf_label.setVisible(False)
+        layout.addWidget(self.perf_label)
+        
+        self.perf_export_btn = QtWidgets.QPushButton('Export Performance Data')
+        self.perf_export_btn.clicked.connect(self.export_perf_data)
+        self.perf_export_btn.setVisible(False)
+        layout.addWidget(self.perf_export_btn)
+        
+        self.perf_timer = QtCore.QTimer(self)
+        self.perf_timer.timeout.connect(self.update_perf_panel)
+        
+        # Updates are driven by the shared scheduler, or a local timer when run standalone
+        self.timer = None
+        if scheduler is not None:
+            scheduler.register(self, self.update_dashboard, self.FRAME_RATE, 'dashboard')
+            scheduler.register(self, self.update_session_labels, self.SESSION_RATE, 'dashboard.session')
+        else:
+            self.timer = QtCore.QTimer(self)
+            self.timer.timeout.connect(self.update_dashboard)
+            self.timer.timeout.connect(self.update_session_labels)
+            self.timer.start(int(1000 / self.FRAME_RATE))
 
     def update_dashboard(self):
         """Update the dashboard with current telemetry data."""
-        telemetry = self.ir_client.get_telemetry()
+        start = time.perf_counter()
+        self.display_model.update(self.ir_client.get_telemetry())
+        monitor.record_since('dashboard.update', start)
+
+    def update_session_labels(self):
+        """Update the slowly changing track and session labels."""
         session = self.ir_client.get_session_info()
-        
-        self.labels['Track'].setText(f"Track: {session.get('track', '...')}")
-        self.labels['Session'].setText(f"Session: {session.get('session_type', '...')}")
-        self.labels['Speed'].setText(f"Speed: {telemetry.get('speed', 0):.1f} mph")
-        self.labels['RPM'].setText(f"RPM: {telemetry.get('rpm', 0):.0f}")
-        self.labels['Gear'].setText(f"Gear: {telemetry.get('gear', 0)}")
-        self.labels['Lap Time'].setText(f"Lap Time: {telemetry.get('lap_time', 0):.2f}")
-        self.labels['Fuel'].setText(f"Fuel: {telemetry.get('fuel_level', 0):.1f}")
-        self.labels['LF Temp'].setText(f"LF Temp: {telemetry.get('tire_temp_LF', 0):.1f}")
-        self.labels['RF Temp'].setText(f"RF Temp: {telemetry.get('tire_temp_RF', 0):.1f}")
-        self.labels['LR Temp'].setText(f"LR Temp: {telemetry.get('tire_temp_LR', 0):.1f}")
-        self.labels['RR Temp'].setText(f"RR Temp: {telemetry.get('tire_temp_RR', 0):.1f}") 
\ No newline at end of file
+        self._set_label('Track', f"Track: {session.get('track', '...')}")
+        self._set_label('Session', f"Session: {session.get('session_type', '...')}")
+
+    def closeEvent(self, event):
+        """Release the dashboard's channels when it is closed."""
+        self.ir_client.release_channels('dashboard')
+        super().closeEvent(event)
+
+    def set_connection_state(self, state):
+        """Show the client's connection state."""
+        self._set_label('Status', f"Status: {state}")
+
+    def _label_setter(self, key):
+        """Build a display model callback that sets one label's text."""
+        label = self.labels[key]
+        prefix = f"{key}: "
+        return lambda text: label.setText(prefix + text)
+
+    def _set_label(self, key, text):
+        """Set a label's text unless it is already showing it."""
+        if self._session_text.get(key) != text:
+            self._session_text[key] = text
+            self.labels[key].setText(text)
+
+    def toggle_perf_panel(self, visible):
+        """Show or hide the performance panel."""
+        self.perf_label.setVisible(visible)
+        self.perf_export_btn.setVisible(visible)
+        self.perf_btn.setText('Hide Performance' if visible else 'Show Performance')
+        if visible:
+            self.update_perf_panel()
+            self.perf_timer.start(500)
+        else:
+            self.perf_timer.stop()
+        self.adjustSize()
+
+    def update_perf_panel(self):
+        """Refresh the per-stage timing table, tick counts and per-target frame counts."""
+        stats = self.ir_client.get_tick_stats()
+        # Clients report different counters (idle polls locally, duplicate packets over the network)
+        lines = [monitor.format_table(), '  '.join(f"{key.replace('_', ' ')} {value}" for key, value in stats.items())]
+        if self.scheduler is not None:
+            frames = self.scheduler.get_stats()
+            lines.append(f"scheduler wakeups {frames['wakeups']}")
+            for name, target in frames['targets'].items():
+                lines.append(f"  {name:20} frames {target['frames']:7d}  missed {target['missed']:6d}")
+        self.perf_label.setText('\n'.join(lines))
+
+    def export_perf_data(self):
+        """Save the performance histograms to a JSON file."""
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Export Performance Data', 'perf.json', 'JSON (*.json)')
+        if path:
+            monitor.export(path)
@@ -0,0 +1,196 @@
+"""
+Frame Scheduler
+
+Single timer that drives every overlay and the dashboard, aligned to the
+arrival of new telemetry instead of free-running per-widget timers.
+"""
+
+import time
+import weakref
+
+from PyQt5 import QtCore
+
+from src.client.iracing_client import CONNECTED
+from src.utils.perf import monitor
+
+
+class FrameTarget:
+    """Registration of one widget callback with the scheduler."""
+
+    def __init__(self, name, widget, callback, rate):
+        """Track a widget (weakly) and the callback to run at `rate` Hz."""
+        self.name = name
+        self.widget = weakref.ref(widget)
+        self.callback = weakref.WeakMethod(callback)
+        self.period = 1.0 / rate
+        self.last_frame = None
+        self.pending = False  # a snapshot arrived that this target has not shown yet
+        self.frames = 0
+        self.missed = 0
+
+    def is_active(self, widget):
+        """Only visible, non-minimized widgets are driven."""
+        return widget.isVisible() and not widget.isMinimized()
+
+
+class FrameScheduler(QtCore.QObject):
+    """Runs registered frame callbacks when new telemetry arrives, at each target's rate.
+
+    With a SnapshotNotifier, frames run as soon as each snapshot is pushed
+    to the UI thread; a target that was not yet due for the newest snapshot
+    is owed a trailing frame, which the single-shot timer runs once its
+    period has elapsed, so the last snapshot before telemetry stops (e.g.
+    the empty one published on disconnect) is always shown. Without a
+    notifier, after each frame
+    the timer is re-armed for just after the next expected sim tick, so
+    there is roughly one wakeup per tick rather than one per widget timer;
+    while disconnected, or with nothing visible, it slows to IDLE_INTERVAL.
+    Missed frames are only counted while the client is CONNECTED, so a sim
+    pause (STALE) or disconnect is not reported as dropped frames.
+    """
+
+    IDLE_INTERVAL = 0.25
+    RETRY_INTERVAL = 0.002
+    TICK_SLACK = 0.002
+    FRAME_TOLERANCE = 0.005  # absorbs tick jitter so 60 Hz targets run on every 60 Hz tick
+
+    def __init__(self, ir_client, notifier=None, parent=None):
+        """Create the scheduler for an iRacing client; call start() to run it."""
+        super().__init__(parent)
+        self.ir_client = ir_client
+        self.notifier = notifier
+        self.targets = []
+        self.wakeups = 0
+        self._last_seq = None
+        self._connected_since = None  # missed frames are counted from here on
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timer)
+
+    def register(self, widget, callback, rate, name=None):
+        """Drive callback (a bound method of widget) at up to `rate` Hz."""
+        target = FrameTarget(name or type(widget).__name__, widget, callback, rate)
+        self.targets.append(target)
+        return target
+
+    def unregister(self, widget):
+        """Remove every registration belonging to widget."""
+        self.targets = [t for t in self.targets if t.widget() not in (None, widget)]
+
+    def start(self):
+        """Start scheduling frames."""
+        self._on_connection_state(self.ir_client.get_connection_state())
+        if self.notifier is not None:
+            self.notifier.connection_state_changed.connect(self._on_connection_state)
+            self.notifier.snapshot_ready.connect(self._on_snapshot)
+        else:
+            self._timer.start(0)
+
+    def stop(self):
+        """Stop scheduling frames."""
+        if self.notifier is not None:
+            self.notifier.connection_state_changed.disconnect(self._on_connection_state)
+            self.notifier.snapshot_ready.disconnect(self._on_snapshot)
+        self._timer.stop()
+
+    def get_stats(self):
+        """Return wakeups plus frames and missed frames per target."""
+        return {
+            'wakeups': self.wakeups,
+            'targets': {t.name: {'frames': t.frames, 'missed': t.missed} for t in self.targets},
+        }
+
+    def _on_connection_state(self, state):
+        """Start counting missed frames on entering CONNECTED; stop on leaving it."""
+        if state != CONNECTED:
+            self._connected_since = None
+        elif self._connected_since is None:
+            self._connected_since = time.perf_counter()
+
+    def _on_snapshot(self, snapshot):
+        """Run due targets for a snapshot pushed by the notifier."""
+        self.wakeups += 1
+        self._last_seq = snapshot.seq
+        now = time.perf_counter()
+        self._run_due(now, True)
+        self._arm_trailing(now)
+
+    def _on_timer(self):
+        """Run due targets if new telemetry arrived or a trailing frame is owed, then re-arm the timer."""
+        self.wakeups += 1
+        now = time.perf_counter()
+        if self.notifier is not None:
+            self._run_due(now, False)
+            self._arm_trailing(now)
+            return
+        self._on_connection_state(self.ir_client.get_connection_state())
+        snapshot = self.ir_client.get_snapshot()
+        fresh = snapshot.seq != self._last_seq
+        self._last_seq = snapshot.seq
+        active = self._run_due(now, fresh)
+        interval = self._next_interval(now, snapshot, active)
+        trailing = self._trailing_delay(now)
+        if trailing is not None:
+            interval = min(interval, trailing)
+        self._timer.start(int(interval * 1000))
+
+    def _trailing_delay(self, now):
+        """Seconds until the first target owed a trailing frame is due, or None."""
+        due = [t.last_frame + t.period - self.FRAME_TOLERANCE for t in self.targets
+               if t.pending and t.last_frame is not None]
+        return max(0.0, min(due) - now) if due else None
+
+    def _arm_trailing(self, now):
+        """Notifier mode: arm the single-shot timer for the next owed trailing frame."""
+        delay = self._trailing_delay(now)
+        if delay is None:
+            self._timer.stop()
+        elif not self._timer.isActive() or self._timer.remainingTime() > delay * 1000:
+            self._timer.start(int(delay * 1000))
+
+    def _run_due(self, now, fresh):
+        """Run every visible target whose period has elapsed and that has a snapshot to show.
+
+        Returns True if any target is visible.
+        """
+        active = False
+        for target in list(self.targets):
+            widget, callback = target.widget(), target.callback()
+            if widget is None or callback is None:
+                self.targets.remove(target)
+                continue
+            if not target.is_active(widget):
+                target.pending = False
+                continue
+            active = True
+            if fresh:
+                target.pending = True
+            if target.pending and (target.last_frame is None or
+                                   now >= target.last_frame + target.period - self.FRAME_TOLERANCE):
+                self._run(target, callback, now)
+        return active
+
+    def _run(self, target, callback, now):
+        """Run one frame callback and account for missed frames since the later of its last frame and reconnecting."""
+        if target.last_frame is not None and self._connected_since is not None:
+            late = now - max(target.last_frame, self._connected_since)
+            if late > target.period * 1.5:
+                target.missed += int(late / target.period) - 1
+        target.last_frame = now
+        target.pending = False
+        target.frames += 1
+        start = time.perf_counter()
+        callback()
+        monitor.record_since(f'frame.{target.name}', start)
+
+    def _next_interval(self, now, snapshot, active):
+        """Seconds until the next wakeup."""
+        if not active or not self.ir_client.is_connected:
+            return self.IDLE_INTERVAL
+        tick_period = 1.0 / self.ir_client.tick_rate
+        expected = snapshot.timestamp + tick_period + self.TICK_SLACK
+        if expected > now:
+            return expected - now
+        # Tick overdue (e.g. sim paused): back off in proportion to how late it is
+        return min(self.IDLE_INTERVAL, max(self.RETRY_INTERVAL, (now - snapshot.timestamp) / 4))
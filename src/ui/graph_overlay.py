@@ -2,20 +2,46 @@
 Graph Overlay Component
 
 Displays real-time throttle and brake inputs as a scrolling line graph.
+Long windows are drawn from per-pixel min/max envelopes kept in
+MinMaxPyramids, so the draw cost depends on the overlay width rather than
+the window length.
 """
 
+import time
+
+import numpy as np
 from PyQt5 import QtWidgets, QtCore, QtGui
 
+from src.client.history import MinMaxPyramid, pixel_minmax
+from src.utils.perf import monitor
+
+
+def create_polygon(size):
+    """Create a QPolygonF of `size` points and a writable (size, 2) float64 view of it."""
+    polygon = QtGui.QPolygonF()
+    polygon.fill(QtCore.QPointF(), size)
+    pointer = polygon.data()
+    pointer.setsize(size * 2 * 8)
+    return polygon, np.frombuffer(pointer, dtype=np.float64).reshape(size, 2)
+
 
 class GraphOverlay(QtWidgets.QWidget):
     """Graph overlay for displaying throttle and brake inputs over time."""
     
     RESIZE_MARGIN = 10
+    FRAME_RATE = 60
+    
+    # (channel, colour) for each plotted trace, drawn in order
+    TRACES = [
+        ('throttle', QtGui.QColor(0, 255, 0)),
+        ('brake', QtGui.QColor(255, 0, 0)),
+    ]
 
-    def __init__(self, ir_client):
-        """Initialize the graph overlay with the iRacing client."""
+    def __init__(self, ir_client, scheduler=None):
+        """Initialize the graph overlay with the iRacing client and optional FrameScheduler."""
         super().__init__()
         self.ir_client = ir_client
+        self.ir_client.require_channels('graph_overlay', {'throttle': 'Throttle', 'brake': 'Brake'})
         self.setWindowFlags(
             QtCore.Qt.WindowStaysOnTopHint |
             QtCore.Qt.FramelessWindowHint |
@@ -26,10 +52,16 @@ class GraphOverlay(QtWidgets.QWidget):
         self.setWindowTitle('iRacing Graph Overlay')
         self.setGeometry(600, 500, 900, 300)
         
-        # Timer for updates
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self.update)
-        self.timer.start(50)
+        # Frames are driven by the shared scheduler, or a local timer when run standalone;
+        # repaints only happen on visible changes
+        self.timer = None
+        self.scheduler = scheduler
+        if scheduler is not None:
+            scheduler.register(self, self.refresh, self.FRAME_RATE)
+        else:
+            self.timer = QtCore.QTimer(self)
+            self.timer.timeout.connect(self.refresh)
+            self.timer.start(int(1000 / self.FRAME_RATE))
         
         # Mouse interaction state
         self._drag_active = False
@@ -39,10 +71,24 @@ class GraphOverlay(QtWidgets.QWidget):
         self._resize_start_rect = None
         self._resize_start_pos = None
         
-        # Telemetry history for graphs
-        self.throttle_history = []
-        self.brake_history = []
-        self.max_history_points = 100  # ~5 seconds at 20fps
+        # Seconds of telemetry history shown (served by the client's ring buffer)
+        self.window_seconds = 60.0
+        self._pyramids = [None] * len(self.TRACES)
+        self._traces = None
+        self._traces_key = None
+        
+        # Render caches: static layers pixmap and one reusable polygon per trace
+        self._static_layer = None
+        self._trace_pens = [QtGui.QPen(color, 2) for _, color in self.TRACES]
+        self._trace_brushes = [QtGui.QBrush(color) for _, color in self.TRACES]
+        self._polygons = [None] * len(self.TRACES)
+        self._x_key = None
+        self._x_coords = None
+        
+        # Last telemetry sequence and trace state that were painted
+        self._last_seq = None
+        self._latency_seq = None
+        self._trace_state = None
 
     def mousePressEvent(self, event):
         """Handle mouse press events for dragging and resizing."""
@@ -146,79 +192,195 @@ class GraphOverlay(QtWidgets.QWidget):
             self._resize_dir = None
             event.accept()
 
+    def closeEvent(self, event):
+        """Stop refreshing and release the overlay's channels when it is closed."""
+        if self.scheduler is not None:
+            self.scheduler.unregister(self)
+        if self.timer is not None:
+            self.timer.stop()
+        self.ir_client.release_channels('graph_overlay')
+        super().closeEvent(event)
+
+    def resizeEvent(self, event):
+        """Invalidate the cached static layers when the overlay is resized."""
+        self._static_layer = None
+        self._trace_state = None
+        super().resizeEvent(event)
+
+    def _graph_rect(self):
+        """Area of the widget occupied by the graph."""
+        rect = self.rect()
+        return QtCore.QRect(rect.left() + 10, rect.top() + 10,
+                            rect.width() - 20, rect.height() - 20)
+
+    def refresh(self):
+        """Repaint the graph area only when new telemetry changes what is drawn.
+
+        A window in which every trace is flat (to within half a pixel) and
+        whose newest values did not move looks identical after scrolling, so
+        it is not repainted; this keeps the overlay idle in the garage or
+        while paused.
+        """
+        if not self.ir_client.has_changed_since(self._last_seq):
+            return
+        self._last_seq = self.ir_client.get_snapshot().seq
+        graph_rect = self._graph_rect()
+        graph_height = max(1, graph_rect.height() - 20)
+        state = []
+        flat = True
+        for values, envelope in self._trace_values(graph_rect.width() - 20):
+            if len(values) < 2:
+                state.append(None)
+                continue
+            if (values.max() - values.min()) * graph_height >= 0.5:
+                flat = False
+            # An envelope's newest pixel maximum sits at the end of its upper edge
+            newest = values[len(values) // 2 - 1] if envelope else values[-1]
+            state.append(round(float(newest) * graph_height))
+        state = tuple(state)
+        if flat and state == self._trace_state:
+            return
+        self._trace_state = state
+        self.update(self._graph_rect())
+
     def paintEvent(self, event):
         """Paint the overlay with the input graph."""
-        telemetry = self.ir_client.get_telemetry()
+        start = time.perf_counter()
         painter = QtGui.QPainter(self)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
         rect = self.rect()
+        graph_rect = self._graph_rect()
+        
+        # Background, grid and labels only change on resize
+        if self._static_layer is None:
+            self._static_layer = self._render_static_layer(rect, graph_rect)
+        painter.drawPixmap(0, 0, self._static_layer)
+        
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        self._draw_input_graph(painter, graph_rect)
+        painter.end()
+        monitor.record_since('graph_overlay.paint', start)
+        self._record_latency()
+
+    def _record_latency(self):
+        """Record snapshot-publish-to-paint latency once per newly painted snapshot."""
+        snapshot = self.ir_client.get_snapshot()
+        if snapshot.seq != self._latency_seq:
+            self._latency_seq = snapshot.seq
+            monitor.record('latency.graph_overlay', time.perf_counter() - snapshot.timestamp)
+
+    def _render_static_layer(self, rect, graph_rect):
+        """Render the background, grid and labels into a pixmap."""
+        ratio = self.devicePixelRatioF()
+        pixmap = QtGui.QPixmap(int(rect.width() * ratio), int(rect.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(pixmap)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
         
         # Draw semi-transparent background
         painter.setBrush(QtGui.QColor(20, 20, 20, 100))
         painter.setPen(QtCore.Qt.NoPen)
         painter.drawRoundedRect(rect, 20, 20)
         
-        # Update telemetry history
-        throttle = telemetry.get('throttle', 0)
-        brake = telemetry.get('brake', 0)
-        self.throttle_history.append(throttle)
-        self.brake_history.append(brake)
-        
-        if len(self.throttle_history) > self.max_history_points:
-            self.throttle_history.pop(0)
-            self.brake_history.pop(0)
-        
-        # Draw graph
-        graph_rect = QtCore.QRect(rect.left() + 10, rect.top() + 10,
-                                 rect.width() - 20, rect.height() - 20)
-        self._draw_input_graph(painter, graph_rect)
-
-    def _draw_input_graph(self, painter, rect):
-        """Draw the input graph with throttle and brake lines."""
-        if len(self.throttle_history) < 2:
-            return
-        
         # Draw graph background
         painter.setBrush(QtGui.QColor(0, 0, 0, 50))
-        painter.setPen(QtCore.Qt.NoPen)
-        painter.drawRoundedRect(rect, 10, 10)
+        painter.drawRoundedRect(graph_rect, 10, 10)
         
         # Draw grid lines
         painter.setPen(QtGui.QPen(QtGui.QColor(100, 100, 100), 1))
         for i in range(5):
-            y = rect.top() + (rect.height() * i) // 4
-            painter.drawLine(rect.left(), y, rect.right(), y)
-        
-        # Draw input lines
-        graph_width = rect.width() - 20
-        graph_height = rect.height() - 20
-        graph_left = rect.left() + 10
-        graph_top = rect.top() + 10
-        
-        # Throttle line (green)
-        painter.setPen(QtGui.QPen(QtGui.QColor(0, 255, 0), 2))
-        points = []
-        for i, throttle in enumerate(self.throttle_history):
-            x = int(graph_left + (i * graph_width) // (len(self.throttle_history) - 1))
-            y = int(graph_top + graph_height - (throttle * graph_height))
-            points.append(QtCore.QPoint(x, y))
-        
-        if len(points) > 1:
-            painter.drawPolyline(points)
-        
-        # Brake line (red)
-        painter.setPen(QtGui.QPen(QtGui.QColor(255, 0, 0), 2))
-        points = []
-        for i, brake in enumerate(self.brake_history):
-            x = int(graph_left + (i * graph_width) // (len(self.brake_history) - 1))
-            y = int(graph_top + graph_height - (brake * graph_height))
-            points.append(QtCore.QPoint(x, y))
-        
-        if len(points) > 1:
-            painter.drawPolyline(points)
+            y = graph_rect.top() + (graph_rect.height() * i) // 4
+            painter.drawLine(graph_rect.left(), y, graph_rect.right(), y)
         
         # Draw labels
         font = QtGui.QFont('Segoe UI', 10, QtGui.QFont.Bold)
         painter.setFont(font)
         painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255)))
-        painter.drawText(rect.left() + 5, rect.top() + 15, "Throttle (Green) / Brake (Red)") 
\ No newline at end of file
+        painter.drawText(graph_rect.left() + 5, graph_rect.top() + 15, "Throttle (Green) / Brake (Red)")
+        painter.end()
+        return pixmap
+
+    def _trace_values(self, pixels):
+        """Return (values, envelope) per trace for the current window, cached per snapshot and width.
+
+        Windows with samples at least two pixels apart give the raw samples;
+        denser ones give the outline of the per-pixel min/max band
+        (envelope=True): the maxima left to right, then the minima right to
+        left. A brake tap shorter than a pixel still reaches its full height,
+        and no trace has more points than the graph is wide.
+        """
+        key = (self._last_seq, pixels)
+        if key == self._traces_key:
+            return self._traces
+        history = self.ir_client.history
+        pixels = max(1, pixels)
+        n = int(self.window_seconds * history.rate)
+        traces = []
+        for index, (channel, _) in enumerate(self.TRACES):
+            pyramid = self._pyramids[index]
+            if pyramid is None or pyramid.capacity != history.capacity:
+                pyramid = self._pyramids[index] = MinMaxPyramid(history.capacity)
+            pyramid.sync(history, channel)
+            envelope = pyramid.minmax(n, pixels)
+            if envelope is None:
+                values = history.last(channel, n)
+                if len(values) <= pixels // 2:
+                    traces.append((values, False))
+                    continue
+                # Too few samples per pixel for the pyramid: reduce them directly, one
+                # band column per pixel or per sample, whichever is fewer
+                envelope = pixel_minmax(values, values, pixels)
+            mins, maxs = envelope
+            traces.append((np.concatenate([maxs, mins[::-1]]), True))
+        self._traces, self._traces_key = traces, key
+        return traces
+
+    def _trace_x_coords(self, count, left, width, envelope):
+        """Return cached, evenly spaced x coordinates for `count` samples or an envelope outline."""
+        key = (count, left, width, envelope)
+        if key != self._x_key:
+            if envelope:
+                x = np.linspace(left, left + width, count // 2)
+                self._x_coords = np.concatenate([x, x[::-1]])
+            else:
+                self._x_coords = np.linspace(left, left + width, count)
+            self._x_key = key
+        return self._x_coords
+
+    def _trace_polygon(self, index, count):
+        """Return the reusable polygon (and its array view) for a trace."""
+        cached = self._polygons[index]
+        if cached is None or len(cached[1]) != count:
+            cached = self._polygons[index] = create_polygon(count)
+        return cached
+
+    def _draw_input_graph(self, painter, rect):
+        """Draw the input graph with throttle and brake lines or min/max bands."""
+        graph_width = rect.width() - 20
+        graph_height = rect.height() - 20
+        graph_left = rect.left() + 10
+        graph_bottom = rect.top() + 10 + graph_height
+        
+        for index, (values, envelope) in enumerate(self._trace_values(graph_width)):
+            count = len(values)
+            if count < 2:
+                continue
+            polygon, points = self._trace_polygon(index, count)
+            points[:, 0] = self._trace_x_coords(count, graph_left, graph_width, envelope)
+            # y = bottom - value * height, computed in place
+            np.multiply(values, -graph_height, out=points[:, 1])
+            points[:, 1] += graph_bottom
+            if envelope:
+                # Fill the band grown by the pen's half width instead of stroking it: a flat
+                # stretch still shows as a 2 px line, and an aliased fill is far cheaper
+                half = count // 2
+                points[:half, 1] -= 1
+                points[half:, 1] += 1
+                painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
+                painter.setPen(QtCore.Qt.NoPen)
+                painter.setBrush(self._trace_brushes[index])
+                painter.drawPolygon(polygon)
+                painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            else:
+                painter.setPen(self._trace_pens[index])
+                painter.drawPolyline(polygon)
@@ -0,0 +1,79 @@
+"""
+Snapshot Signal Bridge
+
+Pushes newly published telemetry snapshots from the acquisition thread to the
+Qt UI thread, coalescing so the UI only ever sees the latest one.
+"""
+
+import time
+
+from PyQt5 import QtCore
+
+from src.utils.perf import monitor
+
+
+class SnapshotNotifier(QtCore.QObject):
+    """IRacingClient sink that re-emits snapshots as a Qt signal on the UI thread.
+
+    on_snapshot() runs on the acquisition thread; it only swaps a reference
+    and, if no delivery is already queued, posts one. When the UI thread
+    falls behind, intermediate snapshots are skipped rather than queued.
+    """
+
+    snapshot_ready = QtCore.pyqtSignal(object)
+    session_info_changed = QtCore.pyqtSignal(object)
+    connection_state_changed = QtCore.pyqtSignal(str)
+
+    _wake = QtCore.pyqtSignal()
+    _session_wake = QtCore.pyqtSignal()
+    _state_wake = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        """Create the notifier; it must be constructed on the UI thread."""
+        super().__init__(parent)
+        self.delivered = 0
+        self.coalesced = 0
+        self._latest = None
+        self._pending = False
+        self._session_info = None
+        self._wake.connect(self._deliver, QtCore.Qt.QueuedConnection)
+        self._session_wake.connect(self._deliver_session, QtCore.Qt.QueuedConnection)
+        self._state_wake.connect(self._deliver_state, QtCore.Qt.QueuedConnection)
+
+    # Sink interface (acquisition thread)
+
+    def on_snapshot(self, snapshot):
+        """Record the newest snapshot and queue a delivery if none is pending."""
+        self._latest = snapshot
+        if self._pending:
+            self.coalesced += 1
+            return
+        self._pending = True
+        self._wake.emit()
+
+    def on_session_info(self, update, session_info):
+        """Queue a session info change notification."""
+        self._session_info = session_info
+        self._session_wake.emit()
+
+    def on_connection_state(self, state):
+        """Queue a connection state change notification."""
+        self._state_wake.emit(state)
+
+    # UI thread
+
+    def _deliver(self):
+        """Emit snapshot_ready with the latest snapshot."""
+        self._pending = False
+        snapshot = self._latest
+        monitor.record('latency.publish_to_ui', time.perf_counter() - snapshot.timestamp)
+        self.delivered += 1
+        self.snapshot_ready.emit(snapshot)
+
+    def _deliver_session(self):
+        """Emit session_info_changed with the latest session info."""
+        self.session_info_changed.emit(self._session_info)
+
+    def _deliver_state(self, state):
+        """Emit connection_state_changed on the UI thread."""
+        self.connection_state_changed.emit(state)
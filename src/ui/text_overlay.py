@@ -5,18 +5,140 @@ Displays real-time telemetry data in a text format with customizable positioning
 """
 
 from PyQt5 import QtWidgets, QtCore, QtGui
+import functools
 import math
+import time
+
+from src.utils.perf import monitor
+from src.utils.telemetry_utils import TelemetryDisplayModel
+
+
+FONT_FAMILY = 'Segoe UI'
+MAX_FONT_SIZE = 400
+
+# (label, display field, widest expected value) for each text line
+TEXT_LINES = [
+    ('Speed: ', 'speed', '000.0 mph'),
+    ('RPM: ', 'rpm', '00000'),
+    ('Gear: ', 'gear', '0'),
+    ('Delta: ', 'lap_delta', '+00.00'),
+]
+ANGLE_TEMPLATE = '-000°'
+
+
+@functools.lru_cache(maxsize=64)
+def fit_font_size(family, width, height, templates):
+    """Largest bold point size at which all template lines fit in width x height.
+
+    Binary search over point sizes; results are memoized per size and text.
+    """
+    font = QtGui.QFont(family, 1, QtGui.QFont.Bold)
+
+    def fits(size):
+        font.setPointSize(size)
+        fm = QtGui.QFontMetrics(font)
+        return fm.height() * len(templates) <= height and max(fm.width(t) for t in templates) <= width
+
+    low, high = 1, MAX_FONT_SIZE
+    while low < high:
+        mid = (low + high + 1) // 2
+        if fits(mid):
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+class TextLayout:
+    """Geometry, fonts and prepared static text for one overlay size."""
+
+    def __init__(self, rect):
+        """Compute the layout for a widget rect."""
+        margin = 20
+        available_height = rect.height() - 2 * margin
+        available_width = rect.width() - 2 * margin
+        
+        # Steering wheel geometry
+        steering_wheel_size = min(available_width * 0.6, available_height * 0.6)
+        wheel_rect = QtCore.QRect(
+            int(rect.left() + margin),
+            int(rect.top() + margin + (available_height - steering_wheel_size) // 2),
+            int(steering_wheel_size),
+            int(steering_wheel_size)
+        )
+        self.center_x = wheel_rect.center().x()
+        self.center_y = wheel_rect.center().y()
+        self.radius = min(wheel_rect.width(), wheel_rect.height()) // 2 - 10
+        self.hub_radius = self.radius * 0.15
+        self.wheel_pen = QtGui.QPen(QtGui.QColor(255, 255, 255), 8)
+        self.hub_pen = QtGui.QPen(QtGui.QColor(0, 255, 255), 2)
+        self.hub_brush = QtGui.QBrush(QtGui.QColor(0, 255, 255))
+        self.angle_font = QtGui.QFont(FONT_FAMILY, max(8, self.radius // 15), QtGui.QFont.Bold)
+        angle_fm = QtGui.QFontMetrics(self.angle_font)
+        angle_width = angle_fm.width(ANGLE_TEMPLATE)
+        self.angle_rect = QtCore.QRect(
+            int(self.center_x - angle_width // 2),
+            int(self.center_y + self.radius + 5),
+            angle_width,
+            angle_fm.height()
+        )
+        
+        # Text section: font fitted to the widest expected line
+        text_rect = QtCore.QRect(
+            int(rect.left() + margin + steering_wheel_size + 20),
+            int(rect.top() + margin),
+            int(available_width - steering_wheel_size - 20),
+            int(available_height)
+        )
+        templates = tuple(label + sample for label, _, sample in TEXT_LINES)
+        font_size = fit_font_size(FONT_FAMILY, max(1, text_rect.width()), max(1, text_rect.height()), templates)
+        self.text_font = QtGui.QFont(FONT_FAMILY, font_size, QtGui.QFont.Bold)
+        self.text_pen = QtGui.QPen(QtGui.QColor(255, 255, 255), 2)
+        fm = QtGui.QFontMetrics(self.text_font)
+        y = text_rect.top() + (text_rect.height() - fm.height() * len(TEXT_LINES)) // 2
+        
+        # Labels are static text; values are drawn after the label at a fixed x
+        self.lines = []
+        self.value_rects = []
+        for (label, field, _), template in zip(TEXT_LINES, templates):
+            x = text_rect.left() + (text_rect.width() - fm.width(template)) // 2
+            static_label = QtGui.QStaticText(label)
+            static_label.prepare(QtGui.QTransform(), self.text_font)
+            value_x = x + fm.width(label)
+            self.lines.append((QtCore.QPointF(x, y), static_label, value_x,
+                               y + fm.ascent(), field))
+            self.value_rects.append(QtCore.QRect(value_x, y, rect.right() - value_x, fm.height()))
+            y += fm.height()
+
+    def display_state(self, telemetry, display_model):
+        """Everything that is drawn for the given telemetry, at display precision.
+
+        Returns (hub_rect, angle_text, value_texts); two equal states paint
+        identical pixels.
+        """
+        # Display the real steering angle in degrees, inverted
+        steering_angle = -math.degrees(telemetry.get('steering', 0))
+        hub_angle = math.radians(steering_angle - 90)  # -90 so 0 deg is top
+        hub_x = self.center_x + self.radius * 0.85 * math.cos(hub_angle)
+        hub_y = self.center_y + self.radius * 0.85 * math.sin(hub_angle)
+        hub_rect = QtCore.QRect(int(hub_x - self.hub_radius), int(hub_y - self.hub_radius),
+                                int(self.hub_radius * 2), int(self.hub_radius * 2))
+        display_model.update(telemetry)
+        values = tuple(display_model.text(field) for _, _, _, _, field in self.lines)
+        return hub_rect, f"{steering_angle:.0f}°", values
 
 
 class TextOverlay(QtWidgets.QWidget):
     """Text overlay for displaying telemetry data in a readable format."""
     
     RESIZE_MARGIN = 10
+    FRAME_RATE = 60
 
-    def __init__(self, ir_client):
-        """Initialize the text overlay with the iRacing client."""
+    def __init__(self, ir_client, scheduler=None):
+        """Initialize the text overlay with the iRacing client and optional FrameScheduler."""
         super().__init__()
         self.ir_client = ir_client
+        self.ir_client.require_channels('text_overlay', {'speed': 'Speed', 'rpm': 'RPM', 'gear': 'Gear', 'steering': 'SteeringWheelAngle'})
         self.setWindowFlags(
             QtCore.Qt.WindowStaysOnTopHint |
             QtCore.Qt.FramelessWindowHint |
@@ -27,10 +149,16 @@ class TextOverlay(QtWidgets.QWidget):
         self.setWindowTitle('iRacing Text Overlay')
         self.setGeometry(100, 100, 800, 400)
         
-        # Timer for updates
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self.update)
-        self.timer.start(50)
+        # Frames are driven by the shared scheduler, or a local timer when run standalone;
+        # repaints only happen on visible changes
+        self.timer = None
+        self.scheduler = scheduler
+        if scheduler is not None:
+            scheduler.register(self, self.refresh, self.FRAME_RATE)
+        else:
+            self.timer = QtCore.QTimer(self)
+            self.timer.timeout.connect(self.refresh)
+            self.timer.start(int(1000 / self.FRAME_RATE))
         
         # Mouse interaction state
         self._drag_active = False
@@ -39,6 +167,15 @@ class TextOverlay(QtWidgets.QWidget):
         self._resize_dir = None
         self._resize_start_rect = None
         self._resize_start_pos = None
+        
+        # Layout cache, recomputed once per size
+        self._layout = None
+        self.display_model = TelemetryDisplayModel(field for _, field, _ in TEXT_LINES)
+        
+        # Last telemetry sequence and display state that were painted
+        self._last_seq = None
+        self._latency_seq = None
+        self._display_state = None
 
     def mousePressEvent(self, event):
         """Handle mouse press events for dragging and resizing."""
@@ -142,9 +279,58 @@ class TextOverlay(QtWidgets.QWidget):
             self._resize_dir = None
             event.accept()
 
+    def closeEvent(self, event):
+        """Stop refreshing and release the overlay's channels when it is closed."""
+        if self.scheduler is not None:
+            self.scheduler.unregister(self)
+        if self.timer is not None:
+            self.timer.stop()
+        self.ir_client.release_channels('text_overlay')
+        super().closeEvent(event)
+
+    def resizeEvent(self, event):
+        """Recompute the cached layout for the new size."""
+        self._layout = TextLayout(self.rect())
+        self._display_state = None
+        super().resizeEvent(event)
+
+    def refresh(self):
+        """Invalidate only the regions whose displayed values changed since the last paint."""
+        snapshot = self.ir_client.get_snapshot()
+        if snapshot.seq == self._last_seq:
+            return
+        self._last_seq = snapshot.seq
+        if self._layout is None:
+            self._layout = TextLayout(self.rect())
+        layout = self._layout
+        state = layout.display_state(snapshot.telemetry, self.display_model)
+        previous = self._display_state
+        self._display_state = state
+        if previous is None:
+            self.update()
+            return
+        region = QtGui.QRegion()
+        if state[0] != previous[0]:
+            # Old and new hub positions, padded for the pen and antialiasing
+            region += state[0].adjusted(-3, -3, 3, 3)
+            region += previous[0].adjusted(-3, -3, 3, 3)
+        if state[1] != previous[1]:
+            region += layout.angle_rect
+        for value_rect, value, previous_value in zip(layout.value_rects, state[2], previous[2]):
+            if value != previous_value:
+                region += value_rect
+        if not region.isEmpty():
+            self.update(region)
+
     def paintEvent(self, event):
         """Paint the overlay with telemetry data."""
-        telemetry = self.ir_client.get_telemetry()
+        start = time.perf_counter()
+        if self._layout is None:
+            self._layout = TextLayout(self.rect())
+        layout = self._layout
+        if self._display_state is None:
+            self._display_state = layout.display_state(self.ir_client.get_telemetry(), self.display_model)
+        hub_rect, angle_text, values = self._display_state
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
         rect = self.rect()
@@ -154,104 +340,47 @@ class TextOverlay(QtWidgets.QWidget):
         painter.setPen(QtCore.Qt.NoPen)
         painter.drawRoundedRect(rect, 20, 20)
         
-        margin = 20
-        available_height = rect.height() - 2 * margin
-        available_width = rect.width() - 2 * margin
-        
-        # Calculate layout
-        steering_wheel_size = min(available_width * 0.6, available_height * 0.6)
-        text_width = available_width - steering_wheel_size - 20  # 20px gap
-        
         # Draw steering wheel
-        wheel_rect = QtCore.QRect(
-            int(rect.left() + margin),
-            int(rect.top() + margin + (available_height - steering_wheel_size) // 2),
-            int(steering_wheel_size),
-            int(steering_wheel_size)
-        )
-        steering = telemetry.get('steering', 0)
-        # Display the real steering angle in degrees, inverted
-        steering_angle_deg = -math.degrees(steering)
-        self._draw_steering_wheel(painter, wheel_rect, steering_angle_deg)
+        self._draw_steering_wheel(painter, layout, hub_rect, angle_text)
         
         # Draw text section
-        text_rect = QtCore.QRect(
-            int(rect.left() + margin + steering_wheel_size + 20),
-            int(rect.top() + margin),
-            int(text_width),
-            int(available_height)
-        )
-        
-        lines = [
-            f"MPH: {telemetry.get('speed_mph', 0):.1f}",
-            f"RPM: {telemetry.get('rpm', 0):.0f}",
-            f"Gear: {telemetry.get('gear', 0)}"
-        ]
-        self._draw_text_section(painter, text_rect, lines)
-
-    def _draw_steering_wheel(self, painter, rect, steering_angle):
-        """Draw a visual steering wheel representation."""
-        center_x = rect.center().x()
-        center_y = rect.center().y()
-        radius = min(rect.width(), rect.height()) // 2 - 10
+        self._draw_text_section(painter, layout, values)
+        painter.end()
+        monitor.record_since('text_overlay.paint', start)
+        self._record_latency()
+
+    def _record_latency(self):
+        """Record snapshot-publish-to-paint latency once per newly painted snapshot."""
+        snapshot = self.ir_client.get_snapshot()
+        if snapshot.seq != self._latency_seq:
+            self._latency_seq = snapshot.seq
+            monitor.record('latency.text_overlay', time.perf_counter() - snapshot.timestamp)
 
-        # steering_angle is now the real angle in degrees
+    def _draw_steering_wheel(self, painter, layout, hub_rect, angle_text):
+        """Draw a visual steering wheel representation."""
+        center_x = layout.center_x
+        center_y = layout.center_y
+        radius = layout.radius
 
         # Draw single wheel circle (white and thicker)
-        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255), 8))
+        painter.setPen(layout.wheel_pen)
         painter.setBrush(QtCore.Qt.NoBrush)
         painter.drawEllipse(int(center_x - radius), int(center_y - radius), int(radius * 2), int(radius * 2))
 
         # Draw the 'center hub' as a bright cyan circle that rotates with the steering angle
-        hub_radius = radius * 0.15
-        hub_angle = math.radians(steering_angle - 90)  # -90 so 0 deg is top
-        hub_x = center_x + radius * 0.85 * math.cos(hub_angle)
-        hub_y = center_y + radius * 0.85 * math.sin(hub_angle)
-        painter.setPen(QtGui.QPen(QtGui.QColor(0, 255, 255), 2))
-        painter.setBrush(QtGui.QColor(0, 255, 255))
-        painter.drawEllipse(int(hub_x - hub_radius), int(hub_y - hub_radius), int(hub_radius * 2), int(hub_radius * 2))
-
-        # Draw a line from the center to the hub (optional, for clarity)
-        # painter.setPen(QtGui.QPen(QtGui.QColor(180, 180, 180), 2))
-        # painter.drawLine(int(center_x), int(center_y), int(hub_x), int(hub_y))
+        painter.setPen(layout.hub_pen)
+        painter.setBrush(layout.hub_brush)
+        painter.drawEllipse(hub_rect)
 
         # Draw steering angle text at the bottom of the wheel
-        font = QtGui.QFont('Segoe UI', max(8, radius // 15), QtGui.QFont.Bold)
-        painter.setFont(font)
-        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255), 1))
-        angle_text = f"{steering_angle:.0f}°"
-        fm = QtGui.QFontMetrics(font)
-        text_width = fm.width(angle_text)
-        text_x = center_x - text_width // 2
-        text_y = center_y + radius + fm.height() + 5
-        painter.drawText(text_x, text_y, angle_text)
-
-    def _draw_text_section(self, painter, rect, lines):
-        """Draw the text section with responsive font sizing."""
-        n_lines = len(lines)
-        
-        # Dynamically find max font size to fit all lines
-        font_size = 1
-        test_font = QtGui.QFont('Segoe UI', font_size, QtGui.QFont.Bold)
-        fm = QtGui.QFontMetrics(test_font)
-        
-        while True:
-            test_font.setPointSize(font_size + 1)
-            fm = QtGui.QFontMetrics(test_font)
-            if fm.height() * n_lines > rect.height():
-                break
-            font_size += 1
-        
-        font = QtGui.QFont('Segoe UI', font_size, QtGui.QFont.Bold)
-        painter.setFont(font)
-        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255), 2))
-        
-        fm = QtGui.QFontMetrics(font)
-        total_text_height = fm.height() * n_lines
-        y = rect.top() + (rect.height() - total_text_height) // 2 + fm.ascent()
-        
-        for line in lines:
-            text_width = fm.width(line)
-            x = rect.left() + (rect.width() - text_width) // 2
-            painter.drawText(x, y, line)
-            y += fm.height() 
\ No newline at end of file
+        painter.setFont(layout.angle_font)
+        painter.setPen(layout.text_pen)
+        painter.drawText(layout.angle_rect, QtCore.Qt.AlignCenter, angle_text)
+
+    def _draw_text_section(self, painter, layout, values):
+        """Draw the text lines at their cached positions."""
+        painter.setFont(layout.text_font)
+        painter.setPen(layout.text_pen)
+        for (label_pos, static_label, value_x, baseline, _), value in zip(layout.lines, values):
+            painter.drawStaticText(label_pos, static_label)
+            painter.drawText(value_x, baseline, value)
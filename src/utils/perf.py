@@ -0,0 +1,146 @@
+"""
+Performance Instrumentation
+
+Always-on, low-overhead timing of hot-path stages into fixed-size log-scale
+histograms, with summaries for the dashboard perf panel and file export.
+"""
+
+import json
+import math
+import threading
+import time
+from array import array
+
+
+class StageHistogram:
+    """Fixed-size log-scale histogram of stage durations (seconds).
+
+    record() only touches preallocated counters, so it is safe to call on
+    every tick and every paint.
+    """
+
+    MIN_SECONDS = 1e-6
+    MAX_SECONDS = 10.0
+    BUCKETS = 96
+
+    _SCALE = BUCKETS / math.log(MAX_SECONDS / MIN_SECONDS)
+
+    def __init__(self, name):
+        """Create an empty histogram for a named stage."""
+        self.name = name
+        self.counts = array('q', bytes(8 * self.BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, seconds):
+        """Add one duration sample."""
+        if seconds <= self.MIN_SECONDS:
+            index = 0
+        else:
+            index = min(self.BUCKETS - 1, int(math.log(seconds / self.MIN_SECONDS) * self._SCALE))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def reset(self):
+        """Clear all samples."""
+        for i in range(self.BUCKETS):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def bucket_upper(self, index):
+        """Upper bound in seconds of a histogram bucket."""
+        return self.MIN_SECONDS * math.exp((index + 1) / self._SCALE)
+
+    def percentile(self, fraction):
+        """Approximate duration below which `fraction` of samples fall."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.bucket_upper(index), self.max)
+        return self.max
+
+    def summary(self):
+        """Return count, mean, p50/p95/p99, max and last in milliseconds."""
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            'count': self.count,
+            'mean_ms': mean * 1000.0,
+            'p50_ms': self.percentile(0.50) * 1000.0,
+            'p95_ms': self.percentile(0.95) * 1000.0,
+            'p99_ms': self.percentile(0.99) * 1000.0,
+            'max_ms': self.max * 1000.0,
+            'last_ms': self.last * 1000.0,
+        }
+
+
+class PerfMonitor:
+    """Collection of stage histograms shared by the client and the UI."""
+
+    def __init__(self, enabled=True):
+        """Create an empty monitor."""
+        self.enabled = enabled
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """Get (creating on first use) the histogram for a stage."""
+        histogram = self.stages.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.stages.setdefault(name, StageHistogram(name))
+        return histogram
+
+    def record(self, name, seconds):
+        """Record one duration for a stage."""
+        if self.enabled:
+            self.stage(name).record(seconds)
+
+    def record_since(self, name, start):
+        """Record the time elapsed since a perf_counter() start value."""
+        if self.enabled:
+            self.stage(name).record(time.perf_counter() - start)
+
+    def reset(self):
+        """Clear every stage."""
+        for histogram in list(self.stages.values()):
+            histogram.reset()
+
+    def summary(self):
+        """Return a stage name -> summary dictionary."""
+        return {name: histogram.summary() for name, histogram in sorted(self.stages.items())}
+
+    def format_table(self):
+        """Format the summary as a fixed-width text table."""
+        lines = [f"{'stage':24} {'count':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:24} {stats['count']:8d} {stats['p50_ms']:7.2f} {stats['p95_ms']:7.2f} "
+                         f"{stats['p99_ms']:7.2f} {stats['max_ms']:7.2f}")
+        return '\n'.join(lines)
+
+    def export(self, path):
+        """Write summaries and raw bucket counts to a JSON file."""
+        data = {
+            'bucket_upper_ms': [StageHistogram.MIN_SECONDS * math.exp((i + 1) / StageHistogram._SCALE) * 1000.0
+                                for i in range(StageHistogram.BUCKETS)],
+            'stages': {name: dict(histogram.summary(), buckets=list(histogram.counts))
+                       for name, histogram in sorted(self.stages.items())},
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+# Process-wide monitor used by the client and UI components
+monitor = PerfMonitor()
@@ -4,6 +4,12 @@ Telemetry Utilities
 Helper functions for processing and formatting telemetry data.
 """
 
+import math
+
+
+# iRacing reports Speed in metres per second
+MPS_TO_MPH = 2.23694
+
 
 def format_speed(speed_mph):
     """Format speed value for display."""
@@ -25,6 +31,11 @@ def format_fuel_level(fuel_level):
     return f"{fuel_level:.1f}"
 
 
+def format_fuel_per_lap(fuel):
+    """Format fuel used per lap for display."""
+    return f"{fuel:.2f}"
+
+
 def format_tire_temp(temp):
     """Format tire temperature value for display."""
     return f"{temp:.1f}"
@@ -40,19 +51,114 @@ def format_steering_angle(steering):
     return f"{steering * 180:.0f}°"
 
 
+def format_laps(laps):
+    """Format a number of laps for display."""
+    return f"{laps:.1f}"
+
+
+def format_g(g):
+    """Format an acceleration in g for display."""
+    return f"{g:.2f} g"
+
+
+def format_delta(delta):
+    """Format a lap delta in seconds for display."""
+    return f"{delta:+.2f}"
+
+
+def format_gear(gear):
+    """Format gear value for display."""
+    return f"{gear}"
+
+
+# Display field -> (telemetry key, scale, step, formatter).
+# The raw value is multiplied by scale to get the formatter's input, which
+# is quantized to the smallest step the formatter can show. A field only
+# needs re-formatting when its quantized value changes.
+DISPLAY_FIELDS = {
+    'speed': ('speed', MPS_TO_MPH, 0.1, format_speed),
+    'rpm': ('rpm', 1, 1, format_rpm),
+    'gear': ('gear', 1, None, format_gear),
+    'lap_time': ('lap_time', 1, 0.01, format_lap_time),
+    'fuel_level': ('fuel_level', 1, 0.1, format_fuel_level),
+    'steering': ('steering', 1, 1 / 180, format_steering_angle),
+    'throttle': ('throttle', 1, 0.01, format_percentage),
+    'brake': ('brake', 1, 0.01, format_percentage),
+    'tire_temp_LF': ('tire_temp_LF', 1, 0.1, format_tire_temp),
+    'tire_temp_RF': ('tire_temp_RF', 1, 0.1, format_tire_temp),
+    'tire_temp_LR': ('tire_temp_LR', 1, 0.1, format_tire_temp),
+    'tire_temp_RR': ('tire_temp_RR', 1, 0.1, format_tire_temp),
+    'fuel_per_lap': ('fuel_per_lap', 1, 0.01, format_fuel_per_lap),
+    'fuel_laps_remaining': ('fuel_laps_remaining', 1, 0.1, format_laps),
+    'lap_time_avg': ('lap_time_avg', 1, 0.01, format_lap_time),
+    'peak_g': ('peak_g', 1, 0.01, format_g),
+    'lap_delta': ('lap_delta', 1, 0.01, format_delta),
+    'best_lap_time': ('best_lap_time', 1, 0.01, format_lap_time),
+}
+
+# Text shown for values that are not known yet (NaN), e.g. fuel per lap before a full lap
+UNKNOWN_TEXT = '--'
+
+
+def display_step(field, telemetry):
+    """Return a field's value quantized to display precision (in steps)."""
+    key, scale, step, _ = DISPLAY_FIELDS[field]
+    value = telemetry.get(key, 0) * scale
+    if step is None:
+        return value
+    return None if math.isnan(value) else round(value / step)
+
+
+def format_display_step(field, value):
+    """Format a value previously quantized by display_step()."""
+    _, _, step, formatter = DISPLAY_FIELDS[field]
+    if step is None:
+        return formatter(value)
+    return UNKNOWN_TEXT if value is None else formatter(value * step)
+
+
+class TelemetryDisplayModel:
+    """Cached formatted telemetry shared by the dashboard and overlays.
+
+    update() re-formats only the fields whose value changed at display
+    precision and notifies only those fields' subscribers.
+    """
+
+    def __init__(self, fields=None):
+        """Track the given display fields (all of DISPLAY_FIELDS by default)."""
+        self.fields = list(DISPLAY_FIELDS if fields is None else fields)
+        self.texts = {}
+        self._values = {}
+        self._subscribers = {}
+
+    def subscribe(self, field, callback):
+        """Call callback(text) whenever a field's formatted text changes."""
+        self._subscribers.setdefault(field, []).append(callback)
+        if field in self.texts:
+            callback(self.texts[field])
+
+    def text(self, field):
+        """Get the cached formatted text of a field."""
+        return self.texts.get(field, '')
+
+    def update(self, telemetry):
+        """Format changed fields and notify subscribers; return {field: text} of changes."""
+        changed = {}
+        for field in self.fields:
+            value = display_step(field, telemetry)
+            if field in self._values and self._values[field] == value:
+                continue
+            self._values[field] = value
+            text = format_display_step(field, value)
+            self.texts[field] = text
+            changed[field] = text
+            for callback in self._subscribers.get(field, ()):
+                callback(text)
+        return changed
+
+
 def get_telemetry_display_data(telemetry):
     """Get formatted telemetry data for display."""
-    return {
-        'speed': format_speed(telemetry.get('speed', 0)),
-        'rpm': format_rpm(telemetry.get('rpm', 0)),
-        'gear': telemetry.get('gear', 0),
-        'lap_time': format_lap_time(telemetry.get('lap_time', 0)),
-        'fuel_level': format_fuel_level(telemetry.get('fuel_level', 0)),
-        'steering': format_steering_angle(telemetry.get('steering', 0)),
-        'throttle': format_percentage(telemetry.get('throttle', 0)),
-        'brake': format_percentage(telemetry.get('brake', 0)),
-        'tire_temp_LF': format_tire_temp(telemetry.get('tire_temp_LF', 0)),
-        'tire_temp_RF': format_tire_temp(telemetry.get('tire_temp_RF', 0)),
-        'tire_temp_LR': format_tire_temp(telemetry.get('tire_temp_LR', 0)),
-        'tire_temp_RR': format_tire_temp(telemetry.get('tire_temp_RR', 0)),
-    } 
\ No newline at end of file
+    model = TelemetryDisplayModel()
+    model.update(telemetry)
+    return model.texts 
\ No newline at end of file